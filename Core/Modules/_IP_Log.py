@@ -1,32 +1,166 @@
 # Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
 
-from curl_cffi import AsyncSession
-import ipaddress
+from CLI            import konsol
+from Settings       import GEOIP
+from curl_cffi      import AsyncSession
+from collections    import OrderedDict
+from importlib.util import find_spec
+from pathlib        import Path
+from time           import monotonic
+import asyncio, ipaddress
 
-async def ip_log(hedef_ip:str) -> dict[str, str]:
-    try:
+class IPKonum:
+    """
+    IP konum bilgisi (LRU + TTL önbellekli)
+
+    Anahtar IP'nin kendisi veya ayarlanan ön eki (ör. /24) olur; aynı izleyicinin yüzlerce segment isteği
+    tek sorguya iner. MMDB dosyası verilirse sorgu ağsız ve yerel yapılır, yoksa ip-api.com kullanılır.
+    Başarısız sorgular da kısa süre önbellekte tutulur, aynı anda gelen aynı anahtar tek sorguyu bekler.
+    """
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: float, prefix_v4: int, prefix_v6: int, mmdb: str = "", mmdb_asn: str = "", online: bool = True):
+        self.max_size     = max(max_size, 1)
+        self.ttl          = ttl
+        self.negative_ttl = negative_ttl
+        self.prefix_v4    = prefix_v4
+        self.prefix_v6    = prefix_v6
+        self.online       = online
+        self.hits         = 0
+        self.misses       = 0
+        self._cache: OrderedDict[str, tuple[float, dict[str, str]]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future]                   = {}
+        self._city        = self._open(mmdb)
+        self._asn         = self._open(mmdb_asn)
+
+    @staticmethod
+    def _open(path: str):
+        if not path:
+            return None
+
+        if not find_spec("maxminddb"):
+            konsol.log("[yellow]maxminddb modülü bulunamadı, MMDB konum veritabanı kullanılmayacak[/]")
+            return None
+
+        if not Path(path).is_file():
+            konsol.log(f"[yellow]MMDB dosyası bulunamadı:[/] {path}")
+            return None
+
+        import maxminddb
+        return maxminddb.open_database(path)
+
+    def _key(self, ip: ipaddress.IPv4Address | ipaddress.IPv6Address) -> str:
+        prefix = self.prefix_v4 if ip.version == 4 else self.prefix_v6
+        return str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+
+    async def ara(self, hedef_ip: str) -> dict[str, str]:
+        """IP'nin konum bilgisi, bulunamazsa {"hata": ...}"""
         try:
             ip = ipaddress.ip_address(hedef_ip)
-            if ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved or ip.is_multicast or ip.is_unspecified:
-                return {"hata": "Local/özel IP - dış API çağrısı atlanıyor"}
         except ValueError:
-            pass
-
-        async with AsyncSession(timeout=3) as oturum:
-            
-            istek = await oturum.get(f"http://ip-api.com/json/{hedef_ip}")
-            veri  = istek.json()
-
-            if veri["status"] != "fail":
-                return {
-                    "ulke"   : veri["country"] or "",
-                    "il"     : veri["regionName"] or "",
-                    "ilce"   : veri["city"] or "",
-                    "isp"    : veri["isp"] or "",
-                    "sirket" : veri["org"] or "",
-                    "host"   : veri["as"] or ""
-                }
-            else:
-                return {"hata": "Veri Bulunamadı.."}
-    except Exception as hata:
-        return {"hata": f"{type(hata).__name__} » {hata}"}
+            return {"hata": "Geçersiz IP"}
+
+        if ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved or ip.is_multicast or ip.is_unspecified:
+            return {"hata": "Local/özel IP - dış API çağrısı atlanıyor"}
+
+        key = self._key(ip)
+        if entry := self._cache.get(key):
+            expires_at, veri = entry
+            if expires_at > monotonic():
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return veri
+            del self._cache[key]
+
+        # Aynı anahtar için süren sorguya ortak ol
+        if future := self._inflight.get(key):
+            self.hits += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            veri = await self._sorgula(hedef_ip)
+            self._put(key, veri)
+            future.set_result(veri)
+            return veri
+        except BaseException as hata:
+            future.set_result({"hata": f"{type(hata).__name__} » {hata}"})
+            raise
+        finally:
+            del self._inflight[key]
+
+    def _put(self, key: str, veri: dict[str, str]):
+        self._cache[key] = (monotonic() + (self.negative_ttl if "hata" in veri else self.ttl), veri)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    async def _sorgula(self, hedef_ip: str) -> dict[str, str]:
+        if self._city:
+            return self._mmdb(hedef_ip)
+
+        if not self.online:
+            return {"hata": "Konum veritabanı yok"}
+
+        return await self._ip_api(hedef_ip)
+
+    def _mmdb(self, hedef_ip: str) -> dict[str, str]:
+        """GeoLite2 / GeoIP2 City (+ ASN) veritabanından yerel sorgu"""
+        try:
+            kayit = self._city.get(hedef_ip) or {}
+            asn   = (self._asn.get(hedef_ip) if self._asn else None) or {}
+        except Exception as hata:
+            return {"hata": f"{type(hata).__name__} » {hata}"}
+
+        if not kayit.get("country"):
+            return {"hata": "Veri Bulunamadı.."}
+
+        isim   = lambda bolum: (bolum or {}).get("names", {}).get("en", "")
+        sirket = asn.get("autonomous_system_organization", "")
+
+        return {
+            "ulke"   : isim(kayit.get("country")),
+            "il"     : isim((kayit.get("subdivisions") or [None])[0]),
+            "ilce"   : isim(kayit.get("city")),
+            "isp"    : sirket,
+            "sirket" : sirket,
+            "host"   : f"AS{asn['autonomous_system_number']} {sirket}" if asn.get("autonomous_system_number") else ""
+        }
+
+    @staticmethod
+    async def _ip_api(hedef_ip: str) -> dict[str, str]:
+        try:
+            async with AsyncSession(timeout=3) as oturum:
+
+                istek = await oturum.get(f"http://ip-api.com/json/{hedef_ip}")
+                veri  = istek.json()
+
+                if veri["status"] != "fail":
+                    return {
+                        "ulke"   : veri["country"] or "",
+                        "il"     : veri["regionName"] or "",
+                        "ilce"   : veri["city"] or "",
+                        "isp"    : veri["isp"] or "",
+                        "sirket" : veri["org"] or "",
+                        "host"   : veri["as"] or ""
+                    }
+                else:
+                    return {"hata": "Veri Bulunamadı.."}
+        except Exception as hata:
+            return {"hata": f"{type(hata).__name__} » {hata}"}
+
+
+# Singleton instance
+ip_konum = IPKonum(
+    max_size     = GEOIP.get("CACHE_SIZE", 4096),
+    ttl          = GEOIP.get("TTL", 86400),
+    negative_ttl = GEOIP.get("NEGATIVE_TTL", 600),
+    prefix_v4    = GEOIP.get("PREFIX_V4", 32),
+    prefix_v6    = GEOIP.get("PREFIX_V6", 128),
+    mmdb         = GEOIP.get("MMDB", ""),
+    mmdb_asn     = GEOIP.get("MMDB_ASN", ""),
+    online       = GEOIP.get("ONLINE", True),
+)
+
+async def ip_log(hedef_ip:str) -> dict[str, str]:
+    return await ip_konum.ara(hedef_ip)
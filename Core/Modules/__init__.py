@@ -1,10 +1,28 @@
 # Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
 
-from fastapi    import FastAPI
-from contextlib import asynccontextmanager
+from fastapi               import FastAPI
+from contextlib            import asynccontextmanager
+from Public.API.v1.Libs    import proxy_client, segment_prefetcher, disk_cache
+from Public.WebSocket.Libs import ytdlp_pool, watch_party_manager, room_affinity
+from ._log_kuyrugu         import log_kuyrugu
+from ._sikistirma          import SikistirmaMiddleware, GZipOnbellek
+from ._security            import GuvenlikMiddleware, guvenlik_basliklari
+from ._istek               import IstekMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI lifespan events - startup ve shutdown"""
+    await proxy_client.start()
+    await disk_cache.load()
+    await ytdlp_pool.start()
+    await watch_party_manager.start()
+    await room_affinity.start()
 
     yield
+
+    await room_affinity.close()
+    await watch_party_manager.close()
+    await ytdlp_pool.close()
+    await segment_prefetcher.close()
+    await proxy_client.close()
+    await log_kuyrugu.close()
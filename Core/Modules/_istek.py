@@ -1,99 +1,160 @@
 # Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
 
-from CLI         import konsol
-from Core        import kekik_FastAPI, Request, JSONResponse, Response
-from time        import time
-from user_agents import parse
-from ._IP_Log    import ip_log
+from CLI                   import konsol
+from Settings              import REQUEST_LOG, STREAM_PATHS
+from fastapi               import Request
+from fastapi.responses     import JSONResponse
+from starlette.types       import ASGIApp, Message, Receive, Scope, Send
+from functools             import lru_cache
+from time                  import time
+from user_agents           import parse
+from Public.WebSocket.Libs import room_affinity
+from ._IP_Log              import ip_log
+from ._log_kuyrugu         import log_kuyrugu
 import asyncio
 
-@kekik_FastAPI.middleware("http")
-async def istekten_once_sonra(request: Request, call_next):
-    baslangic_zamani = time()
+# Hiç loglanmayan yollar (ön ek)
+ATLA_YOLLAR  = tuple(REQUEST_LOG.get("SKIP") or ("/favicon.ico", "/static", "/webfonts", "/manifest.json", "/.well-known"))
+# Yoğun trafikli yollar: gövde / User-Agent ayrıştırılmaz, konum sorgulanmaz, sadece durum satırı loglanır
+HAFIF_YOLLAR = tuple(REQUEST_LOG.get("LIGHT") or ("/api/v1/proxy", "/api/v1/health"))
 
-    request.state.veri = dict(request.query_params)
-    if not request.state.veri:
-        try:
-            request.state.veri = await request.json()
-        except Exception:
-            try:
-                request.state.veri = dict(await request.form())
-            except Exception:
-                request.state.veri = {}
-
-    parsed_ua = None
+@lru_cache(maxsize=REQUEST_LOG.get("UA_CACHE", 1024))
+def cihaz_adi(ua_header: str | None) -> str | None:
+    """User-Agent'ın okunur hali (odadaki herkes aynı UA'yı binlerce kez gönderir, sonuç önbellekte)"""
     try:
-        ua_header = request.headers.get("User-Agent")
-        parsed_ua = parse(ua_header)
-        cihaz = ua_header if str(parsed_ua).split("/")[2].strip() == "Other" else parsed_ua
+        parsed_ua = str(parse(ua_header))
+        return ua_header if parsed_ua.split("/")[2].strip() == "Other" else parsed_ua
     except Exception:
-        cihaz = request.headers.get("User-Agent")
-
-    fw_for    = request.headers.get("X-Forwarded-For")
-    log_ip    = fw_for or request.client.host
-    client_ip = fw_for.split(",")[0].strip() if fw_for else request.client.host
-    ip_w_cf   = (
-        f"{request.headers.get('Cf-Connecting-Ip')} [yellow]| CF: ({log_ip})[/]"
-            if request.headers.get("Cf-Connecting-Ip")
-               else log_ip
-    )
+        return ua_header
 
-    log_veri = {
-        "id"     : request.headers.get("X-Request-ID") or "",
-        "method" : request.method,
-        "url"    : str(request.url).rstrip("?").split("?")[0],
-        "veri"   : request.state.veri,
-        "kod"    : None,
-        "sure"   : None,
-        "ip"     : client_ip,
-        "cihaz"  : cihaz,
-        "host"   : request.url.hostname
-    }
-
-    # Dosya işlemleri için daha uzun timeout
-    uzun_timeout_paths = ("/upload", "/download", "/export", "/import", "/backup")
-    timeout_suresi     = 120 if any(p in request.url.path for p in uzun_timeout_paths) else 30
+class IstekMiddleware:
+    """
+    İstek log'u ve zaman aşımı (saf ASGI)
 
-    try:
-        response = await asyncio.wait_for(call_next(request), timeout=timeout_suresi)
-        log_veri["kod"] = response.status_code if response else 502
-        if not response:
-            response = JSONResponse(status_code=502, content={"ups": "Yanıt Gelmedi.."})
-    except asyncio.TimeoutError:
-        log_veri["kod"] = 504
-        response        = JSONResponse(status_code=504, content={"ups": "Zaman Aşımı.."})
-        konsol.log(f"[red]⏱️ Timeout:[/] {request.url.path} - {timeout_suresi}sn aşıldı")
-    except asyncio.CancelledError:
-        log_veri["kod"] = 499  # Client Closed Request
-        konsol.log(f"[yellow]🚫 İstemci bağlantıyı kapattı:[/] {request.url.path}")
-        raise
-    except RuntimeError as exc:
-        if "No response returned" in str(exc):
-            konsol.log(f"[yellow]⚠️ Response yok:[/] {request.url.path}")
-            return Response(status_code=204)
-        raise
-    except Exception as exc:
-        log_veri["kod"] = 500
-        response        = JSONResponse(status_code=500, content={"ups": "Sunucu Hatası.."})
-        konsol.log(f"[red]❌ Beklenmeyen hata:[/] {request.url.path} - {exc}")
-
-    for skip_path in ("/favicon.ico", "/static", "/webfonts", "/manifest.json", "com.chrome.devtools.json"):
-        if skip_path in request.url.path:
-            return response
-
-    log_veri["sure"] = round(time() - baslangic_zamani, 2)
-    await log_salla(log_veri, request, parsed_ua)
-
-    return response
-
-async def log_salla(log_veri: dict, request: Request, parsed_ua):
-    log_url = (
-        log_veri['url'].replace(request.url.scheme, request.headers.get("X-Forwarded-Proto"))
-            if request.headers.get("X-Forwarded-Proto")
-                else log_veri['url']
-    )
-    if log_url == "http://127.0.0.1:3310/api/v1/health":
-        return
+    Sadece `http.response.start` mesajı işlenir: durum kodu ve süre (ilk bayta kadar) alınır, zaman aşımı
+    kaldırılır. Gövde parçaları araya görev / kuyruk girmeden doğrudan sunucuya gider.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        baslangic_zamani = time()
+
+        request = Request(scope, receive)
+        path    = scope["path"]
+        # Başka worker'dan aktarılan istek orada zaten loglanır (konum sorgusu da orada yapılır)
+        atla    = path.startswith(ATLA_YOLLAR) or room_affinity.is_forwarded(scope)
+        hafif   = atla or path.startswith(HAFIF_YOLLAR)
+
+        if hafif:
+            request.state.veri = {}
+            cihaz              = None
+        else:
+            request.state.veri = dict(request.query_params)
+            if not request.state.veri:
+                # Okunan gövde uygulamaya aynen tekrar verilir
+                receive = await self._govdeyi_tut(request, receive)
+                try:
+                    request.state.veri = await request.json()
+                except Exception:
+                    try:
+                        request.state.veri = dict(await request.form())
+                    except Exception:
+                        request.state.veri = {}
+
+            cihaz = cihaz_adi(request.headers.get("User-Agent"))
+
+        fw_for    = request.headers.get("X-Forwarded-For")
+        client_ip = fw_for.split(",")[0].strip() if fw_for else (request.client.host if request.client else "")
+
+        log_veri = {
+            "id"     : request.headers.get("X-Request-ID") or "",
+            "method" : request.method,
+            "url"    : str(request.url).rstrip("?").split("?")[0],
+            "veri"   : request.state.veri,
+            "kod"    : None,
+            "sure"   : None,
+            "ip"     : client_ip,
+            "cihaz"  : cihaz,
+            "host"   : request.url.hostname,
+            "konum"  : not hafif
+        }
+
+        # Dosya işlemleri için daha uzun timeout, akış yolları (proxy) kendi upstream zaman aşımını kullanır
+        uzun_timeout_paths = ("/upload", "/download", "/export", "/import", "/backup")
+        timeout_suresi     = None if path.startswith(STREAM_PATHS) else 120 if any(p in path for p in uzun_timeout_paths) else 30
+
+        zaman_asimi = asyncio.timeout(timeout_suresi)
+
+        async def gonder(message: Message):
+            if message["type"] == "http.response.start":
+                # Yanıt başladı: zaman aşımı sadece ilk bayta kadar geçerli
+                zaman_asimi.reschedule(None)
+                log_veri["kod"]  = message["status"]
+                log_veri["sure"] = round(time() - baslangic_zamani, 2)
+            await send(message)
+
+        try:
+            async with zaman_asimi:
+                await self.app(scope, receive, gonder)
+        except TimeoutError:
+            if log_veri["kod"] is not None:
+                raise
+            log_veri["kod"] = 504
+            await JSONResponse(status_code=504, content={"ups": "Zaman Aşımı.."})(scope, receive, send)
+            konsol.log(f"[red]⏱️ Timeout:[/] {path} - {timeout_suresi}sn aşıldı")
+        except asyncio.CancelledError:
+            log_veri["kod"] = 499  # Client Closed Request
+            konsol.log(f"[yellow]🚫 İstemci bağlantıyı kapattı:[/] {path}")
+            raise
+        except Exception as exc:
+            if log_veri["kod"] is not None:
+                raise
+            log_veri["kod"] = 500
+            await JSONResponse(status_code=500, content={"ups": "Sunucu Hatası.."})(scope, receive, send)
+            konsol.log(f"[red]❌ Beklenmeyen hata:[/] {path} - {exc}")
+
+        if log_veri["kod"] is None:
+            # Uygulama yanıt başlatmadan döndü: istemci cevapsız bekletilmez
+            log_veri["kod"] = 502
+            await JSONResponse(status_code=502, content={"ups": "Yanıt Üretilmedi.."})(scope, receive, send)
+            konsol.log(f"[yellow]⚠️ Response yok:[/] {path}")
+
+        if atla:
+            return
+
+        log_veri["sure"] = log_veri["sure"] if log_veri["sure"] is not None else round(time() - baslangic_zamani, 2)
+        log_veri["url"]  = (
+            log_veri['url'].replace(request.url.scheme, request.headers.get("X-Forwarded-Proto"))
+                if request.headers.get("X-Forwarded-Proto")
+                    else log_veri['url']
+        )
+        if log_veri["url"] != "http://127.0.0.1:3310/api/v1/health":
+            # Konum sorgusu / konsol yazımı arka planda; yanıt beklemez, kuyruk doluysa kayıt düşer
+            log_kuyrugu.ekle(log_salla, log_veri)
+
+    @staticmethod
+    async def _govdeyi_tut(request: Request, receive: Receive) -> Receive:
+        """Gövdeyi oku; uygulamaya önce okunan gövdeyi, sonra asıl `receive`'i (disconnect) veren çağrı döner"""
+        govde   = await request.body()
+        verildi = False
+
+        async def tekrar_oku() -> Message:
+            nonlocal verildi
+            if verildi:
+                return await receive()
+            verildi = True
+            return {"type": "http.request", "body": govde, "more_body": False}
+
+        return tekrar_oku
+
+async def log_salla(log_veri: dict):
+    log_url = log_veri["url"]
 
     LABEL_WIDTH  = 5
     durum_label  = f"[green]{'durum':<{LABEL_WIDTH}}:[/]"
@@ -124,7 +185,7 @@ async def log_salla(log_veri: dict, request: Request, parsed_ua):
         ip_line = f"  {ip_label} [bold red]{log_veri['ip']}[/]"
     log_lines.append(ip_line)
 
-    ip_detay  = await ip_log(log_veri["ip"])
+    ip_detay  = await ip_log(log_veri["ip"]) if log_veri["konum"] else {}
     konum_str = ""
     if ("hata" not in ip_detay) and ip_detay.get("ulke"):
         il   = ip_detay["il"].replace(" Province", "")
@@ -149,7 +210,8 @@ async def log_salla(log_veri: dict, request: Request, parsed_ua):
             )
         log_lines.append(konum_line)
 
-    log_lines.append(f"  {cihaz_label} [magenta]{log_veri['cihaz']}[/]")
+    if log_veri["cihaz"]:
+        log_lines.append(f"  {cihaz_label} [magenta]{log_veri['cihaz']}[/]")
 
     final_log = "\n".join(log_lines)
     konsol.log(final_log + "\n")
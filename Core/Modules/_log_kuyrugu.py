@@ -0,0 +1,72 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from CLI      import konsol
+from Settings import LOG_QUEUE
+from typing   import Awaitable, Callable
+import asyncio
+
+class LogKuyrugu:
+    """
+    İstek loglarını yanıt yolunun dışında yazan sınırlı kuyruk
+
+    Middleware kaydı kuyruğa bırakıp yanıtı hemen döner; konum sorgusu ve konsol yazımı arka plan
+    işçilerinde yapılır. Kuyruk doluysa kayıt düşürülür (istek asla beklemez), düşürülen sayısı
+    bir sonraki yazımda raporlanır.
+    """
+
+    def __init__(self, boyut: int, isci_sayisi: int):
+        self.boyut       = max(boyut, 1)
+        self.isci_sayisi = max(isci_sayisi, 1)
+        self.dusurulen   = 0
+        self._kuyruk: asyncio.Queue | None = None
+        self._isciler: list[asyncio.Task]  = []
+
+    def ekle(self, isleyici: Callable[..., Awaitable], *args) -> bool:
+        """Log kaydını kuyruğa bırak (işçiler ilk kayıtta başlatılır), kuyruk doluysa False"""
+        if self._kuyruk is None:
+            self._kuyruk  = asyncio.Queue(maxsize=self.boyut)
+            self._isciler = [asyncio.create_task(self._isci()) for _ in range(self.isci_sayisi)]
+
+        try:
+            self._kuyruk.put_nowait((isleyici, args))
+        except asyncio.QueueFull:
+            self.dusurulen += 1
+            return False
+
+        return True
+
+    async def close(self, timeout: float = 5):
+        """Bekleyen kayıtları kısa süre yazmaya çalış, sonra işçileri durdur (lifespan shutdown)"""
+        if self._kuyruk is None:
+            return
+
+        try:
+            await asyncio.wait_for(self._kuyruk.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        for isci in self._isciler:
+            isci.cancel()
+        await asyncio.gather(*self._isciler, return_exceptions=True)
+        self._kuyruk, self._isciler = None, []
+
+    async def _isci(self):
+        while True:
+            isleyici, args = await self._kuyruk.get()
+            try:
+                if self.dusurulen:
+                    konsol.log(f"[yellow]Log kuyruğu doldu, {self.dusurulen} kayıt düşürüldü[/]")
+                    self.dusurulen = 0
+
+                await isleyici(*args)
+            except Exception as hata:
+                konsol.log(f"[red]Log yazılamadı:[/] {hata}")
+            finally:
+                self._kuyruk.task_done()
+
+
+# Singleton instance
+log_kuyrugu = LogKuyrugu(
+    boyut       = LOG_QUEUE.get("SIZE", 1000),
+    isci_sayisi = LOG_QUEUE.get("WORKERS", 4),
+)
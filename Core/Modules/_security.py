@@ -1,39 +1,67 @@
 # Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
 
-from Core import kekik_FastAPI, Request
-
-@kekik_FastAPI.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    response = await call_next(request)
+from starlette.datastructures import MutableHeaders
+from starlette.types          import ASGIApp, Message, Receive, Scope, Send
 
+# `SECURITY.HEADERS` açıkken her yanıta eklenen başlıklar (http.response.start üzerinde, gövdeye dokunmadan)
+GUVENLIK_BASLIKLARI = {
     # --- Temel Güvenlik Başlıkları ---
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"]        = "SAMEORIGIN"              # Rich Snippet'ler için uygun
-    response.headers["X-XSS-Protection"]       = "0"                       # Modern tarayıcılarda devre dışı bırak (CSP ile korunuyor)
-    response.headers["Referrer-Policy"]        = "strict-origin-when-cross-origin"
+    "X-Content-Type-Options"       : "nosniff",
+    "X-Frame-Options"              : "SAMEORIGIN",                       # Rich Snippet'ler için uygun
+    "X-XSS-Protection"             : "0",                                # Modern tarayıcılarda devre dışı bırak (CSP ile korunuyor)
+    "Referrer-Policy"              : "strict-origin-when-cross-origin",
 
     # --- Modern Tarayıcı / İzolasyon Politikaları ---
-    response.headers["Cross-Origin-Opener-Policy"]   = "same-origin"
-    # response.headers["Cross-Origin-Embedder-Policy"] = "credentialless"
-    response.headers["Cross-Origin-Resource-Policy"] = "cross-origin"
-
-    # --- HTTPS Zorlaması (HSTS) ---
-    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
+    "Cross-Origin-Opener-Policy"   : "same-origin",
+    # "Cross-Origin-Embedder-Policy" : "credentialless",
+    "Cross-Origin-Resource-Policy" : "cross-origin",
 
     # --- Permissions-Policy (Feature-Policy) ---
     # Permissions-Policy: sadece bilinen ve stabil feature'lar kısıtlanıyor
-    response.headers["Permissions-Policy"] = (
-        "camera=(), microphone=(), geolocation=(), payment=(), "
-        "fullscreen=(self)"
-    )
+    "Permissions-Policy"           : "camera=(), microphone=(), geolocation=(), payment=(), fullscreen=(self)",
+}
+
+def guvenlik_basliklari(ayar: dict) -> dict[str, str]:
+    """AYAR'daki `SECURITY` bölümünden gönderilecek başlıkları üret (hepsi açıkça açılmadıkça kapalı)"""
+    basliklar = dict(GUVENLIK_BASLIKLARI) if ayar.get("HEADERS", False) else {}
+
+    # --- HTTPS Zorlaması (HSTS) --- tarayıcı max-age boyunca hatırlar, alt alan / preload ayrıca seçilir
+    if ayar.get("HSTS", False):
+        hsts = f"max-age={int(ayar.get('HSTS_MAX_AGE', 31536000))}"
+        if ayar.get("HSTS_SUBDOMAINS", False):
+            hsts += "; includeSubDomains"
+        if ayar.get("HSTS_PRELOAD", False):
+            hsts += "; preload"
+        basliklar["Strict-Transport-Security"] = hsts
+
+    return basliklar
+
+class GuvenlikMiddleware:
+    """Güvenlik başlıkları (saf ASGI, sadece yanıt başlığına dokunur)"""
+
+    def __init__(self, app: ASGIApp, basliklar: dict[str, str]):
+        self.app       = app
+        self.basliklar = basliklar
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Admin ve özel rotaları gizle
+        gizli = scope["path"].startswith(("/admin", "/api"))
 
-    # Admin ve özel rotaları gizle
-    if request.url.path.startswith(("/admin", "/api")):
-        response.headers["X-Robots-Tag"] = "noindex, nofollow"
+        async def gonder(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.update(self.basliklar)
+                if gizli:
+                    headers["X-Robots-Tag"] = "noindex, nofollow"
 
-    # --- Gereksiz Bilgi Sızmalarını Temizle ---
-    for header in ("server", "x-powered-by"):
-        if header in response.headers:
-            del response.headers[header]
+                # --- Gereksiz Bilgi Sızmalarını Temizle ---
+                for header in ("server", "x-powered-by"):
+                    if header in headers:
+                        del headers[header]
+            await send(message)
 
-    return response
+        await self.app(scope, receive, gonder)
@@ -0,0 +1,148 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types          import ASGIApp, Message, Receive, Scope, Send
+from collections              import OrderedDict
+import asyncio, hashlib, zlib
+
+# Bu boyuttan büyük gövdeler event loop'u bloklamamak için thread'de sıkıştırılır
+THREAD_MIN_SIZE = 128 * 1024
+
+class GZipOnbellek:
+    """Sıkıştırılmış gövdelerin LRU önbelleği (yol + ETag veya içerik özeti anahtarlı, toplam bayt sınırlı)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(max_bytes, 0)
+        self.size      = 0
+        self.hits      = 0
+        self.misses    = 0
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+
+    def get(self, key: tuple) -> bytes | None:
+        if (body := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key: tuple, body: bytes):
+        if len(body) > self.max_bytes // 8 or key in self._entries:
+            return
+
+        self._entries[key] = body
+        self.size         += len(body)
+        while self.size > self.max_bytes:
+            _, eski    = self._entries.popitem(last=False)
+            self.size -= len(eski)
+
+class SikistirmaMiddleware:
+    """
+    İçerik türü / yol farkında gzip sıkıştırması
+
+    Zaten sıkıştırılmış medya (video, ses, resim, octet-stream...) ve Range yanıtları olduğu gibi geçer.
+    `akis_yollari` altındaki akış yanıtları (ör. proxy'lenen segmentler) sıkıştırılmaz; aynı yoldan tek
+    parça dönen playlist / altyazı yine sıkıştırılır. Tek parça gövdelerin gzip çıktısı yol + ETag'e (yoksa
+    içerik özetine) göre önbelleklenir; aynı playlist'i çeken izleyiciler tekrar sıkıştırma yapmaz.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000, compresslevel: int = 6, akis_yollari: tuple[str, ...] = (), haric_turler: tuple[str, ...] = (), onbellek_bytes: int = 8 * 1024 * 1024):
+        self.app            = app
+        self.minimum_size   = minimum_size
+        self.compresslevel  = compresslevel
+        self.akis_yollari   = tuple(akis_yollari)
+        self.haric_turler   = tuple(tur.lower() for tur in haric_turler)
+        self.onbellek       = GZipOnbellek(onbellek_bytes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        akis       = scope["path"].startswith(self.akis_yollari)
+        baslangic  = None   # Bekletilen http.response.start
+        gecis      = False  # Yanıt olduğu gibi geçiyor
+        compressor = None   # Akış yanıtı sıkıştırılıyor
+
+        async def baslat():
+            nonlocal baslangic
+            if baslangic is not None:
+                await send(baslangic)
+                baslangic = None
+
+        async def gonder(message: Message):
+            nonlocal baslangic, gecis, compressor
+
+            kind = message["type"]
+            if kind == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or message["status"] == 206 or self._haric(headers.get("content-type", "")):
+                    gecis = True
+                    await send(message)
+                else:
+                    baslangic = message
+                return
+
+            if gecis or kind != "http.response.body":
+                # pathsend / trailers: bekletilen başlık (varsa) değiştirilmeden gider
+                gecis = True
+                await baslat()
+                await send(message)
+                return
+
+            body      = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is not None:
+                message["body"] = await self._sikistir(compressor, body, more_body)
+                await send(message)
+                return
+
+            # İlk gövde parçası: sıkıştırılıp sıkıştırılmayacağına burada karar verilir
+            if (more_body and akis) or (not more_body and len(body) < self.minimum_size):
+                gecis = True
+                await baslat()
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=baslangic["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            headers["Content-Encoding"] = "gzip"
+
+            if more_body:
+                del headers["Content-Length"]
+                compressor      = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+                message["body"] = await self._sikistir(compressor, body, True)
+            else:
+                message["body"]           = await self._tek_parca(scope, headers, body)
+                headers["Content-Length"] = str(len(message["body"]))
+
+            await baslat()
+            await send(message)
+
+        await self.app(scope, receive, gonder)
+
+    def _haric(self, content_type: str) -> bool:
+        return content_type.partition(";")[0].strip().lower().startswith(self.haric_turler)
+
+    async def _tek_parca(self, scope: Scope, headers: MutableHeaders, body: bytes) -> bytes:
+        # FileResponse ETag'i sadece mtime + boyuttan üretilir (yol yok): aynı anda kopyalanmış aynı boyutlu
+        # dosyalar çakışmasın diye ETag, isteğin yolu ve sorgusuyla birlikte anahtar olur
+        etag = headers.get("etag")
+        key  = (scope["path"], scope.get("query_string", b""), etag, len(body)) if etag else (hashlib.blake2b(body, digest_size=16).digest(),)
+
+        if (compressed := self.onbellek.get(key)) is None:
+            compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            compressed = await self._sikistir(compressor, body, False)
+            self.onbellek.put(key, compressed)
+
+        return compressed
+
+    @staticmethod
+    async def _sikistir(compressor, body: bytes, more_body: bool) -> bytes:
+        flush = zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+        if len(body) >= THREAD_MIN_SIZE:
+            return await asyncio.to_thread(lambda: compressor.compress(body) + compressor.flush(flush))
+
+        return compressor.compress(body) + compressor.flush(flush)
@@ -1,16 +1,63 @@
 # Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
 
-from CLI      import konsol
-from Settings import AYAR, HOST, PORT
-from sys      import version_info
-import uvicorn, subprocess
+from CLI                        import konsol
+from Settings                   import AYAR, HOST, PORT, WORKERS, ROOM_BACKEND, ROOM_AFFINITY
+from sys                        import version_info
+from multiprocessing.connection import wait
+import uvicorn, subprocess, multiprocessing, socket, os, time
+
+def _affinity_worker(shared_socket: socket.socket, index: int):
+    """Affinity worker'ı: ortak port + odaların aktarıldığı iç port"""
+    private_socket = socket.create_server(("127.0.0.1", ROOM_AFFINITY.get("BASE_PORT", 3400) + index))
+    config = uvicorn.Config("Core:kekik_FastAPI", proxy_headers=True, forwarded_allow_ips="*", log_level="error")
+    uvicorn.Server(config).run(sockets=[shared_socket, private_socket])
+
+def _affinity_spawn(context, shared_socket: socket.socket, index: int):
+    # spawn edilen süreç ortamı başlarken kopyalar, Settings sırayı buradan okur
+    os.environ["KEKIK_WORKER_INDEX"] = str(index)
+    process = context.Process(target=_affinity_worker, args=(shared_socket, index))
+    process.start()
+    del os.environ["KEKIK_WORKER_INDEX"]
+    return process
+
+def _affinity_basla(workers: int):
+    """Her odayı tek worker'da tutan çoklu süreç başlatıcı (çöken worker yeniden başlatılır)"""
+    shared_socket = socket.create_server((HOST, PORT))
+    context       = multiprocessing.get_context("spawn")
+    processes     = {index: _affinity_spawn(context, shared_socket, index) for index in range(workers)}
+
+    try:
+        while True:
+            wait([process.sentinel for process in processes.values()])
+            for index, process in processes.items():
+                if not process.is_alive():
+                    konsol.print(f"[yellow]Worker {index} kapandı (kod {process.exitcode}), yeniden başlatılıyor...[/]")
+                    time.sleep(1)
+                    processes[index] = _affinity_spawn(context, shared_socket, index)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join(5)
 
 def basla():
     surum = f"{version_info[0]}.{version_info[1]}"
     konsol.print(f"\n[bold gold1]{AYAR['PROJE']}[/] [yellow]:bird:[/] [turquoise2]Python {surum}[/] [bold yellow2]uvicorn[/]", width=70, justify="center")
     konsol.print(f"[red]{HOST}[light_coral]:[/]{PORT}[pale_green1] başlatılmıştır...[/]\n", width=70, justify="center")
 
-    uvicorn.run("Core:kekik_FastAPI", host=HOST, port=PORT, proxy_headers=True, forwarded_allow_ips="*", workers=1, log_level="error")
+    # Odalar worker'lara sabitlenir, yanlış worker'a gelen WebSocket sahibine aktarılır
+    workers = WORKERS
+    if workers > 1 and ROOM_AFFINITY.get("ENABLED", True):
+        return _affinity_basla(workers)
+
+    # Bellek içi oda backend'i süreçler arası paylaşılmaz
+    if workers > 1 and ROOM_BACKEND.get("TYPE", "memory") != "redis":
+        konsol.print("[yellow]WORKERS > 1 için ROOM_AFFINITY veya ROOM_BACKEND redis gerekli, tek worker ile başlatılıyor...[/]", width=70, justify="center")
+        workers = 1
+
+    uvicorn.run("Core:kekik_FastAPI", host=HOST, port=PORT, proxy_headers=True, forwarded_allow_ips="*", workers=workers, log_level="error")
 
     # komut = [
     #     "gunicorn",
@@ -2,8 +2,8 @@
 
 from fastapi                 import FastAPI, Request, Response, HTTPException, Form, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from Core.Modules            import lifespan
+from Settings                import STREAM_PATHS, GZIP, SECURITY
+from Core.Modules            import lifespan, SikistirmaMiddleware, GuvenlikMiddleware, IstekMiddleware, guvenlik_basliklari
 from fastapi.staticfiles     import StaticFiles
 from fastapi.responses       import JSONResponse, HTMLResponse, RedirectResponse, PlainTextResponse, FileResponse
 
@@ -18,11 +18,21 @@ kekik_FastAPI = FastAPI(
 # ! ----------------------------------------» Middlewares
 
 kekik_FastAPI.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
-kekik_FastAPI.add_middleware(GZipMiddleware, minimum_size=1000)
+kekik_FastAPI.add_middleware(SikistirmaMiddleware,
+    minimum_size   = GZIP.get("MIN_SIZE", 1000),
+    compresslevel  = GZIP.get("LEVEL", 6),
+    akis_yollari   = STREAM_PATHS,
+    haric_turler   = tuple(GZIP.get("EXCLUDE_TYPES") or ("video/", "audio/", "application/octet-stream")),
+    onbellek_bytes = GZIP.get("CACHE_BYTES", 8 * 1024 * 1024),
+)
+# Güvenlik başlıkları (HSTS dahil) AYAR'da açıkça açılmadıkça gönderilmez
+if guvenlik := guvenlik_basliklari(SECURITY):
+    kekik_FastAPI.add_middleware(GuvenlikMiddleware, basliklar=guvenlik)
+kekik_FastAPI.add_middleware(IstekMiddleware)  # En dışta: log ve zaman aşımı tüm katmanları kapsar
 
 # ! ----------------------------------------» Routers
 
-from Core.Modules             import _istek, _hata
+from Core.Modules             import _hata
 from Public.Home.Routers      import home_router
 from Public.API.v1.Routers    import api_v1_router
 from Public.WebSocket.Routers import wss_router
@@ -7,4 +7,11 @@ from .helpers import (
     detect_hls_from_url,
     stream_wrapper,
     process_subtitle_content
-)
\ No newline at end of file
+)
+
+from .proxy_client  import proxy_client, ProxyClient
+from .disk_cache    import disk_cache, DiskCache, DiskSegment
+from .segment_cache import segment_cache, SegmentCache
+from .hls           import playlist_cache, PlaylistCache
+from .prefetch      import segment_prefetcher, SegmentPrefetcher
+from .range_cache   import range_response, parse_range_header
@@ -0,0 +1,150 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from CLI         import konsol
+from Settings    import PROXY_DISK
+from collections import OrderedDict
+from pathlib     import Path
+from .helpers    import DEFAULT_CHUNK_SIZE
+from time        import time
+import asyncio, hashlib, json, os
+
+class DiskSegment:
+    """Diskte tutulan segment / blok, FileResponse ile servis edilir"""
+    __slots__ = ("path", "status", "headers", "size", "expires_at")
+
+    def __init__(self, path: Path, status: int, headers: dict, size: int, expires_at: float):
+        self.path       = path
+        self.status     = status
+        self.headers    = headers
+        self.size       = size
+        self.expires_at = expires_at  # Duvar saati (yeniden başlatmadan sonra da geçerli)
+
+    async def iter_body(self):
+        """Dosyayı chunk'lar halinde okur (Range blokları için)"""
+        with open(self.path, "rb") as dosya:
+            while chunk := await asyncio.to_thread(dosya.read, DEFAULT_CHUNK_SIZE):
+                yield chunk
+
+class DiskCache:
+    """Proxy cache'inin isteğe bağlı disk katmanı (LRU / FIFO, bayt sınırlı)"""
+
+    def __init__(self, directory: str, max_bytes: int, policy: str = "lru", max_age: float = 3600):
+        self.directory   = Path(directory)
+        self.max_bytes   = max_bytes
+        self.policy      = policy.lower()
+        self.max_age     = max_age
+        self.total_bytes = 0
+        self._index: OrderedDict[str, DiskSegment] = OrderedDict()
+        self._tasks: set[asyncio.Task]             = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def _name(key: tuple) -> str:
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+    # ============== Lifespan ==============
+
+    async def load(self):
+        """Mevcut cache dizinini tara ve index'i (en eskiden yeniye) yeniden kur"""
+        if not self.enabled:
+            return
+
+        await asyncio.to_thread(self._load)
+        self._evict()
+
+    def _load(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        now = time()
+        for meta_path in sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime):
+            body_path = meta_path.with_suffix(".bin")
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                size = body_path.stat().st_size
+                if meta.get("expires_at", 0) <= now:
+                    raise ValueError("Süresi dolmuş")
+            except (OSError, ValueError):
+                meta_path.unlink(missing_ok=True)
+                body_path.unlink(missing_ok=True)
+                continue
+
+            self._index[meta_path.stem] = DiskSegment(body_path, meta["status"], meta["headers"], size, meta["expires_at"])
+            self.total_bytes += size
+
+    # ============== Lookup ==============
+
+    def get(self, key: tuple) -> DiskSegment | None:
+        name = self._name(key)
+        if not (entry := self._index.get(name)):
+            return None
+
+        # Süresi dolan (imzalı URL'ler eskir) veya dışarıdan silinen / değişen dosya servis edilmez
+        try:
+            valid = entry.expires_at > time() and os.stat(entry.path).st_size == entry.size
+        except OSError:
+            valid = False
+
+        if not valid:
+            self._remove(name)
+            return None
+
+        if self.policy == "lru":
+            self._index.move_to_end(name)
+        return entry
+
+    # ============== Storage ==============
+
+    def put(self, key: tuple, status: int, headers: dict, body: bytes):
+        """Tamamlanan girdiyi arka planda diske yaz"""
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+
+        task = asyncio.create_task(self._put(self._name(key), status, headers, body))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _put(self, name: str, status: int, headers: dict, body: bytes):
+        if name in self._index:
+            return
+
+        body_path  = self.directory / f"{name}.bin"
+        expires_at = time() + self.max_age
+        try:
+            await asyncio.to_thread(self._write, body_path, status, headers, body, expires_at)
+        except OSError as e:
+            konsol.print(f"[red]Disk cache yazma hatası: {str(e)}[/red]")
+            return
+
+        self._index[name] = DiskSegment(body_path, status, headers, len(body), expires_at)
+        self.total_bytes += len(body)
+        self._evict()
+
+    @staticmethod
+    def _write(body_path: Path, status: int, headers: dict, body: bytes, expires_at: float):
+        # Yarım dosya servis edilmesin diye önce geçici dosyaya yaz, sonra taşı
+        temp_path = body_path.with_suffix(".tmp")
+        temp_path.write_bytes(body)
+        os.replace(temp_path, body_path)
+        body_path.with_suffix(".json").write_text(json.dumps({"status": status, "headers": headers, "expires_at": expires_at}), encoding="utf-8")
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._index:
+            self._remove(next(iter(self._index)))
+
+    def _remove(self, name: str):
+        entry = self._index.pop(name)
+        self.total_bytes -= entry.size
+        entry.path.unlink(missing_ok=True)
+        entry.path.with_suffix(".json").unlink(missing_ok=True)
+
+
+# Singleton instance
+disk_cache = DiskCache(
+    directory = PROXY_DISK.get("DIR", ".cache/proxy"),
+    max_bytes = PROXY_DISK.get("MAX_BYTES", 0),
+    policy    = PROXY_DISK.get("POLICY", "lru"),
+    max_age   = PROXY_DISK.get("MAX_AGE", 3600),
+)
@@ -43,7 +43,6 @@ def prepare_request_headers(request: Request, url: str, referer: str | None, use
     headers = {
         "Accept"          : "*/*",
         "Accept-Encoding" : "identity",
-        "Connection"      : "keep-alive",
     }
     
     # User-Agent ayarı
@@ -56,6 +55,10 @@ def prepare_request_headers(request: Request, url: str, referer: str | None, use
     if referer and referer != "None":
         headers["Referer"] = unquote(referer)
 
+    # Range (seek) isteğini upstream'e ilet
+    if range_header := request.headers.get("Range"):
+        headers["Range"] = range_header
+
     return headers
 
 def prepare_response_headers(response_headers: dict, url: str, detected_content_type: str = None) -> dict:
@@ -0,0 +1,165 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from collections  import OrderedDict
+from urllib.parse import urljoin, urlencode
+from time         import monotonic
+from typing       import AsyncIterator
+from .helpers     import detect_hls_from_url, DEFAULT_CHUNK_SIZE
+import httpx, re
+
+HLS_CONTENT_TYPE  = "application/vnd.apple.mpegurl"
+MAX_SNIFF_SIZE    = 1024 * 256       # 256KB, #EXTM3U ile başlamayan gövde bundan fazla belleğe alınmaz
+MAX_PLAYLIST_SIZE = 1024 * 1024 * 8  # 8MB, uzun VOD playlist'leri için üst sınır
+PROXY_VIDEO_PATH  = "/api/v1/proxy/video"
+
+URI_ATTR_REGEX     = re.compile(r'URI="([^"]*)"')
+TARGET_DURATION_RE = re.compile(r"^#EXT-X-TARGETDURATION:\s*([\d.]+)", re.MULTILINE)
+
+PlaylistKey = tuple[str, str, str, str]
+
+def maybe_playlist(url: str, content_type: str, content_length: str | None) -> bool:
+    """Yanıt bir HLS playlist'i olabilir mi? (gövdeyi belleğe almaya değer mi)"""
+    content_type = content_type.lower()
+    if "mpegurl" in content_type or detect_hls_from_url(url):
+        return True
+
+    # Uzantısız / text veya octet-stream olarak dönen küçük playlist'ler
+    if content_type and not content_type.startswith("text/") and "octet-stream" not in content_type:
+        return False
+
+    try:
+        return 0 < int(content_length or "") <= MAX_SNIFF_SIZE
+    except ValueError:
+        return False
+
+def is_playlist(body: bytes) -> bool:
+    """Gövde #EXTM3U ile mi başlıyor?"""
+    return body.lstrip(b"\xef\xbb\xbf").lstrip().startswith(b"#EXTM3U")
+
+async def read_limited(response: httpx.Response) -> tuple[bytes, AsyncIterator[bytes] | None]:
+    """
+    Olası playlist gövdesini sınırlı oku
+
+    #EXTM3U ile başlayan gövde en fazla `MAX_PLAYLIST_SIZE`, diğerleri `MAX_SNIFF_SIZE` kadar belleğe alınır.
+    Sınır aşılırsa okunan baş ve kalan akış döner (çağıran `stream_rest` ile olduğu gibi akıtır), tamamı
+    okunduysa kalan akış None'dır.
+    """
+    chunks = response.aiter_bytes(chunk_size=DEFAULT_CHUNK_SIZE)
+    body   = bytearray()
+    limit  = MAX_SNIFF_SIZE
+
+    async for chunk in chunks:
+        body += chunk
+        if limit == MAX_SNIFF_SIZE and is_playlist(bytes(body[:64])):
+            limit = MAX_PLAYLIST_SIZE
+        if len(body) > limit:
+            return bytes(body), chunks
+
+    return bytes(body), None
+
+async def stream_rest(head: bytes, rest: AsyncIterator[bytes], response: httpx.Response):
+    """`read_limited`'in okuduğu başı ve kalan akışı yield eder, sonunda upstream'i kapatır"""
+    try:
+        yield head
+        async for chunk in rest:
+            yield chunk
+    finally:
+        await response.aclose()
+
+def build_proxy_url(url: str, referer: str | None, user_agent: str | None, room_id: str | None) -> str:
+    """Upstream URI'yi headerları taşıyan proxy URL'sine çevirir"""
+    params = {"url": url}
+    if referer and referer != "None":
+        params["referer"] = referer
+    if user_agent and user_agent != "None":
+        params["user_agent"] = user_agent
+    if room_id:
+        params["room_id"] = room_id
+
+    return f"{PROXY_VIDEO_PATH}?{urlencode(params)}"
+
+def rewrite_playlist(text: str, base_url: str, referer: str | None, user_agent: str | None, room_id: str | None) -> str:
+    """
+    Master / media playlist içindeki tüm URI'leri çözümleyip proxy URL'lerine çevirir
+
+    - Segment / alt playlist satırları
+    - EXT-X-KEY, EXT-X-MAP, EXT-X-MEDIA, EXT-X-I-FRAME-STREAM-INF vb. URI="..." attribute'ları
+    """
+    def proxify(uri: str) -> str:
+        absolute = urljoin(base_url, uri.strip())
+        if not absolute.startswith(("http://", "https://")):
+            return uri  # data:, skd:// vb. dokunma
+
+        return build_proxy_url(absolute, referer, user_agent, room_id)
+
+    lines = []
+    for line in text.lstrip("\ufeff").splitlines():
+        stripped = line.strip()
+        if stripped.startswith("#"):
+            line = URI_ATTR_REGEX.sub(lambda m: f'URI="{proxify(m.group(1))}"', line)
+        elif stripped:
+            line = proxify(stripped)
+
+        lines.append(line)
+
+    return "\n".join(lines) + "\n"
+
+def parse_media_segments(text: str, base_url: str) -> list[tuple[float, str]]:
+    """Media playlist'teki segmentleri (başlangıç süresi, mutlak URL) olarak döndürür"""
+    segments = []
+    position = 0.0
+    duration = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#EXTINF:"):
+            try:
+                duration = float(line[8:].split(",", 1)[0])
+            except ValueError:
+                duration = 0.0
+        elif line and not line.startswith("#") and duration is not None:
+            segments.append((position, urljoin(base_url, line)))
+            position += duration
+            duration  = None
+
+    return segments
+
+def playlist_ttl(text: str, default_ttl: float) -> float:
+    """Canlı media playlist'ler target duration kadar, VOD / master playlist'ler varsayılan süre kadar cache'lenir"""
+    if "#EXT-X-ENDLIST" in text:
+        return default_ttl
+
+    if match := TARGET_DURATION_RE.search(text):
+        return max(float(match.group(1)), 1.0)
+
+    return default_ttl
+
+class PlaylistCache:
+    """Yeniden yazılmış playlist'ler için küçük, süre sınırlı cache"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[PlaylistKey, tuple[bytes, float]] = OrderedDict()
+
+    def get(self, key: PlaylistKey) -> bytes | None:
+        if cached := self._entries.get(key):
+            body, expires_at = cached
+            if expires_at > monotonic():
+                self._entries.move_to_end(key)
+                return body
+            del self._entries[key]
+        return None
+
+    def put(self, key: PlaylistKey, body: bytes, ttl: float):
+        self._entries[key] = (body, monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def drop_room(self, room_id: str):
+        """Odaya ait playlist'leri bırak"""
+        for key in [key for key in self._entries if key[3] == room_id]:
+            del self._entries[key]
+
+
+# Singleton instance
+playlist_cache = PlaylistCache()
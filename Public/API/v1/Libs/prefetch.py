@@ -0,0 +1,174 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from CLI            import konsol
+from Settings       import PROXY_PREFETCH
+from collections    import OrderedDict
+from datetime       import datetime
+from .helpers       import prepare_response_headers
+from .hls           import parse_media_segments
+from .proxy_client  import proxy_client
+from .segment_cache import segment_cache
+import asyncio
+
+class MediaPlaylist:
+    """Odada izlenen bir media playlist'in segment listesi"""
+    __slots__ = ("segments", "headers", "is_live")
+
+    def __init__(self, segments: list[tuple[float, str]], headers: dict, is_live: bool):
+        self.segments = segments
+        self.headers  = headers
+        self.is_live  = is_live
+
+    def upcoming(self, position: float, count: int) -> list[str]:
+        """Oynatım konumundan sonraki `count` segment (canlı yayında en yeni segmentler)"""
+        if self.is_live:
+            return [url for _, url in self.segments[-count:]]
+
+        index = 0
+        for i, (start, _) in enumerate(self.segments):
+            if start > position:
+                break
+            index = i
+
+        return [url for _, url in self.segments[index:index + count]]
+
+class RoomPrefetch:
+    """Tek odanın prefetch durumu"""
+
+    def __init__(self, room_id: str, room):
+        self.room_id   = room_id
+        self.room      = room  # current_time, is_playing, updated_at alanları okunur
+        self.playlists: OrderedDict[str, MediaPlaylist] = OrderedDict()
+        self.skipped: set[str]         = set()  # Cache'lenemeyen / hata veren segmentler
+        self.task: asyncio.Task | None = None
+        self.wake      = asyncio.Event()  # Duraklatılmış odada yeni playlist gelince uyandırır
+
+    def live_position(self) -> float:
+        position = self.room.current_time
+        if self.room.is_playing:
+            position += datetime.now().timestamp() - self.room.updated_at
+        return position
+
+class SegmentPrefetcher:
+    """Aktif odaların oynatım konumunun önündeki segmentleri proxy cache'ine ısıtır"""
+
+    def __init__(self, ahead: int, concurrency: int, max_playlists: int = 2, interval: float = 1.0):
+        self.ahead         = ahead
+        self.max_playlists = max_playlists
+        self.interval      = interval
+        self._rooms: dict[str, RoomPrefetch] = {}
+        self._semaphore    = asyncio.Semaphore(max(concurrency, 1))
+
+    @property
+    def enabled(self) -> bool:
+        return self.ahead > 0 and segment_cache.enabled
+
+    # ============== WatchPartyManager Hooks ==============
+
+    def attach(self, room_id: str, room):
+        """Oda videosu değişti: eski prefetch'i iptal et, yeni video için baştan başla"""
+        self.detach(room_id)
+        if self.enabled:
+            self._rooms[room_id] = RoomPrefetch(room_id, room)
+
+    def detach(self, room_id: str):
+        """Oda kapandı"""
+        if state := self._rooms.pop(room_id, None):
+            self._cancel(state)
+
+    def notify(self, room_id: str):
+        """Oynatım durumu değişti (seek / play / pause): eski konumun prefetch'ini iptal et"""
+        if state := self._rooms.get(room_id):
+            self._restart(state)
+
+    async def close(self):
+        """Tüm prefetch görevlerini durdur (lifespan shutdown)"""
+        for room_id in list(self._rooms):
+            self.detach(room_id)
+
+    # ============== Proxy Hook ==============
+
+    def register_playlist(self, room_id: str | None, url: str, headers: dict, text: str):
+        """Proxy'den geçen media playlist'i odaya kaydet"""
+        state = self._rooms.get(room_id) if room_id else None
+        if not state or "#EXTINF" not in text:
+            return
+
+        segments = parse_media_segments(text, url)
+        if not segments:
+            return
+
+        headers = {key: value for key, value in headers.items() if key != "Range"}
+        state.playlists[url] = MediaPlaylist(segments, headers, "#EXT-X-ENDLIST" not in text)
+        state.playlists.move_to_end(url)
+        while len(state.playlists) > self.max_playlists:
+            state.playlists.popitem(last=False)
+
+        # Sadece güncel playlist'lerde kalan segmentler atlanmaya devam eder
+        if state.skipped:
+            current        = {segment for playlist in state.playlists.values() for _, segment in playlist.segments}
+            state.skipped &= current
+
+        if not state.task or state.task.done():
+            self._restart(state)
+        else:
+            state.wake.set()
+
+    # ============== Worker ==============
+
+    def _cancel(self, state: RoomPrefetch):
+        if state.task and not state.task.done():
+            state.task.cancel()
+        state.task = None
+
+    def _restart(self, state: RoomPrefetch):
+        self._cancel(state)
+        if state.playlists:
+            state.task = asyncio.create_task(self._run(state))
+
+    async def _run(self, state: RoomPrefetch):
+        while True:
+            state.wake.clear()
+            position = state.live_position()
+            for playlist in list(state.playlists.values()):
+                for url in playlist.upcoming(position, self.ahead):
+                    if url not in state.skipped and not await self._warm(state.room_id, url, playlist.headers):
+                        state.skipped.add(url)
+
+            # Duraklatılmış odada konum ilerlemez; play / seek (notify) veya yeni playlist gelene kadar uyu
+            if state.room.is_playing:
+                await asyncio.sleep(self.interval)
+            else:
+                await state.wake.wait()
+
+    async def _warm(self, room_id: str, url: str, headers: dict) -> bool:
+        """Segment cache'te yoksa upstream'den indirip cache'e koy, cache'lenemiyorsa False döner"""
+        _, lead = await segment_cache.acquire(segment_cache.make_key(url, headers), room_id)
+        if not lead:
+            return True
+
+        try:
+            async with self._semaphore:
+                client   = proxy_client.client
+                response = await client.send(client.build_request("GET", url, headers=headers), stream=True)
+
+                final_headers = prepare_response_headers(dict(response.headers), url)
+                if not segment_cache.accepts(response, final_headers.get("Content-Type", "")):
+                    await response.aclose()
+                    return False
+
+                segment_cache.fill(lead, response, final_headers)
+                await lead.wait_done()
+                return not lead.failed
+        except Exception as e:
+            konsol.print(f"[yellow]Prefetch hatası ({room_id}): {str(e)}[/yellow]")
+            return False
+        finally:
+            segment_cache.abandon(lead)
+
+
+# Singleton instance
+segment_prefetcher = SegmentPrefetcher(
+    ahead       = PROXY_PREFETCH.get("SEGMENTS", 3),
+    concurrency = PROXY_PREFETCH.get("CONCURRENCY", 4),
+)
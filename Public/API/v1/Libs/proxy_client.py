@@ -0,0 +1,58 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from CLI      import konsol
+from Settings import PROXY_POOL
+import httpx
+
+class ProxyClient:
+    """Proxy endpoint'lerinin paylaştığı uygulama geneli httpx client'ı"""
+
+    def __init__(self):
+        self._client: httpx.AsyncClient | None = None
+
+    @staticmethod
+    def _http2_available() -> bool:
+        """HTTP/2 için gerekli `h2` paketi kurulu mu?"""
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    async def start(self):
+        """Client'ı oluştur (lifespan startup)"""
+        if self._client is not None:
+            return
+
+        http2 = bool(PROXY_POOL.get("HTTP2", True))
+        if http2 and not self._http2_available():
+            konsol.log("[yellow]h2 kurulu değil, proxy HTTP/1.1 ile devam ediyor[/]")
+            http2 = False
+
+        self._client = httpx.AsyncClient(
+            follow_redirects = True,
+            http2            = http2,
+            timeout          = httpx.Timeout(connect=10.0, read=60.0, write=10.0, pool=10.0),
+            limits           = httpx.Limits(
+                max_connections           = PROXY_POOL.get("MAX_CONNECTIONS", 200),
+                max_keepalive_connections = PROXY_POOL.get("MAX_KEEPALIVE", 50),
+                keepalive_expiry          = PROXY_POOL.get("KEEPALIVE_EXPIRY", 30),
+            ),
+        )
+
+    async def close(self):
+        """Client'ı kapat (lifespan shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Aktif client"""
+        if self._client is None:
+            raise RuntimeError("ProxyClient başlatılmadı, önce start() çağrılmalı")
+        return self._client
+
+
+# Singleton instance
+proxy_client = ProxyClient()
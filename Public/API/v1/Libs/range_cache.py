@@ -0,0 +1,193 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from Settings          import PROXY_CACHE
+from fastapi           import Response
+from fastapi.responses import StreamingResponse
+from .helpers          import prepare_response_headers, CORS_HEADERS, DEFAULT_CHUNK_SIZE
+from .proxy_client     import proxy_client
+from .segment_cache    import segment_cache, CachedSegment, InflightSegment
+from .disk_cache       import DiskSegment
+import asyncio, httpx, re
+
+BLOCK_SIZE    = PROXY_CACHE.get("BLOCK_SIZE", 1024 * 1024)  # 1MB
+WINDOW_BLOCKS = max(PROXY_CACHE.get("RANGE_BLOCKS", 4), 1)  # Seek noktasından itibaren cache'lenen blok sayısı
+
+RANGE_REGEX         = re.compile(r"^\s*bytes=(\d+)-(\d*)\s*$")
+CONTENT_RANGE_REGEX = re.compile(r"^\s*bytes\s+(\d+)-(\d+)/(\d+)\s*$")
+
+Block = CachedSegment | InflightSegment | DiskSegment
+
+def parse_range_header(value: str | None) -> tuple[int, int | None] | None:
+    """`bytes=start-end` başlığını ayrıştır (çoklu / suffix range desteklenmez)"""
+    if not value or not (match := RANGE_REGEX.match(value)):
+        return None
+
+    start = int(match.group(1))
+    end   = int(match.group(2)) if match.group(2) else None
+    if end is not None and end < start:
+        return None
+
+    return start, end
+
+def _is_whole_block(start: int, first: int, last: int, total: int) -> bool:
+    """Content-Range tam olarak istenen bloğu (dosya sonundaysa kalanını) kapsıyor mu?"""
+    return first == start and last == min(start + BLOCK_SIZE, total) - 1
+
+async def _fetch_block(url: str, headers: dict, index: int, lead: InflightSegment) -> Block | None:
+    """Bloğu upstream'den `Range` ile iste ve cache'e doldur"""
+    try:
+        start  = index * BLOCK_SIZE
+        client = proxy_client.client
+        req    = client.build_request("GET", url, headers={**headers, "Range": f"bytes={start}-{start + BLOCK_SIZE - 1}"})
+
+        response = await client.send(req, stream=True)
+        match    = CONTENT_RANGE_REGEX.match(response.headers.get("content-range", ""))
+        if response.status_code != 206 or not match or not _is_whole_block(start, *map(int, match.groups())):
+            # Upstream range desteklemiyor, hata verdi veya bloğu eksik / kaymış döndü
+            await response.aclose()
+            return None
+
+        return segment_cache.fill(lead, response, prepare_response_headers(dict(response.headers), url))
+    finally:
+        segment_cache.abandon(lead)
+
+async def acquire_block(url: str, headers: dict, index: int, room_id: str | None) -> Block | None:
+    """Bloğu cache'ten / devam eden indirmeden al, yoksa upstream'den çek"""
+    key = (*segment_cache.make_key(url, headers), index)
+
+    # Liderin vazgeçtiği durumda bir kez de kendimiz lider olmayı deneriz
+    for _ in range(2):
+        hit, lead = await segment_cache.acquire(key, room_id)
+        if hit:
+            return hit
+        if lead:
+            return await _fetch_block(url, headers, index, lead)
+
+    return None
+
+async def _slice(body, skip: int, take: int):
+    """Chunk akışından [skip, skip + take) aralığını yield eder"""
+    async for chunk in body:
+        if skip >= len(chunk):
+            skip -= len(chunk)
+            continue
+
+        part = chunk[skip:skip + take]
+        skip = 0
+        take -= len(part)
+        yield part
+
+        if take <= 0:
+            return
+
+async def _open_tail(url: str, headers: dict, start: int, end: int) -> httpx.Response:
+    """Pencereden sonrasını cache'e koymadan tek upstream Range isteğiyle aç"""
+    client   = proxy_client.client
+    req      = client.build_request("GET", url, headers={**headers, "Range": f"bytes={start}-{end}"})
+    response = await client.send(req, stream=True)
+
+    match = CONTENT_RANGE_REGEX.match(response.headers.get("content-range", ""))
+    if response.status_code != 206 or not match or int(match.group(1)) != start:
+        await response.aclose()
+        raise RuntimeError(f"Upstream aralığı vermedi ({response.status_code}): bytes={start}-{end}")
+
+    return response
+
+async def _iter_tail(response: httpx.Response, length: int):
+    """Upstream akışından `length` bayt yield eder, eksik kalırsa hata verir"""
+    try:
+        async for chunk in _slice(response.aiter_bytes(chunk_size=DEFAULT_CHUNK_SIZE), 0, length):
+            length -= len(chunk)
+            yield chunk
+    finally:
+        await response.aclose()
+
+    if length > 0:
+        raise RuntimeError(f"Upstream akışı erken bitti, {length} bayt eksik")
+
+def _discard(task: asyncio.Task | None):
+    """Kullanılmayan ön-indirmeyi iptal et, açılmış upstream yanıtını kapat"""
+    if task is None:
+        return
+
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled() and task.exception() is None and isinstance(task.result(), httpx.Response):
+        asyncio.create_task(task.result().aclose())
+
+async def _iter_range(url: str, headers: dict, start: int, end: int, block: Block, room_id: str | None):
+    """
+    İstenen aralığı yield eder
+
+    Seek noktasından itibaren en fazla `WINDOW_BLOCKS` blok paylaşılan cache'ten servis edilir (bir blok
+    gönderilirken sıradaki indirilir); kalanı cache'i doldurmadan doğrudan upstream'den akar. Eksik veya
+    alınamayan blokta hata fırlatılır, bildirilen Content-Length'ten kısa gövde sessizce bitmez.
+    """
+    index   = start // BLOCK_SIZE
+    last    = min(end // BLOCK_SIZE, index + WINDOW_BLOCKS - 1)
+    pending = None
+    try:
+        while True:
+            block_start = index * BLOCK_SIZE
+            tail_start  = block_start + BLOCK_SIZE
+
+            if index < last:
+                pending = asyncio.create_task(acquire_block(url, headers, index + 1, room_id))
+            elif tail_start <= end:
+                pending = asyncio.create_task(_open_tail(url, headers, tail_start, end))
+
+            skip = max(start - block_start, 0)
+            take = min(end, tail_start - 1) - (block_start + skip) + 1
+            async for chunk in _slice(block.iter_body(), skip, take):
+                take -= len(chunk)
+                yield chunk
+
+            if take > 0:
+                raise RuntimeError(f"Blok {index} eksik, {take} bayt gelmedi")
+
+            if pending is None:
+                return
+
+            task, pending = pending, None
+            if index == last:
+                async for chunk in _iter_tail(await task, end - tail_start + 1):
+                    yield chunk
+                return
+
+            index += 1
+            if (block := await task) is None:
+                raise RuntimeError(f"Blok {index} alınamadı")
+    finally:
+        _discard(pending)
+
+async def range_response(url: str, headers: dict, byte_range: tuple[int, int | None], room_id: str | None) -> Response | None:
+    """
+    Range isteğinin başını 1MB hizalı, odalar arası paylaşılan bloklardan servis et
+
+    Upstream range desteklemiyorsa None döner, çağıran doğrudan proxy'ye düşer.
+    """
+    start, end = byte_range
+
+    first = await acquire_block(url, headers, start // BLOCK_SIZE, room_id)
+    if first is None:
+        return None
+
+    total = int(CONTENT_RANGE_REGEX.match(first.headers["Content-Range"]).group(3))
+    if start >= total:
+        return Response(status_code=416, headers={**CORS_HEADERS, "Content-Range": f"bytes */{total}"})
+
+    end = total - 1 if end is None else min(end, total - 1)
+
+    response_headers = {
+        **first.headers,
+        "Content-Range"  : f"bytes {start}-{end}/{total}",
+        "Content-Length" : str(end - start + 1),
+        "Accept-Ranges"  : "bytes",
+    }
+
+    return StreamingResponse(
+        _iter_range(url, headers, start, end, first, room_id),
+        status_code = 206,
+        headers     = response_headers,
+        media_type  = response_headers.get("Content-Type")
+    )
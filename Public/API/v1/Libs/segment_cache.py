@@ -0,0 +1,240 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from CLI          import konsol
+from Settings     import PROXY_CACHE
+from collections  import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+from time         import monotonic
+from .helpers     import DEFAULT_CHUNK_SIZE
+from .disk_cache  import disk_cache, DiskSegment
+import httpx, asyncio
+
+CacheKey = tuple[str | int, ...]  # (url, referer, user_agent[, blok no])
+
+class CachedSegment:
+    """Tamamlanmış, bellekte tutulan segment"""
+    __slots__ = ("status", "headers", "body", "expires_at", "rooms")
+
+    def __init__(self, status: int, headers: dict, body: bytes, expires_at: float, rooms: set[str]):
+        self.status     = status
+        self.headers    = headers
+        self.body       = body
+        self.expires_at = expires_at
+        self.rooms      = rooms
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    async def iter_body(self):
+        """Gövdeyi chunk'lar halinde yield eder"""
+        for i in range(0, len(self.body), DEFAULT_CHUNK_SIZE):
+            yield self.body[i:i + DEFAULT_CHUNK_SIZE]
+
+class InflightSegment:
+    """Upstream'den inmekte olan segment, aynı anda gelen izleyiciler bu buffer'a bağlanır"""
+
+    def __init__(self, key: CacheKey, rooms: set[str]):
+        self.key       = key
+        self.rooms     = rooms
+        self.status    = 0
+        self.headers   = {}
+        self.chunks    = []
+        self.size      = 0
+        self.cacheable = False
+        self.done      = False
+        self.failed    = False
+        self.ready     = asyncio.Event()  # Upstream headerları geldi (veya vazgeçildi)
+        self._changed  = asyncio.Event()
+
+    def _notify(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait_done(self):
+        """İndirme bitene kadar bekle"""
+        while not self.done:
+            await self._changed.wait()
+
+    async def iter_body(self):
+        """İndirilen chunk'ları sırayla, gerekirse yenisini bekleyerek yield eder"""
+        index = 0
+        while True:
+            if index < len(self.chunks):
+                chunk  = self.chunks[index]
+                index += 1
+                yield chunk
+                continue
+
+            if self.done:
+                return
+
+            await self._changed.wait()
+
+class SegmentCache:
+    """Oda bazlı, bayt sınırlı (LRU + TTL) segment cache'i ve eşzamanlı istek birleştirici"""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int, ttl: float):
+        self.max_bytes       = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.ttl             = ttl
+        self.total_bytes     = 0
+        self._entries: OrderedDict[CacheKey, CachedSegment] = OrderedDict()
+        self._inflight: dict[CacheKey, InflightSegment]     = {}
+        self._tasks: set[asyncio.Task]                      = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(url: str, request_headers: dict) -> CacheKey:
+        """Normalize edilmiş URL + upstream'e giden Referer/User-Agent"""
+        parts = urlsplit(url.strip())
+        normalized = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+        return (normalized, request_headers.get("Referer", ""), request_headers.get("User-Agent", ""))
+
+    # ============== Lookup ==============
+
+    async def acquire(self, key: CacheKey, room_id: str | None) -> tuple[CachedSegment | DiskSegment | InflightSegment | None, InflightSegment | None]:
+        """
+        Cache'e (bellek → disk) bak veya devam eden indirmeye bağlan
+
+        Returns:
+            (hit, None)   : Cache'ten / diskten / devam eden indirmeden servis et
+            (None, lead)  : İlk istek bu, upstream'e git ve `fill` / `abandon` çağır
+            (None, None)  : Birleştirme mümkün değil, doğrudan upstream'e git
+        """
+        rooms = {room_id} if room_id else set()
+
+        if entry := self._entries.get(key):
+            if entry.expires_at > monotonic():
+                self._entries.move_to_end(key)
+                entry.rooms |= rooms
+                return entry, None
+            self._evict(key)
+
+        if stored := disk_cache.get(key):
+            return stored, None
+
+        if inflight := self._inflight.get(key):
+            inflight.rooms |= rooms
+            await inflight.ready.wait()
+            return (inflight, None) if inflight.cacheable else (None, None)
+
+        lead = InflightSegment(key, rooms)
+        self._inflight[key] = lead
+        return None, lead
+
+    def accepts(self, response: httpx.Response, content_type: str) -> bool:
+        """Upstream yanıtı cache'lenebilir mi? (tam gövde, makul boyut, playlist değil)"""
+        if response.status_code != 200 or "mpegurl" in content_type.lower():
+            return False
+
+        try:
+            length = int(response.headers.get("content-length", ""))
+        except ValueError:
+            return False
+
+        return 0 < length <= self.max_entry_bytes
+
+    # ============== Fill ==============
+
+    def fill(self, lead: InflightSegment, response: httpx.Response, headers: dict) -> InflightSegment:
+        """Upstream gövdesini arka planda buffer'a indir, izleyiciler `lead.iter_body()` ile okur"""
+        lead.status    = response.status_code
+        lead.headers   = headers
+        lead.cacheable = True
+        lead.ready.set()
+
+        task = asyncio.create_task(self._download(lead, response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return lead
+
+    def complete(self, lead: InflightSegment, response: httpx.Response, headers: dict, body: bytes):
+        """Lider gövdeyi zaten belleğe aldıysa doğrudan cache'e koy"""
+        lead.status    = response.status_code
+        lead.headers   = headers
+        lead.chunks    = [body]
+        lead.size      = len(body)
+        lead.cacheable = lead.done = True
+        lead.ready.set()
+        lead._notify()
+
+        if self._inflight.get(lead.key) is lead:
+            del self._inflight[lead.key]
+
+        if self.accepts(response, headers.get("Content-Type", "")):
+            self._store(lead)
+
+    def abandon(self, lead: InflightSegment):
+        """Lider cache'lemekten vazgeçti; bekleyenler kendi isteklerini yapsın"""
+        if lead.cacheable:
+            return
+
+        lead.done = lead.failed = True
+        lead.ready.set()
+        if self._inflight.get(lead.key) is lead:
+            del self._inflight[lead.key]
+
+    async def _download(self, lead: InflightSegment, response: httpx.Response):
+        """İzleyici bağlantılarından bağımsız olarak segmenti sonuna kadar indir"""
+        try:
+            async for chunk in response.aiter_bytes(chunk_size=DEFAULT_CHUNK_SIZE):
+                lead.chunks.append(chunk)
+                lead.size += len(chunk)
+                lead._notify()
+        except Exception as e:
+            lead.failed = True
+            konsol.print(f"[red]Segment indirme hatası: {str(e)}[/red]")
+        finally:
+            await response.aclose()
+            lead.done = True
+            lead._notify()
+
+            if self._inflight.get(lead.key) is lead:
+                del self._inflight[lead.key]
+
+            if not lead.failed and lead.size <= self.max_entry_bytes:
+                self._store(lead)
+
+    # ============== Storage ==============
+
+    def _store(self, lead: InflightSegment):
+        body = b"".join(lead.chunks)
+        self._evict(lead.key)
+
+        self._entries[lead.key] = CachedSegment(
+            status     = lead.status,
+            headers    = lead.headers,
+            body       = body,
+            expires_at = monotonic() + self.ttl,
+            rooms      = lead.rooms,
+        )
+        self.total_bytes += len(body)
+        disk_cache.put(lead.key, lead.status, lead.headers, body)
+
+        # LRU: bayt sınırına inene kadar en eski girdileri at
+        while self.total_bytes > self.max_bytes and self._entries:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: CacheKey):
+        if entry := self._entries.pop(key, None):
+            self.total_bytes -= entry.size
+
+    def drop_room(self, room_id: str):
+        """Oda kapandığında / video değiştiğinde o odaya ait girdileri bırak"""
+        for key, entry in list(self._entries.items()):
+            if room_id in entry.rooms:
+                entry.rooms.discard(room_id)
+                if not entry.rooms:
+                    self._evict(key)
+
+
+# Singleton instance
+segment_cache = SegmentCache(
+    max_bytes       = PROXY_CACHE.get("MAX_BYTES", 256 * 1024 * 1024),
+    max_entry_bytes = PROXY_CACHE.get("MAX_ENTRY_BYTES", 16 * 1024 * 1024),
+    ttl             = PROXY_CACHE.get("TTL", 120),
+)
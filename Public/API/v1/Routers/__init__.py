@@ -4,4 +4,4 @@ from fastapi import APIRouter
 
 api_v1_router = APIRouter(prefix="/api/v1")
 
-from . import health, proxy
+from . import health, proxy, stats
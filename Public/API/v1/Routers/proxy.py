@@ -1,47 +1,89 @@
 # Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
 
-from CLI                  import konsol
-from fastapi              import Request, Response
-from starlette.background import BackgroundTask
-from fastapi.responses    import StreamingResponse
-from .                    import api_v1_router
-from ..Libs.helpers       import prepare_request_headers, prepare_response_headers, detect_hls_from_url, stream_wrapper, process_subtitle_content, CORS_HEADERS
-from urllib.parse         import unquote
-import httpx
+from CLI                   import konsol
+from fastapi               import Request, Response
+from fastapi.responses     import StreamingResponse, FileResponse
+from .                     import api_v1_router
+from ..Libs                import proxy_client, segment_cache, playlist_cache, segment_prefetcher, range_response, parse_range_header, DiskSegment
+from ..Libs.helpers        import prepare_request_headers, prepare_response_headers, detect_hls_from_url, stream_wrapper, process_subtitle_content, CORS_HEADERS
+from ..Libs.hls            import maybe_playlist, is_playlist, read_limited, stream_rest, rewrite_playlist, playlist_ttl, HLS_CONTENT_TYPE
+from Public.WebSocket.Libs import room_affinity
+from urllib.parse          import unquote
 
 @api_v1_router.get("/proxy/video")
 @api_v1_router.head("/proxy/video")
-async def video_proxy(request: Request, url: str, referer: str = None, user_agent: str = None):
+async def video_proxy(request: Request, url: str, referer: str = None, user_agent: str = None, room_id: str = None):
     """Video proxy endpoint'i"""
+    room_id = room_id.upper() if room_id else None
+
+    # Segment cache ve prefetch oda başınadır: odanın istekleri sahibi olan worker'da karşılanır
+    if room_id and not room_affinity.is_local(room_id):
+        return await room_affinity.forward_http(request, room_id)
+
     decoded_url     = unquote(url)
     request_headers = prepare_request_headers(request, decoded_url, referer, user_agent)
 
-    # Client oluştur
-    client = httpx.AsyncClient(
-        follow_redirects = True,
-        timeout          = httpx.Timeout(connect=10.0, read=60.0, write=10.0, pool=10.0),
-    )
-    
+    # Paylaşılan client (host başına keep-alive havuzu)
+    client = proxy_client.client
+
+    # Yeniden yazılmış playlist cache'te mi?
+    playlist_key = (*segment_cache.make_key(decoded_url, request_headers), room_id or "")
+    if request.method == "GET" and (cached_playlist := playlist_cache.get(playlist_key)):
+        return Response(
+            content     = cached_playlist,
+            status_code = 200,
+            headers     = CORS_HEADERS,
+            media_type  = HLS_CONTENT_TYPE
+        )
+
+    # Range isteği (progressive MP4/WebM seek): odalar arası paylaşılan bloklardan servis et
+    range_header = request.headers.get("Range")
+    if request.method == "GET" and segment_cache.enabled and (byte_range := parse_range_header(range_header)):
+        try:
+            if ranged := await range_response(decoded_url, request_headers, byte_range, room_id):
+                return ranged
+        except Exception as e:
+            konsol.print(f"[yellow]Blok cache atlandı: {str(e)}[/yellow]")
+
+    # Segment cache: aynı odadaki izleyiciler tek upstream indirmesini paylaşır
+    lead = None
+    if request.method == "GET" and segment_cache.enabled and not range_header:
+        cache_key = segment_cache.make_key(decoded_url, request_headers)
+        hit, lead = await segment_cache.acquire(cache_key, room_id)
+        if isinstance(hit, DiskSegment):
+            # Diskten Python chunk döngüsüne girmeden dosya olarak servis et
+            return FileResponse(
+                hit.path,
+                status_code = hit.status,
+                headers     = hit.headers,
+                media_type  = hit.headers.get("Content-Type")
+            )
+        if hit:
+            return StreamingResponse(
+                hit.iter_body(),
+                status_code = hit.status,
+                headers     = hit.headers,
+                media_type  = hit.headers.get("Content-Type")
+            )
+
     try:
         # GET isteğini başlat
         req = client.build_request("GET", decoded_url, headers=request_headers)
         response = await client.send(req, stream=True)
-        
+
         if response.status_code >= 400:
             await response.aclose()
-            await client.aclose()
             return Response(status_code=response.status_code, content=f"Upstream Error: {response.status_code}")
 
         # Response headerlarını hazırla
         # HLS Tahmini (URL'den)
         detected_content_type = "application/vnd.apple.mpegurl" if detect_hls_from_url(decoded_url) else None
-        
+
         final_headers = prepare_response_headers(dict(response.headers), decoded_url, detected_content_type)
-        
+
         # HEAD isteği ise stream yapma, kapat ve dön
         if request.method == "HEAD":
             await response.aclose()
-            await client.aclose()
             return Response(
                 content     = b"",
                 status_code = response.status_code,
@@ -49,20 +91,65 @@ async def video_proxy(request: Request, url: str, referer: str = None, user_agen
                 media_type  = final_headers.get("Content-Type")
             )
 
-        # GET isteği - StreamingResponse döndür
+        # HLS playlist ise tüm URI'leri (segment, key, map) proxy URL'lerine çevir
+        content_type = response.headers.get("content-type", "")
+        if maybe_playlist(decoded_url, content_type, response.headers.get("content-length")):
+            body, rest = await read_limited(response)
+            if rest is not None:
+                # Belleğe alma sınırını aşan gövde (etiketi yanlış / çok büyük) olduğu gibi akıtılır
+                return StreamingResponse(
+                    stream_rest(body, rest, response),
+                    status_code = response.status_code,
+                    headers     = final_headers,
+                    media_type  = final_headers.get("Content-Type")
+                )
+
+            await response.aclose()
+
+            if not is_playlist(body):
+                if lead:
+                    segment_cache.complete(lead, response, final_headers, body)
+                return Response(content=body, status_code=response.status_code, headers=final_headers)
+
+            text      = body.decode("utf-8", errors="ignore")
+            rewritten = rewrite_playlist(text, str(response.url), referer, user_agent, room_id).encode("utf-8")
+            playlist_cache.put(playlist_key, rewritten, playlist_ttl(text, segment_cache.ttl))
+            segment_prefetcher.register_playlist(room_id, str(response.url), request_headers, text)
+
+            return Response(
+                content     = rewritten,
+                status_code = 200,
+                headers     = CORS_HEADERS,
+                media_type  = HLS_CONTENT_TYPE
+            )
+
+        # Cache'lenebilir segment ise arka planda indir, bekleyen izleyiciler aynı buffer'dan okur
+        if lead and segment_cache.accepts(response, final_headers.get("Content-Type", "")):
+            segment_cache.fill(lead, response, final_headers)
+            return StreamingResponse(
+                lead.iter_body(),
+                status_code = response.status_code,
+                headers     = final_headers,
+                media_type  = final_headers.get("Content-Type")
+            )
+
+        # GET isteği - StreamingResponse döndür (response stream_wrapper içinde kapatılır)
         return StreamingResponse(
             stream_wrapper(response),
             status_code = response.status_code,
             headers     = final_headers,
-            media_type  = final_headers.get("Content-Type"),
-            background  = BackgroundTask(client.aclose)
+            media_type  = final_headers.get("Content-Type")
         )
-        
+
     except Exception as e:
-        await client.aclose()
         konsol.print(f"[red]Proxy başlatma hatası: {str(e)}[/red]")
         return Response(status_code=502, content=f"Proxy Error: {str(e)}")
 
+    finally:
+        # Cache'lenmeyecekse bekleyen izleyicileri serbest bırak
+        if lead:
+            segment_cache.abandon(lead)
+
 
 @api_v1_router.get("/proxy/subtitle")
 async def subtitle_proxy(request: Request, url: str, referer: str = None, user_agent: str = None):
@@ -70,29 +157,28 @@ async def subtitle_proxy(request: Request, url: str, referer: str = None, user_a
     try:
         decoded_url     = unquote(url)
         request_headers = prepare_request_headers(request, decoded_url, referer, user_agent)
-        
-        async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
-            response = await client.get(decoded_url, headers=request_headers)
-            
-            if response.status_code >= 400:
-                return Response(
-                    content     = f"Altyazı hatası: {response.status_code}", 
-                    status_code = response.status_code
-                )
-            
-            processed_content = process_subtitle_content(
-                response.content, 
-                response.headers.get("content-type", ""), 
-                decoded_url
-            )
-            
+
+        response = await proxy_client.client.get(decoded_url, headers=request_headers, timeout=30.0)
+
+        if response.status_code >= 400:
             return Response(
-                content     = processed_content,
-                status_code = 200,
-                headers     = {"Content-Type": "text/vtt; charset=utf-8", **CORS_HEADERS},
-                media_type  = "text/vtt"
+                content     = f"Altyazı hatası: {response.status_code}", 
+                status_code = response.status_code
             )
-            
+
+        processed_content = process_subtitle_content(
+            response.content, 
+            response.headers.get("content-type", ""), 
+            decoded_url
+        )
+
+        return Response(
+            content     = processed_content,
+            status_code = 200,
+            headers     = {"Content-Type": "text/vtt; charset=utf-8", **CORS_HEADERS},
+            media_type  = "text/vtt"
+        )
+
     except Exception as e:
         return Response(
             content     = f"Proxy hatası: {str(e)}", 
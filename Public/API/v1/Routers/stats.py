@@ -0,0 +1,13 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from Core                  import JSONResponse
+from .                     import api_v1_router
+from Public.WebSocket.Libs import extraction_scheduler
+
+@api_v1_router.get("/stats")
+async def stats():
+    """Kuyruk ve zamanlayıcı metrikleri"""
+    return JSONResponse({
+        "success"    : True,
+        "extraction" : extraction_scheduler.stats(),
+    })
@@ -2,7 +2,7 @@
 
 from Core                  import Request, HTMLResponse
 from .                     import home_router, home_template
-from Public.WebSocket.Libs import watch_party_manager
+from Public.WebSocket.Libs import watch_party_manager, room_affinity
 from Settings              import PROXY_ENABLED
 
 @home_router.get("/watch-party/{room_id}", response_class=HTMLResponse)
@@ -18,6 +18,10 @@ async def watch_party_room(
     """Watch Party odası sayfası"""
     room_id = room_id.upper()
 
+    # Çoklu worker'da oda sadece sahibi olan worker'da bulunur, sayfa oradan render edilir
+    if not room_affinity.is_local(room_id):
+        return await room_affinity.forward_http(request, room_id)
+
     # Mevcut oda varsa bilgilerini al
     room = await watch_party_manager.get_room(room_id)
 
@@ -22,7 +22,9 @@ import { connect, send, onMessage, setHeartbeatDataProvider } from './modules/we
 
 // ============== State ==============
 const state = {
-    currentUser: null
+    currentUser: null,
+    version: null,      // Sunucudaki oda sürümü (kullanıcı / chat / video değişiklikleri)
+    users: new Map()
 };
 
 // ============== Config ==============
@@ -36,17 +38,60 @@ const getRoomConfig = () => {
 // ============== Message Handlers ==============
 const setupMessageHandlers = () => {
     onMessage('room_state', handleRoomState);
-    onMessage('user_joined', handleUserJoined);
-    onMessage('user_left', handleUserLeft);
+    onMessage('room_delta', handleRoomDelta);
+    onMessage('user_joined', versioned(handleUserJoined));
+    onMessage('user_left', versioned(handleUserLeft));
     onMessage('sync', handleSync);
     onMessage('sync_correction', handleSyncCorrection);
     onMessage('seek', handleSeek);
-    onMessage('chat', handleChatMessage);
-    onMessage('video_changed', handleVideoChanged);
+    onMessage('chat', versioned(handleChatMessage));
+    onMessage('chat_batch', versioned(handleChatBatch));
+    onMessage('video_changed', versioned(handleVideoChanged));
     onMessage('error', (msg) => showToast(msg.message, 'error'));
 };
 
+// Sürümlü mesajlar sırayla uygulanır; arada boşluk varsa sadece kaçan deltalar istenir
+const versioned = (handler) => (msg) => {
+    if (msg.version === undefined || state.version === null) return handler(msg);
+    if (msg.version <= state.version) return;
+
+    if (msg.version !== state.version + 1) {
+        send('get_state', { version: state.version });
+        return;
+    }
+
+    state.version = msg.version;
+    return handler(msg);
+};
+
+const deltaHandlers = {
+    user_joined: (msg) => handleUserJoined(msg),
+    user_left: (msg) => handleUserLeft(msg),
+    chat: (msg) => handleChatMessage(msg),
+    chat_batch: (msg) => handleChatBatch(msg),
+    video_changed: (msg) => handleVideoChanged(msg)
+};
+
+const handleRoomDelta = async (delta) => {
+    for (const msg of delta.deltas) {
+        if (state.version !== null && msg.version <= state.version) continue;
+        state.version = msg.version;
+        await deltaHandlers[msg.type]?.(msg);
+    }
+    state.version = delta.version;
+
+    if (delta.video_url) {
+        await applyState(delta);
+    }
+};
+
+const renderUsers = (hostId) => {
+    updateUsersList([...state.users.values()].map(user => ({ ...user, is_host: user.user_id === hostId })));
+};
+
 const handleRoomState = async (roomState) => {
+    state.version = roomState.version ?? null;
+    state.users = new Map((roomState.users || []).map(user => [user.user_id, user]));
     updateUsersList(roomState.users);
 
     if (roomState.video_url) {
@@ -90,13 +135,15 @@ const handleRoomState = async (roomState) => {
 };
 
 const handleUserJoined = (msg) => {
-    updateUsersList(msg.users);
+    state.users.set(msg.user_id, { user_id: msg.user_id, username: msg.username, avatar: msg.avatar });
+    renderUsers(msg.host_id);
     addSystemMessage(`${msg.avatar} ${msg.username} odaya katıldı`);
     showToast(`${msg.username} odaya katıldı`, 'info');
 };
 
 const handleUserLeft = (msg) => {
-    updateUsersList(msg.users);
+    state.users.delete(msg.user_id);
+    renderUsers(msg.host_id);
     addSystemMessage(`${msg.username} odadan ayrıldı`);
 };
 
@@ -104,6 +151,11 @@ const handleChatMessage = (msg) => {
     addChatMessage(msg.username, msg.avatar, msg.message, msg.timestamp);
 };
 
+// Yoğun odada sunucu chat mesajlarını tek çerçevede toplu gönderir
+const handleChatBatch = (msg) => {
+    msg.messages.forEach(handleChatMessage);
+};
+
 const handleVideoChanged = async (msg) => {
     showSkeleton('player-container');
     
@@ -140,7 +192,7 @@ const setupPlayerCallbacks = () => {
         onSeek: (time) => send('seek', { time }),
         onBufferStart: () => send('buffer_start'),
         onBufferEnd: () => send('buffer_end'),
-        onSyncRequest: () => send('get_state')
+        onSyncRequest: () => send('get_state', state.version !== null ? { version: state.version } : {})
     });
 };
 
@@ -124,6 +124,9 @@ const buildProxyUrl = (url, headers = {}, endpoint = 'video') => {
     if (userAgent) params.append('user_agent', userAgent);
     if (referer) params.append('referer', referer);
     
+    // Oda bazlı segment cache için
+    if (window.ROOM_ID) params.append('room_id', window.ROOM_ID);
+    
     return `/api/v1/proxy/${endpoint}?${params.toString()}`;
 };
 
@@ -137,7 +140,7 @@ const detectFormat = (url, format) => {
 };
 
 // ============== HLS Loading ==============
-const loadHls = (url, headers = {}, useProxy = false) => {
+const loadHls = (url, headers = {}) => {
     return new Promise((resolve) => {
         const { videoPlayer } = state;
         
@@ -146,6 +149,7 @@ const loadHls = (url, headers = {}, useProxy = false) => {
             state.hls = null;
         }
 
+        // Proxy aktifse playlist sunucuda yeniden yazılır (segment, key, map URI'leri proxy'ye çevrilir)
         const isProxyEnabled = window.PROXY_ENABLED !== false;
         
         const hlsConfig = {
@@ -153,54 +157,14 @@ const loadHls = (url, headers = {}, useProxy = false) => {
             enableWorker: true,
             capLevelToPlayerSize: true,
             maxLoadingDelay: 4,
-            minAutoBitrate: 0,
-            xhrSetup: (!useProxy && !isProxyEnabled) ? undefined : (xhr, requestUrl) => {
-                // Eğer zaten proxy URL'i ise veya video endpoint'i ise dokunma
-                if (requestUrl.includes('/api/v1/proxy/video')) {
-                    return;
-                }
-
-                // URL Çözümleme ve Proxy Yönlendirme
-                try {
-                    let targetUrl = requestUrl;
-                    const originalVideoUrl = new URL(url);
-
-                    // 1. Göreceli URL Kontrolü
-                    if (!requestUrl.startsWith('http')) {
-                        if (requestUrl.startsWith('/')) {
-                            targetUrl = originalVideoUrl.origin + requestUrl;
-                        } else {
-                            const baseUrl = url.substring(0, url.lastIndexOf('/') + 1);
-                            targetUrl = baseUrl + requestUrl;
-                        }
-                    }
-                    // 2. Absolute URL ama hostname aynı (sunucuya hatalı yönlenmiş)
-                    else if (requestUrl.includes(window.location.hostname)) {
-                        const urlObj = new URL(requestUrl);
-                        // Eğer dosya adı orijinal URL path'inde varsa veya .ts/.key gibi uzantılarsa
-                         const baseUrl = url.substring(0, url.lastIndexOf('/') + 1);
-                         const filename = urlObj.pathname.split('/').pop();
-                         targetUrl = baseUrl + filename + urlObj.search;
-                    }
-
-                    // Proxy URL oluştur - Headers closure'dan geliyor
-                    // logger.video(`HLS Segment: ${targetUrl}`);
-                    const proxyUrl = buildProxyUrl(targetUrl, headers, 'video');
-                    xhr.open('GET', proxyUrl, true);
-                    
-                } catch (e) {
-                    console.error('HLS Proxy Error:', e);
-                    // Hata durumunda proxy ile sarmala ve devam et
-                    xhr.open('GET', buildProxyUrl(requestUrl, headers, 'video'), true);
-                }
-            }
+            minAutoBitrate: 0
         };
 
         state.hls = new Hls(hlsConfig);
         
-        const loadUrl = useProxy ? buildProxyUrl(url, headers, 'video') : url;
+        const loadUrl = isProxyEnabled ? buildProxyUrl(url, headers, 'video') : url;
         
-        logger.video(`HLS: ${useProxy ? 'proxy (forced)' : 'smart-proxy'}`);
+        logger.video(`HLS: ${isProxyEnabled ? 'proxy' : 'direct'}`);
         
         state.hls.loadSource(loadUrl);
         state.hls.attachMedia(videoPlayer);
@@ -217,7 +181,7 @@ const loadHls = (url, headers = {}, useProxy = false) => {
             }
         });
 
-        state.hls.on(Hls.Events.ERROR, async (_, data) => {
+        state.hls.on(Hls.Events.ERROR, (_, data) => {
             if (data.fatal) {
                 switch (data.type) {
                     case Hls.ErrorTypes.NETWORK_ERROR:
@@ -226,13 +190,6 @@ const loadHls = (url, headers = {}, useProxy = false) => {
                         
                         if (retryCount <= maxRetries) {
                             state.hls.startLoad();
-                        } else if (!useProxy && !resolved && window.PROXY_ENABLED !== false) {
-                             // İlk deneme başarısızsa ve henüz proxy zorlanmadıysa (ve proxy aktifse)
-                             logger.video('Switching to forced proxy mode...');
-                             resolved = true; // Mevcut promise resolve olmasın diye flag'i kitle
-                             state.hls.destroy();
-                             const result = await loadHls(url, headers, true); // Recursive call with forced proxy
-                             resolve(result); // Resolve original promise with result
                         } else {
                             if (!resolved) {
                                 resolved = true;
@@ -342,7 +299,7 @@ export const loadVideo = async (url, format = 'hls', headers = {}, title = '', s
 
     let success = false;
     if (detectedFormat === 'hls' && typeof Hls !== 'undefined' && Hls.isSupported()) {
-        success = await loadHls(url, headers, false);
+        success = await loadHls(url, headers);
     } else {
         success = await loadNative(url, headers, false);
     }
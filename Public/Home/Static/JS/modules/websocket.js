@@ -7,7 +7,8 @@ import { showToast, updateSyncStatus, showConnectionModal, hideConnectionModal,
 const config = {
     maxReconnectAttempts: 5,
     reconnectDelay: 3000,
-    heartbeatInterval: 5000
+    heartbeatInterval: 5000,
+    compactProtocol: true
 };
 
 // ============== State ==============
@@ -16,13 +17,62 @@ const state = {
     isConnected: false,
     reconnectAttempts: 0,
     heartbeatInterval: null,
-    getHeartbeatData: null
+    heartbeatDelay: config.heartbeatInterval,  // Sunucu drift kararlılığına göre günceller
+    lastRtt: null,                             // Son ölçülen RTT (ms), sunucu saat tahmininde kullanır
+    getHeartbeatData: null,
+    compact: false
 };
 
 // Ping tracking
 state.pingCounter = 0;
 state.pendingPings = new Map();
 
+// ============== Compact Protocol ==============
+// Sunucu kabul ederse ping / pong / sync / seek / sync_correction ikili çerçeveyle taşınır (little-endian)
+const COMPACT_PROTOCOL = 'kekik.compact.v1';
+const Frame = { PING: 1, PONG: 2, SYNC: 3, SEEK: 4, SYNC_CORRECTION: 5 };
+const textDecoder = new TextDecoder();
+
+const decodeFrame = (buffer) => {
+    const view = new DataView(buffer);
+    const kind = view.getUint8(0);
+
+    if (kind === Frame.PONG) {
+        return { type: 'pong', _ping_id: view.getUint32(1, true) };
+    }
+
+    if (kind === Frame.SYNC || kind === Frame.SEEK) {
+        return {
+            type: kind === Frame.SYNC ? 'sync' : 'seek',
+            is_playing: view.getUint8(1) === 1,
+            current_time: view.getFloat64(2, true),
+            triggered_by: textDecoder.decode(new Uint8Array(buffer, 10))
+        };
+    }
+
+    if (kind === Frame.SYNC_CORRECTION) {
+        const action = view.getUint8(1) === 1 ? 'buffer' : 'rate';
+        return {
+            type: 'sync_correction',
+            action,
+            [action === 'rate' ? 'rate' : 'target_time']: view.getFloat64(2, true),
+            drift: view.getFloat64(10, true)
+        };
+    }
+
+    return null;
+};
+
+const encodePing = (id, currentTime, sentAt, rtt) => {
+    const view = new DataView(new ArrayBuffer(29));
+    view.setUint8(0, Frame.PING);
+    view.setUint32(1, id, true);
+    view.setFloat64(5, currentTime ?? NaN, true);
+    view.setFloat64(13, sentAt, true);
+    view.setFloat64(21, rtt ?? NaN, true);
+    return view.buffer;
+};
+
 // ============== Message Handlers ==============
 const messageHandlers = new Map();
 
@@ -40,9 +90,11 @@ export const connect = async (url) => {
     updateSyncStatus('connecting');
 
     return new Promise((resolve, reject) => {
-        state.ws = new WebSocket(url);
+        state.ws = new WebSocket(url, config.compactProtocol ? [COMPACT_PROTOCOL] : []);
+        state.ws.binaryType = 'arraybuffer';
 
         state.ws.onopen = () => {
+            state.compact = state.ws.protocol === COMPACT_PROTOCOL;
             state.isConnected = true;
             state.reconnectAttempts = 0;
             updateSyncStatus('connected');
@@ -53,8 +105,8 @@ export const connect = async (url) => {
 
         state.ws.onmessage = (event) => {
             try {
-                const message = JSON.parse(event.data);
-                handleMessage(message);
+                const message = typeof event.data === 'string' ? JSON.parse(event.data) : decodeFrame(event.data);
+                if (message) handleMessage(message);
             } catch (e) {
                 console.error('Failed to parse message:', e);
             }
@@ -63,6 +115,7 @@ export const connect = async (url) => {
         state.ws.onclose = async () => {
             state.isConnected = false;
             stopHeartbeat();
+            state.heartbeatDelay = config.heartbeatInterval;
             updateSyncStatus('disconnected');
 
             if (state.reconnectAttempts < config.maxReconnectAttempts) {
@@ -90,6 +143,7 @@ const handleMessage = (message) => {
             const sent = state.pendingPings.get(id);
             const rtt = Date.now() - sent;
             state.pendingPings.delete(id);
+            state.lastRtt = rtt;
             try { updatePing(rtt); } catch (e) { /* ignore UI errors */ }
             return;
         }
@@ -111,6 +165,11 @@ const handleMessage = (message) => {
         return;
     }
 
+    if (message.type === 'heartbeat') {
+        setHeartbeatDelay(message.interval * 1000);
+        return;
+    }
+
     const handler = messageHandlers.get(message.type);
     if (handler) {
         handler(message);
@@ -132,15 +191,26 @@ const startHeartbeat = () => {
             const payload = state.getHeartbeatData?.() || {};
             // create a ping id and record timestamp
             const id = ++state.pingCounter;
-            state.pendingPings.set(id, Date.now());
-            send('ping', { ...payload, _ping_id: id });
+            const sentAt = Date.now();
+            state.pendingPings.set(id, sentAt);
+            if (state.compact) {
+                state.ws.send(encodePing(id, payload.current_time, sentAt, state.lastRtt));
+            } else {
+                send('ping', { ...payload, _ping_id: id, sent_at: sentAt, rtt: state.lastRtt });
+            }
             // cleanup very old pings
             const now = Date.now();
             for (const [k, ts] of state.pendingPings.entries()) {
                 if (now - ts > 10000) state.pendingPings.delete(k);
             }
         }
-    }, config.heartbeatInterval);
+    }, state.heartbeatDelay);
+};
+
+const setHeartbeatDelay = (delay) => {
+    if (!delay || delay === state.heartbeatDelay) return;
+    state.heartbeatDelay = delay;
+    if (state.heartbeatInterval) startHeartbeat();
 };
 
 const stopHeartbeat = () => {
@@ -1,224 +1,481 @@
 # Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
 
-from fastapi  import WebSocket
-from datetime import datetime
-from ..Models import User, Room, ChatMessage
-import json, asyncio
+from CLI                import konsol
+from Settings           import CHAT
+from contextlib         import asynccontextmanager
+from datetime           import datetime
+from itertools          import islice
+from bisect             import bisect
+from functools          import partial
+from typing             import Hashable
+from ..Models           import User, Room, ChatMessage
+from .socket_outbox     import SocketOutbox
+from .                  import compact_protocol
+from .room_actor        import RoomActor, Command
+from .room_backend      import room_backend, RoomBackend
+from Public.API.v1.Libs import segment_cache, playlist_cache, segment_prefetcher
+import asyncio, json
+
+# Worker'lar arasında paylaşılan oda durumu alanları
+SHARED_STATE_FIELDS = ("video_url", "video_title", "video_format", "subtitle_url", "current_time", "is_playing", "updated_at", "headers")
+
+# Oda sürümünü artıran ve delta günlüğüne yazılan yayınlar (kullanıcılar, chat, video)
+VERSIONED_TYPES = {"user_joined", "user_left", "chat", "chat_batch", "video_changed"}
+
+# Soket kuyruğunda chat vb. mesajların önüne geçen oynatım kontrol mesajları (sürümsüz olmalı, sıralamayı bozmaz)
+PRIORITY_TYPES = {"sync", "seek", "sync_correction", "heartbeat", "pong"}
+
+# Paylaşılan backend'de sırası dışında gelen sürümler en fazla bu kadar yayın beklenir, sonra boşluk atlanır
+VERSION_GAP_LIMIT = 8
+
+# Katılan / yeniden eşitlenen istemciye gönderilen son chat mesajı sayısı
+CHAT_SNAPSHOT = CHAT.get("SNAPSHOT", 50)
+
+# Oda limiti aşıldığında bekleyen chat mesajlarının toplu gönderilme aralığı (sn)
+CHAT_BATCH_WINDOW = CHAT.get("BATCH_WINDOW", 0.5)
+
+# Kuyrukta bekleyen eski mesajın yenisiyle değiştirilebildiği türler (son durum yeterli)
+COALESCE_TYPES = {
+    "sync" : "playback",
+    "seek" : "playback",
+}
 
 class WatchPartyManager:
     """Watch Party oda ve kullanıcı yönetimi"""
 
-    def __init__(self):
-        self.rooms: dict[str, Room] = {}
-        self._lock = asyncio.Lock()
+    def __init__(self, backend: RoomBackend):
+        self.rooms: dict[str, Room]       = {}
+        self._actors: dict[str, RoomActor] = {}
+        self._tasks: set[asyncio.Task]     = set()
+        self.backend = backend
+
+    # ============== Lifespan ==============
+
+    async def start(self):
+        """Oda backend'ini başlat (lifespan startup)"""
+        await self.backend.start(self._receive, self._apply_state)
+
+    async def close(self):
+        """Oda backend'ini kapat (lifespan shutdown)"""
+        await self.backend.close()
+
+    # ============== Shared State ==============
+
+    def _persist(self, room: Room):
+        """Oda durumunu diğer worker'lar için backend'e yaz"""
+        if self.backend.distributed:
+            self.backend.save_state(room.room_id, {key: getattr(room, key) for key in SHARED_STATE_FIELDS})
+
+    def _apply_state(self, room_id: str, state: dict, force: bool = False):
+        """Başka worker'da değişen oda durumunu yerel odaya uygula (eskiyse yok say)"""
+        room = self.rooms.get(room_id)
+        if not room or (not force and state.get("updated_at", 0) < room.updated_at):
+            return
+
+        video_changed = state.get("video_url", room.video_url) != room.video_url
+        for key in SHARED_STATE_FIELDS:
+            if key in state:
+                setattr(room, key, state[key])
+        room.encoded.pop("video", None)
+
+        if video_changed:
+            segment_cache.drop_room(room_id)
+            playlist_cache.drop_room(room_id)
+            segment_prefetcher.attach(room_id, room)
+        else:
+            segment_prefetcher.notify(room_id)
+
+    def _restore(self, room: Room, shared: dict):
+        """Başka worker'da oluşmuş odanın paylaşılan durumunu (üyeler, host, chat, sürüm) yeni yerel odaya kur"""
+        if shared["state"]:
+            self._apply_state(room.room_id, shared["state"], force=True)
+
+        room.remote_users = {
+            user_id: {"username": member.get("username", ""), "avatar": member.get("avatar", "")}
+            for user_id, member in shared["members"].items()
+        }
+        room.host_id = shared["host_id"]
+        room.version = shared["version"]
+        room.chat_messages.extend(ChatMessage.from_dict(message) for message in shared["chat"])
+        room.encoded.clear()
 
     async def get_room(self, room_id: str) -> Room | None:
         """Odayı getir"""
         return self.rooms.get(room_id)
 
-    async def join_room(self, room_id: str, websocket: WebSocket, username: str, avatar: str) -> User | None:
-        """Odaya katıl"""
-        async with self._lock:
+    @asynccontextmanager
+    async def _locked_room(self, room_id: str, create: bool = False):
+        """
+        Odayı kendi kilidi altında ver (oda yoksa None)
+
+        Kilitler oda başınadır; bir odadaki işlem diğer odaları bekletmez.
+        Kilit altında ağ I/O'su yapılmaz, gönderimler soket kuyruğuna bırakılır.
+        """
+        while True:
             room = self.rooms.get(room_id)
             if not room:
-                room = Room(room_id=room_id)
-                self.rooms[room_id] = room
+                if not create:
+                    yield None
+                    return
+                room = self.rooms[room_id] = Room(room_id=room_id)
+
+            async with room.lock:
+                # Kilit beklenirken oda silindiyse baştan dene
+                if self.rooms.get(room_id) is room:
+                    yield room
+                    return
+
+    async def join_room(self, room_id: str, outbox: SocketOutbox, username: str, avatar: str) -> User | None:
+        """Odaya katıl"""
+        user = User(outbox=outbox, username=username, avatar=avatar)
+
+        # Oda bu worker'da yoksa önce kanala abone ol (arada yayın kaçmasın), sonra paylaşılan durumu kilit dışında oku
+        shared = None
+        if room_id not in self.rooms:
+            await self.backend.subscribe(room_id)
+            shared = await self.backend.load_room(room_id)
 
-            user = User(websocket=websocket, username=username, avatar=avatar)
+        host_id = await self.backend.add_member(room_id, user.user_id, {"username": username, "avatar": avatar})
 
-            # İlk kullanıcı host olur
-            if room.host_id is None:
+        async with self._locked_room(room_id, create=True) as room:
+            if shared and not room.users:
+                self._restore(room, shared)
+
+            # İlk kullanıcı host olur (paylaşılan backend'de host tüm worker'lar için ortak seçilir)
+            if host_id is not None:
+                room.host_id = host_id
+            elif room.host_id is None:
                 room.host_id = user.user_id
 
             room.users[user.user_id] = user
-            return user
+            room.remote_users.pop(user.user_id, None)
+            room.encoded.pop("users", None)
+
+        return user
 
     async def leave_room(self, room_id: str, user_id: str) -> bool:
-        """Odadan ayrıl"""
-        async with self._lock:
-            room = self.rooms.get(room_id)
-            if not room:
+        """Odadan ayrıl ve kalanlara `user_left` yayınla (kullanıcı odada değilse False)"""
+        async with self._locked_room(room_id) as room:
+            if not room or user_id not in room.users:
                 return False
 
-            if user_id in room.users:
-                del room.users[user_id]
-                
-                # Eğer buffer listesindeyse sil
-                if user_id in room.buffering_users:
-                    room.buffering_users.remove(user_id)
-
-                # Host ayrıldıysa yeni host ata
-                if room.host_id == user_id and room.users:
-                    room.host_id = next(iter(room.users.keys()))
+            user = room.users.pop(user_id)
+
+            # Eğer buffer listesindeyse sil
+            room.buffering_users.discard(user_id)
+
+            # Host ayrıldıysa yeni host ata (paylaşılan backend'de aşağıda ortak seçilir)
+            if room.host_id == user_id and room.users and not self.backend.distributed:
+                room.host_id = next(iter(room.users.keys()))
+
+            room.encoded.pop("users", None)
+
+            # Oda boşsa sil
+            deleted = not room.users
+            if deleted:
+                del self.rooms[room_id]
+                segment_cache.drop_room(room_id)
+                playlist_cache.drop_room(room_id)
+                segment_prefetcher.detach(room_id)
+                if actor := self._actors.pop(room_id, None):
+                    actor.close()
+
+        # Kilit dışında: bu arada oda yeniden oluştuysa abonelik kalmalı
+        if deleted and room_id not in self.rooms:
+            await self.backend.unsubscribe(room_id)
+
+        host_id = self.get_host_id(room_id)
+        if self.backend.distributed:
+            host_id = await self.backend.remove_member(room_id, user_id)
+            if room := self.rooms.get(room_id):
+                room.host_id = host_id
+                room.encoded.pop("users", None)
+
+        await self.broadcast_to_room(room_id, {
+            "type"     : "user_left",
+            "username" : user.username,
+            "user_id"  : user_id,
+            "host_id"  : host_id
+        })
 
-                # Oda boşsa sil
-                if not room.users:
-                    del self.rooms[room_id]
+        return True
 
-                return True
+    def dispatch(self, room_id: str, kind: str, command: Command, key: Hashable | None = None) -> bool:
+        """Komutu odanın aktörüne sırala (aktör ilk komutta başlatılır), oda yoksa / kuyruk doluysa False döner"""
+        if room_id not in self.rooms:
             return False
 
+        if not (actor := self._actors.get(room_id)):
+            actor = self._actors[room_id] = RoomActor(room_id)
+
+        return actor.submit(kind, command, key)
+
     async def update_video(self, room_id: str, url: str, title: str = "", video_format: str = "hls", headers: dict[str, str] = None, subtitle_url: str = "") -> bool:
         """Video URL'sini güncelle"""
-        room = self.rooms.get(room_id)
-        if not room:
-            return False
+        async with self._locked_room(room_id) as room:
+            if not room:
+                return False
 
-        room.video_url    = url
-        room.video_title  = title
-        room.video_format = video_format
-        room.subtitle_url = subtitle_url
-        room.current_time = 0.0
-        room.is_playing   = False
-        room.updated_at   = datetime.now().timestamp()
-        room.buffering_users.clear()
-        if headers:
-            room.headers = headers
-        return True
+            # Önceki videonun segmentlerini ve playlist'lerini bırak
+            if room.video_url != url:
+                segment_cache.drop_room(room_id)
+                playlist_cache.drop_room(room_id)
+
+            room.encoded.pop("video", None)
+            room.video_url    = url
+            room.video_title  = title
+            room.video_format = video_format
+            room.subtitle_url = subtitle_url
+            room.current_time = 0.0
+            room.is_playing   = False
+            room.updated_at   = datetime.now().timestamp()
+            room.buffering_users.clear()
+            self.backend.clear_buffering(room_id)
+            if headers:
+                room.headers = headers
+
+            segment_prefetcher.attach(room_id, room)
+            self._persist(room)
+            return True
 
     async def update_playback_state(self, room_id: str, is_playing: bool, current_time: float) -> bool:
         """Oynatım durumunu güncelle"""
-        room = self.rooms.get(room_id)
-        if not room:
-            return False
+        async with self._locked_room(room_id) as room:
+            if not room:
+                return False
 
-        room.is_playing   = is_playing
-        room.current_time = current_time
-        room.updated_at   = datetime.now().timestamp()
+            room.is_playing   = is_playing
+            room.current_time = current_time
+            room.updated_at   = datetime.now().timestamp()
+            segment_prefetcher.notify(room_id)
 
-        # Eğer manuel oynatma yapıldıysa buffer listesini temizle
-        if is_playing:
-            room.buffering_users.clear()
+            # Eğer manuel oynatma yapıldıysa buffer listesini temizle
+            if is_playing:
+                room.buffering_users.clear()
+                self.backend.clear_buffering(room_id)
 
-        return True
+            self._persist(room)
+            return True
 
     async def set_buffering_status(self, room_id: str, user_id: str, is_buffering: bool) -> bool:
         """Kullanıcının buffering durumunu güncelle"""
-        room = self.rooms.get(room_id)
-        if not room:
-            return False
+        # Paylaşılan backend'de bufferlayanlar tüm worker'lar için sayılır (yerelde None)
+        buffering = await self.backend.set_buffering(room_id, user_id, is_buffering)
 
-        if is_buffering:
-            room.buffering_users.add(user_id)
-            # Eğer oynatılıyorsa duraklat
-            if room.is_playing:
-                # Odayı duraklat ama current_time'ı güncelle
-                elapsed = datetime.now().timestamp() - room.updated_at
-                room.current_time += elapsed
-                room.is_playing = False
-                room.updated_at = datetime.now().timestamp()
-                return True # Durum değişti, broadcast lazım
-        else:
-            if user_id in room.buffering_users:
-                room.buffering_users.remove(user_id)
-                # Eğer kimse bufferlamıyorsa ve önceden buffer yüzünden durduysa devam et?
-                # Otomatik başlatma mantığı (herkes hazırsa)
-                if not room.buffering_users:
-                    room.is_playing = True
+        async with self._locked_room(room_id) as room:
+            if not room:
+                return False
+
+            if is_buffering:
+                room.buffering_users.add(user_id)
+                # Eğer oynatılıyorsa duraklat
+                if room.is_playing:
+                    # Odayı duraklat ama current_time'ı güncelle
+                    elapsed = datetime.now().timestamp() - room.updated_at
+                    room.current_time += elapsed
+                    room.is_playing = False
                     room.updated_at = datetime.now().timestamp()
-                    return True # Durum değişti
+                    self._persist(room)
+                    return True # Durum değişti, broadcast lazım
+            else:
+                if user_id in room.buffering_users:
+                    room.buffering_users.remove(user_id)
+                    # Eğer kimse bufferlamıyorsa ve önceden buffer yüzünden durduysa devam et?
+                    # Otomatik başlatma mantığı (herkes hazırsa)
+                    if not (len(room.buffering_users) if buffering is None else buffering):
+                        room.is_playing = True
+                        room.updated_at = datetime.now().timestamp()
+                        self._persist(room)
+                        return True # Durum değişti
 
-        return False
+            return False
 
-    async def handle_heartbeat(self, room_id: str, user_id: str, client_time: float):
-        """Heartbeat al ve drift kontrolü yap"""
-        async with self._lock:
-            room = self.rooms.get(room_id)
-            if not room:
+    async def handle_heartbeat(self, room_id: str, user_id: str, client_time: float, received_at: float, sent_at: float | None = None, rtt: float | None = None):
+        """Heartbeat al; istemcinin saat / gecikme tahminini güncelle, gerekirse drift düzeltmesi ve yeni heartbeat aralığı gönder"""
+        async with self._locked_room(room_id) as room:
+            if not room or not (user := room.users.get(user_id)):
                 return
 
-            # Drift hesapla
-            server_time = room.current_time
-            if room.is_playing:
-                server_time += (datetime.now().timestamp() - room.updated_at)
-
-            drift = client_time - server_time
+            sync = user.sync
+            sync.observe_clock(received_at, sent_at, rtt)
 
             # Sadece oynatılıyorsa drift düzeltmesi yap
             if not room.is_playing:
                 return
 
-            # Drift Analizi ve Düzeltme
-            correction = None
-
-            # Büyük drift (> 2 saniye): Buffer simülasyonu
-            if abs(drift) > 2.0:
-                correction = {
-                    "type"        : "sync_correction",
-                    "action"      : "buffer",
-                    "target_time" : server_time,
-                    "drift"       : drift
-                }
-
-            # Küçük drift (> 0.5 saniye): Hız ayarı
-            # Gerideyse hızlan (1.1x), ilerideyse yavaşla (0.9x)
-            elif drift < -0.5:
-                correction = {
-                    "type"   : "sync_correction",
-                    "action" : "rate",
-                    "rate"   : 1.1,
-                    "drift"  : drift
-                }
-            elif drift > 0.5:
-                correction = {
-                    "type"   : "sync_correction",
-                    "action" : "rate",
-                    "rate"   : 0.9,
-                    "drift"  : drift
-                }
-            # Drift yoksa (< 0.5 saniye): Normal hız
-            else:
-                correction = {
-                    "type"   : "sync_correction",
-                    "action" : "rate",
-                    "rate"   : 1.0,
-                    "drift"  : drift
-                }
-
-            if correction and user_id in room.users:
-                try:
-                    await room.users[user_id].websocket.send_text(json.dumps(correction))
-                except Exception:
-                    pass
+            if sync.epoch != room.updated_at:
+                sync.reset(room.updated_at)
+
+            # İstemcinin bildirdiği konumu, mesajın sunucuya ulaştığı ana taşı
+            client_now  = client_time + sync.latency(received_at, sent_at) * (sync.rate or 1.0)
+            server_time = room.current_time + (received_at - room.updated_at)
+            drift       = client_now - server_time
+
+            if correction := sync.evaluate(drift, server_time, received_at):
+                user.outbox.send_message(correction, coalesce="sync_correction", priority=True)
+
+            if (interval := sync.next_interval()) is not None:
+                user.outbox.send_message({"type": "heartbeat", "interval": interval}, coalesce="heartbeat", priority=True)
 
     async def add_chat_message(self, room_id: str, username: str, avatar: str, message: str) -> ChatMessage | None:
-        """Chat mesajı ekle"""
-        room = self.rooms.get(room_id)
-        if not room:
-            return None
+        """Chat mesajı ekle; oda limiti aşıldıysa toplu gönderim için beklet (yayınlanacak mesaj yoksa None döner)"""
+        async with self._locked_room(room_id) as room:
+            if not room:
+                return None
 
-        chat_msg = ChatMessage(username=username, avatar=avatar, message=message)
-        room.chat_messages.append(chat_msg)
+            chat_msg = ChatMessage(username=username, avatar=avatar, message=message)
 
-        # Son 100 mesajı tut
-        if len(room.chat_messages) > 100:
-            room.chat_messages = room.chat_messages[-100:]
+            # Bekleyen varsa sıra bozulmasın diye yenisi de arkasına eklenir
+            if room.chat_pending or not room.chat_limit.take():
+                room.chat_pending.append(chat_msg)
+                if len(room.chat_pending) == 1:
+                    self._spawn(self._schedule_chat_flush(room_id))
+                return None
 
-        return chat_msg
+            room.chat_messages.append(chat_msg)  # maxlen dolunca en eskisi düşer, liste kopyalanmaz
+            room.encoded.pop("chat", None)
+            self.backend.push_chat(room_id, [chat_msg.to_dict()])
 
-    async def broadcast_to_room(self, room_id: str, message: dict, exclude_user_id: str | None = None):
-        """Odadaki tüm kullanıcılara mesaj gönder"""
-        async with self._lock:
-            room = self.rooms.get(room_id)
-            if not room:
+            return chat_msg
+
+    async def _schedule_chat_flush(self, room_id: str):
+        await asyncio.sleep(CHAT_BATCH_WINDOW)
+        self.dispatch(room_id, "chat", partial(self._flush_chat, room_id))
+
+    async def _flush_chat(self, room_id: str):
+        """Bekleyen chat mesajlarını geçmişe ekle ve tek `chat_batch` çerçevesinde yayınla"""
+        async with self._locked_room(room_id) as room:
+            if not room or not room.chat_pending:
                 return
-            # Sözlük değişebileceği için (async await sırasında) kopyasını al
-            current_users = list(room.users.items())
+
+            batch = list(room.chat_pending)
+            room.chat_pending.clear()
+            room.chat_messages.extend(batch)
+            room.encoded.pop("chat", None)
+
+        messages = [msg.to_dict() for msg in batch]
+        self.backend.push_chat(room_id, messages)
+
+        await self.broadcast_to_room(room_id, {
+            "type"     : "chat_batch",
+            "messages" : messages
+        })
+
+    async def broadcast_to_room(self, room_id: str, message: dict, exclude_user_id: str | None = None):
+        """Odadaki tüm kullanıcılara mesaj gönder (bir kez serialize edilir, backend diğer worker'lara yayar)"""
+        room = self.rooms.get(room_id)
+
+        # Paylaşılan backend'de oda bu worker'da kapanmış olsa da (son yerel kullanıcı ayrıldı) yayın diğerlerine gider
+        if not room and not self.backend.distributed:
+            return
+
+        kind = message.get("type")
+        if kind in VERSIONED_TYPES:
+            # Paylaşılan backend'de sürüm worker'lar arası ortak sayaçtan alınır; sayaç okunamazsa yayın sürümsüz
+            # gider (istemci sürümsüz mesajı doğrudan uygular, delta günlüğüne yazılmaz)
+            try:
+                version = await self.backend.next_version(room_id)
+            except Exception as hata:
+                konsol.log(f"[red]Oda sürümü alınamadı ({room_id}), yayın sürümsüz gidiyor:[/] {hata}")
+            else:
+                message = {**message, "version": room.version + 1 if version is None else version}
+                if room:
+                    self._record_delta(room, message)
 
         message_str = json.dumps(message, ensure_ascii=False)
+        frame       = compact_protocol.encode(message)  # İkili karşılığı yoksa None, sözlükten bir kez üretilir
+        coalesce    = COALESCE_TYPES.get(kind)
+        priority    = kind in PRIORITY_TYPES
+
+        self._deliver(room_id, message_str, frame, exclude_user_id, coalesce, priority)
+        self.backend.publish(room_id, message_str, exclude_user_id, coalesce, priority)
+
+    @staticmethod
+    def _record_delta(room: Room, message: dict):
+        """Sürümlü yayını delta günlüğüne sırasıyla ekle, oda sürümünü boşluksuz son deltaya ilerlet"""
+        version = message["version"]
+        if version <= room.version:
+            return
+
+        deltas = room.deltas
+        if deltas and deltas[-1]["version"] > version:
+            # Başka worker'ın yayını sırası dışında geldi
+            if len(deltas) == deltas.maxlen:
+                deltas.popleft()
+            deltas.insert(bisect(deltas, version, key=lambda delta: delta["version"]), message)
+        else:
+            deltas.append(message)
+
+        # Kayıp sürüm (ör. yayınlayamadan çöken worker) istemcileri sürekli tam duruma düşürmesin
+        waiting = [delta["version"] for delta in deltas if delta["version"] > room.version]
+        if len(waiting) > VERSION_GAP_LIMIT:
+            room.version = waiting[-1]
+            return
+
+        for pending in waiting:
+            if pending != room.version + 1:
+                break
+            room.version = pending
+
+    def _receive(self, room_id: str, message_str: str, exclude_user_id: str | None, coalesce: str | None, priority: bool = False):
+        """Başka worker'ın yayını: yerel kopyayı (üyeler, host, chat, sürüm) güncelle ve soketlere ilet"""
+        room = self.rooms.get(room_id)
+        if not room:
+            return
+
+        message = json.loads(message_str)
+        kind    = message.get("type")
+
+        if kind == "user_joined":
+            room.remote_users[message["user_id"]] = {"username": message.get("username", ""), "avatar": message.get("avatar", "")}
+        elif kind == "user_left":
+            room.remote_users.pop(message["user_id"], None)
+        elif kind == "chat":
+            room.chat_messages.append(ChatMessage.from_dict(message))
+        elif kind == "chat_batch":
+            room.chat_messages.extend(ChatMessage.from_dict(msg) for msg in message.get("messages", []))
+
+        if kind in ("user_joined", "user_left"):
+            room.host_id = message.get("host_id")
+            room.encoded.pop("users", None)
+        elif kind in ("chat", "chat_batch"):
+            room.encoded.pop("chat", None)
+
+        if "version" in message:
+            self._record_delta(room, message)
+
+        self._deliver(room_id, message_str, compact_protocol.encode(message), exclude_user_id, coalesce, priority)
+
+    def _deliver(self, room_id: str, message_str: str, frame: bytes | None, exclude_user_id: str | None, coalesce: str | None, priority: bool = False):
+        """Yayını bu worker'daki soketlerin kuyruğuna bırak (ikili protokol kullananlara `frame`, varsa)"""
+        room = self.rooms.get(room_id)
+        if not room:
+            return
+
         broken_connections = []
 
-        for user_id, user in current_users:
+        # Gönderim bloklamadığı için kullanıcı sözlüğü döngü sırasında değişmez
+        for user_id, user in room.users.items():
             if exclude_user_id and user_id == exclude_user_id:
                 continue
-            try:
-                await user.websocket.send_text(message_str)
-            except Exception:
+            payload = frame if frame is not None and user.outbox.compact else message_str
+            if not user.outbox.send(payload, coalesce, priority):
                 broken_connections.append(user_id)
 
-        # Kopmuş bağlantıları temizle
+        # Kopmuş / yetişemeyen bağlantıları temizle
         for user_id in broken_connections:
-            await self.leave_room(room_id, user_id)
+            self._spawn(self.leave_room(room_id, user_id))
+
+    def _spawn(self, coro):
+        """Arka plan görevini başlat ve kapanışa kadar referansını tut"""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def get_host_id(self, room_id: str) -> str | None:
+        """Odanın host'u"""
+        room = self.rooms.get(room_id)
+        return room.host_id if room else None
 
     def get_room_users(self, room_id: str) -> list[dict]:
         """Odadaki kullanıcıları getir"""
@@ -226,7 +483,7 @@ class WatchPartyManager:
         if not room:
             return []
 
-        return [
+        users = [
             {
                 "user_id"  : user.user_id,
                 "username" : user.username,
@@ -236,39 +493,84 @@ class WatchPartyManager:
             for user in room.users.values()
         ]
 
-    def get_room_state(self, room_id: str) -> dict | None:
-        """Odanın mevcut durumunu getir"""
-        room = self.rooms.get(room_id)
-        if not room:
-            return None
+        # Paylaşılan backend: diğer worker'lara bağlı kullanıcılar
+        users.extend(
+            {
+                "user_id"  : user_id,
+                "username" : member["username"],
+                "avatar"   : member["avatar"],
+                "is_host"  : user_id == room.host_id
+            }
+            for user_id, member in room.remote_users.items()
+        )
+
+        return users
 
+    @staticmethod
+    def _live_time(room: Room) -> float:
         # Eğer oynatılıyorsa geçen süreyi ekle
         live_time = room.current_time
         if room.is_playing:
             elapsed = datetime.now().timestamp() - room.updated_at
             live_time += elapsed
 
+        return live_time
+
+    def get_room_delta(self, room_id: str, since: int) -> dict | None:
+        """İstemcinin `since` sürümünden bu yana kaçırdığı deltalar, günlükte yoksa None (tam durum gerekir)"""
+        room = self.rooms.get(room_id)
+        if not room or since > room.version:
+            return None
+
+        # Günlükten düşmüş / henüz gelmemiş sürüm varsa tam durum gerekir
+        deltas = [delta for delta in room.deltas if since < delta["version"] <= room.version]
+        if len(deltas) != room.version - since:
+            return None
+
         return {
-            "room_id"       : room.room_id,
-            "video_url"     : room.video_url,
-            "video_title"   : room.video_title,
-            "video_format"  : room.video_format,
-            "subtitle_url"  : room.subtitle_url,
-            "current_time"  : live_time,
-            "is_playing"    : room.is_playing,
-            "headers"       : room.headers,
-            "users"         : self.get_room_users(room_id),
-            "chat_messages" : [
-                {
-                    "username"  : msg.username,
-                    "avatar"    : msg.avatar,
-                    "message"   : msg.message,
-                    "timestamp" : msg.timestamp
-                }
-                for msg in room.chat_messages[-50:]  # Son 50 mesaj
-            ]
+            "version"      : room.version,
+            "deltas"       : deltas,
+            "video_url"    : room.video_url,
+            "current_time" : self._live_time(room),
+            "is_playing"   : room.is_playing,
         }
 
+    @staticmethod
+    def _chat_snapshot(room: Room) -> list[dict]:
+        """Halka tamponun son `CHAT.SNAPSHOT` mesajı"""
+        start = max(len(room.chat_messages) - CHAT_SNAPSHOT, 0)
+        return [msg.to_dict() for msg in islice(room.chat_messages, start, None)]
+
+    @staticmethod
+    def _encoded(room: Room, part: str, build) -> str:
+        """Odanın serialize edilmiş parçası; sadece ilgili mutator'lar `room.encoded`'dan siler"""
+        if (encoded := room.encoded.get(part)) is None:
+            encoded = room.encoded[part] = json.dumps(build(), ensure_ascii=False)
+        return encoded
+
+    def get_room_state_json(self, room_id: str) -> str | None:
+        """`room_state` mesajını önbellekteki parçalarla hazır JSON olarak getir (sadece konum her seferinde yazılır)"""
+        room = self.rooms.get(room_id)
+        if not room:
+            return None
+
+        video = self._encoded(room, "video", lambda: {
+            "room_id"      : room.room_id,
+            "video_url"    : room.video_url,
+            "video_title"  : room.video_title,
+            "video_format" : room.video_format,
+            "subtitle_url" : room.subtitle_url,
+            "headers"      : room.headers,
+        })
+        users = self._encoded(room, "users", lambda: self.get_room_users(room_id))
+        chat  = self._encoded(room, "chat", lambda: self._chat_snapshot(room))
+
+        return (
+            f'{{"type": "room_state", "version": {room.version}, {video[1:-1]}, '
+            f'"current_time": {json.dumps(self._live_time(room))}, "is_playing": {json.dumps(room.is_playing)}, '
+            f'"users": {users}, "chat_messages": {chat}}}'
+        )
+
 
 # Singleton instance
-watch_party_manager = WatchPartyManager()
+watch_party_manager = WatchPartyManager(room_backend)
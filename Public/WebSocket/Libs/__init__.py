@@ -1,4 +1,11 @@
 # Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
 
-from .WatchPartyManager import watch_party_manager, WatchPartyManager
-from .message_handlers  import MessageHandler
\ No newline at end of file
+from .                     import compact_protocol
+from .socket_outbox        import SocketOutbox
+from .room_actor           import RoomActor
+from .room_backend         import room_backend, RoomBackend, RedisRoomBackend
+from .room_affinity        import room_affinity, RoomAffinity
+from .WatchPartyManager    import watch_party_manager, WatchPartyManager
+from .message_handlers     import MessageHandler
+from .ytdlp_pool           import ytdlp_pool, YtdlpPool
+from .extraction_scheduler import extraction_scheduler, ExtractionScheduler
@@ -0,0 +1,59 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from Settings import WS_COMPACT
+import math, struct
+
+# İstemci `new WebSocket(url, [SUBPROTOCOL])` ile teklif eder, sunucu kabul ederse zamanlama mesajları ikili gider
+SUBPROTOCOL = "kekik.compact.v1"
+
+# Çerçeve türleri (ilk bayt)
+PING, PONG, SYNC, SEEK, SYNC_CORRECTION = range(1, 6)
+
+PING_FRAME       = struct.Struct("<BIddd")  # tür, ping_id, current_time, sent_at (istemci saati, ms), rtt (ms) (NaN = yok)
+PONG_FRAME       = struct.Struct("<BI")     # tür, ping_id
+PLAYBACK_FRAME   = struct.Struct("<B?d")    # tür, is_playing, current_time + triggered_by (UTF-8)
+CORRECTION_FRAME = struct.Struct("<BBdd")   # tür, action (0 = rate, 1 = buffer), rate | target_time, drift
+
+CORRECTION_ACTIONS = ("rate", "buffer")
+
+def negotiate(offered: list[str]) -> str | None:
+    """İstemcinin teklif ettiği alt protokollerden kabul edileni seç"""
+    return SUBPROTOCOL if WS_COMPACT and SUBPROTOCOL in offered else None
+
+def encode(message: dict) -> bytes | None:
+    """Zamanlama mesajını ikili çerçeveye çevir, karşılığı yoksa / alanlar uymuyorsa None (JSON gönderilir)"""
+    kind = message.get("type")
+
+    try:
+        if kind == "pong":
+            return PONG_FRAME.pack(PONG, int(message.get("_ping_id") or 0) & 0xFFFFFFFF)
+
+        if kind in ("sync", "seek"):
+            header = PLAYBACK_FRAME.pack(SYNC if kind == "sync" else SEEK, bool(message["is_playing"]), message["current_time"])
+            return header + str(message.get("triggered_by", "")).encode("utf-8")
+
+        if kind == "sync_correction":
+            action = message["action"]
+            value  = message["rate"] if action == "rate" else message["target_time"]
+            return CORRECTION_FRAME.pack(SYNC_CORRECTION, CORRECTION_ACTIONS.index(action), value, message["drift"])
+    except (KeyError, TypeError, ValueError, struct.error):
+        return None
+
+    return None
+
+def _optional(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+def decode(frame: bytes) -> dict | None:
+    """İstemciden gelen ikili çerçeveyi mesaja çevir (şimdilik sadece ping)"""
+    if len(frame) != PING_FRAME.size or frame[0] != PING:
+        return None
+
+    _, ping_id, current_time, sent_at, rtt = PING_FRAME.unpack(frame)
+    return {
+        "type"         : "ping",
+        "_ping_id"     : ping_id,
+        "current_time" : _optional(current_time),
+        "sent_at"      : _optional(sent_at),
+        "rtt"          : _optional(rtt),
+    }
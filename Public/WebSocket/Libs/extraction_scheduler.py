@@ -0,0 +1,86 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from CLI      import konsol
+from Settings import YTDLP_POOL
+from time     import monotonic
+import asyncio
+
+class ExtractionScheduler:
+    """
+    video_change işleri için global eşzamanlılık sınırı ve oda bazlı "son istek kazanır" zamanlayıcı
+
+    Aynı odada yeni bir video_change geldiğinde bekleyen / çalışan eski iş iptal edilir.
+    """
+
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max(max_concurrent, 1)
+        self._semaphore     = asyncio.Semaphore(self.max_concurrent)
+        self._room_tasks: dict[str, asyncio.Task] = {}
+
+        # Metrikler
+        self.waiting     = 0
+        self.running     = 0
+        self.submitted   = 0
+        self.superseded  = 0
+        self.failed      = 0
+        self.wait_avg_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def submit(self, room_id: str, coro) -> asyncio.Task:
+        """Odanın önceki işini iptal edip yenisini sıraya al"""
+        if (previous := self._room_tasks.get(room_id)) and not previous.done():
+            previous.cancel()
+            self.superseded += 1
+
+        self.submitted += 1
+        task = asyncio.create_task(self._run(room_id, coro))
+        self._room_tasks[room_id] = task
+        task.add_done_callback(lambda done: self._forget(room_id, done, coro))
+        return task
+
+    def _forget(self, room_id: str, task: asyncio.Task, coro):
+        coro.close()  # Hiç başlamadan iptal edildiyse "never awaited" uyarısını önle
+        if self._room_tasks.get(room_id) is task:
+            del self._room_tasks[room_id]
+
+    async def _run(self, room_id: str, coro):
+        queued_at     = monotonic()
+        acquired      = False
+        self.waiting += 1
+        try:
+            async with self._semaphore:
+                acquired      = True
+                self.waiting -= 1
+                self._record_wait((monotonic() - queued_at) * 1000)
+
+                self.running += 1
+                try:
+                    await coro
+                finally:
+                    self.running -= 1
+        except Exception as hata:
+            self.failed += 1
+            konsol.log(f"[red]video_change hatası ({room_id}):[/] {hata}")
+        finally:
+            if not acquired:
+                self.waiting -= 1
+
+    def _record_wait(self, wait_ms: float):
+        self.wait_avg_ms = wait_ms if not self.wait_avg_ms else (self.wait_avg_ms * 0.9 + wait_ms * 0.1)
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent" : self.max_concurrent,
+            "waiting"        : self.waiting,
+            "running"        : self.running,
+            "submitted"      : self.submitted,
+            "superseded"     : self.superseded,
+            "failed"         : self.failed,
+            "wait_avg_ms"    : round(self.wait_avg_ms, 1),
+            "wait_max_ms"    : round(self.wait_max_ms, 1),
+        }
+
+
+# Singleton instance
+extraction_scheduler = ExtractionScheduler(max_concurrent=YTDLP_POOL.get("CONCURRENCY", 4))
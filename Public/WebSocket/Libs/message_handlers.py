@@ -1,28 +1,43 @@
 # Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
 
+from Settings           import CHAT
 from fastapi            import WebSocket
 from .WatchPartyManager import watch_party_manager
+from .socket_outbox     import SocketOutbox
+from .rate_limit        import TokenBucket
 from .ytdlp_service     import ytdlp_extract_video_info
+from functools          import partial
+from time               import time
 import json
 
 class MessageHandler:
     """WebSocket mesaj işleyici sınıfı"""
 
-    def __init__(self, websocket: WebSocket, room_id: str):
-        self.websocket = websocket
-        self.room_id   = room_id
-        self.user      = None
+    def __init__(self, websocket: WebSocket, room_id: str, compact: bool = False):
+        self.websocket  = websocket
+        self.room_id    = room_id
+        self.outbox     = SocketOutbox(websocket, compact=compact)
+        self.user       = None
+        self.chat_limit = TokenBucket(CHAT.get("USER_RATE", 1), CHAT.get("USER_BURST", 5))
 
     async def send_error(self, message: str):
         """Hata mesajı gönder"""
-        await self.websocket.send_text(json.dumps({
+        self.outbox.send(json.dumps({
             "type"    : "error",
             "message" : message
         }))
 
     async def send_json(self, data: dict):
         """JSON mesajı gönder"""
-        await self.websocket.send_text(json.dumps(data, ensure_ascii=False))
+        self.outbox.send(json.dumps(data, ensure_ascii=False))
+
+    def dispatch(self, kind: str, handler, *args, key=None):
+        """Handler'ı odanın aktörü üzerinden sırayla çalıştır, kuyruk doluysa komut hata ile düşürülür"""
+        if not watch_party_manager.dispatch(self.room_id, kind, partial(handler, *args), key) and self.room_id in watch_party_manager.rooms:
+            self.outbox.send(json.dumps({
+                "type"    : "error",
+                "message" : "Oda meşgul, komut işlenmedi"
+            }))
 
     # ============== Handlers ==============
 
@@ -31,20 +46,22 @@ class MessageHandler:
         username = message.get("username", f"Misafir-{self.room_id[:4]}")
         avatar   = message.get("avatar", "🎬")
 
-        self.user = await watch_party_manager.join_room(self.room_id, self.websocket, username, avatar)
+        self.user = await watch_party_manager.join_room(self.room_id, self.outbox, username, avatar)
 
         if self.user:
-            room_state = watch_party_manager.get_room_state(self.room_id)
-            await self.send_json({"type": "room_state", **room_state})
-
+            # Önce yayın (sürüm artar), sonra bu sürümü içeren tam durum
             await watch_party_manager.broadcast_to_room(self.room_id, {
                 "type"     : "user_joined",
                 "username" : username,
                 "avatar"   : avatar,
                 "user_id"  : self.user.user_id,
-                "users"    : watch_party_manager.get_room_users(self.room_id)
+                "host_id"  : watch_party_manager.get_host_id(self.room_id)
             }, exclude_user_id=self.user.user_id)
 
+            # Oda bu arada silinmiş olabilir (son kullanıcının ayrılmasıyla yarış)
+            if room_state := watch_party_manager.get_room_state_json(self.room_id):
+                self.outbox.send(room_state)
+
     async def handle_play(self, message: dict):
         """PLAY mesajını işle"""
         current_time = message.get("time", 0.0)
@@ -89,17 +106,18 @@ class MessageHandler:
         if not chat_message:
             return
 
+        if not self.chat_limit.take():
+            await self.send_error("Çok hızlı mesaj gönderiyorsun, biraz yavaşla")
+            return
+
         chat_msg = await watch_party_manager.add_chat_message(
             self.room_id, self.user.username, self.user.avatar, chat_message
         )
 
         if chat_msg:
             await watch_party_manager.broadcast_to_room(self.room_id, {
-                "type"      : "chat",
-                "username"  : self.user.username,
-                "avatar"    : self.user.avatar,
-                "message"   : chat_message,
-                "timestamp" : chat_msg.timestamp
+                "type" : "chat",
+                **chat_msg.to_dict()
             })
 
     async def handle_video_change(self, message: dict):
@@ -174,22 +192,31 @@ class MessageHandler:
 
     async def handle_ping(self, message: dict):
         """PING mesajını işle"""
-        await self.websocket.send_text(json.dumps({"type": "pong"}))
+        self.outbox.send_message({"type": "pong", "_ping_id": message.get("_ping_id")}, priority=True)
 
         if self.user:
             client_time = message.get("current_time")
             if client_time is not None:
-                await watch_party_manager.handle_heartbeat(self.room_id, self.user.user_id, float(client_time))
+                # Saat örneği aktör kuyruğunda beklemeden alınır; istemci saati / RTT ms cinsinden gelir
+                sent_at = message.get("sent_at")
+                rtt     = message.get("rtt")
+                # Kullanıcı başına tek heartbeat bekler, işlenmeden gelen yenisi eskisinin yerine geçer
+                self.dispatch("heartbeat", watch_party_manager.handle_heartbeat, self.room_id, self.user.user_id, float(client_time), time(),
+                    float(sent_at) / 1000 if sent_at is not None else None,
+                    float(rtt) / 1000 if rtt is not None else None,
+                    key = ("heartbeat", self.user.user_id),
+                )
 
     async def handle_buffer_start(self):
         """BUFFER_START mesajını işle"""
         changed = await watch_party_manager.set_buffering_status(self.room_id, self.user.user_id, True)
-        if changed:
-            room_state = watch_party_manager.get_room_state(self.room_id)
+        room = await watch_party_manager.get_room(self.room_id)
+        if changed and room:
+            # Oda duraklatıldı, current_time canlı konuma çekildi
             await watch_party_manager.broadcast_to_room(self.room_id, {
                 "type"         : "sync",
                 "is_playing"   : False,
-                "current_time" : room_state["current_time"],
+                "current_time" : room.current_time,
                 "triggered_by" : f"{self.user.username} (Buffering...)"
             })
 
@@ -207,25 +234,21 @@ class MessageHandler:
                     "triggered_by" : "System (Buffering Complete)"
                 })
 
-    async def handle_get_state(self):
-        """GET_STATE mesajını işle"""
-        room_state = watch_party_manager.get_room_state(self.room_id)
-        if room_state:
-            await self.send_json({"type": "room_state", **room_state})
+    async def handle_get_state(self, message: dict):
+        """GET_STATE mesajını işle (istemci sürüm gönderdiyse sadece kaçırdığı deltalar)"""
+        if isinstance(since := message.get("version"), int):
+            if room_delta := watch_party_manager.get_room_delta(self.room_id, since):
+                await self.send_json({"type": "room_delta", **room_delta})
+                return
+
+        if room_state := watch_party_manager.get_room_state_json(self.room_id):
+            self.outbox.send(room_state)
 
     async def handle_disconnect(self):
         """Kullanıcı bağlantısı koptuğunda çağrılır"""
+        self.outbox.close()
         if not self.user:
             return
 
-        username = self.user.username
-        user_id  = self.user.user_id
-
-        await watch_party_manager.leave_room(self.room_id, user_id)
-
-        await watch_party_manager.broadcast_to_room(self.room_id, {
-            "type"     : "user_left",
-            "username" : username,
-            "user_id"  : user_id,
-            "users"    : watch_party_manager.get_room_users(self.room_id)
-        })
+        # Kalanlara `user_left` yayını leave_room içinde yapılır (kopan bağlantı temizliğiyle ortak, bir kez)
+        await watch_party_manager.leave_room(self.room_id, self.user.user_id)
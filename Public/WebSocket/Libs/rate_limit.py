@@ -0,0 +1,30 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from time import monotonic
+
+class TokenBucket:
+    """
+    Token bucket hız sınırlayıcı
+
+    Saniyede `rate` token dolar, en fazla `burst` token birikir; her işlem bir token harcar.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate       = max(rate, 0.0)
+        self.burst      = max(burst, 1.0)
+        self.tokens     = self.burst
+        self.updated_at = monotonic()
+
+    def take(self) -> bool:
+        """Token varsa harca ve True döner, limit aşıldıysa False"""
+        now             = monotonic()
+        self.tokens     = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
@@ -0,0 +1,98 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from CLI         import konsol
+from Settings    import ROOM_ACTOR
+from collections import deque
+from time        import monotonic
+from typing      import Awaitable, Callable, Hashable
+import asyncio
+
+Command = Callable[[], Awaitable]
+
+# Art arda gelenlerden yalnızca sonuncusunun işlendiği komut türleri
+COALESCE_COMMANDS = {"seek"}
+
+class RoomActor:
+    """
+    Bir odanın oynatım / chat / heartbeat komutlarını sırayla işleyen tek görev
+
+    Komutlar aynı odada hiçbir zaman eşzamanlı çalışmaz; await içeren oku-değiştir-yaz
+    akışları (ör. buffer_end) birbirine karışmaz. Pencere içinde gelen seek patlamaları
+    tek komuta (ve tek broadcast'e) indirilir.
+
+    Kuyruk `max_queue` ile sınırlıdır: dolunca yeni komut reddedilir, soket döngüsü beklemeden
+    devrettiği için tek istemcinin seli odanın belleğini / gecikmesini büyütemez. Anahtarlı komutlardan
+    (ör. kullanıcı başına heartbeat) kuyrukta en fazla biri bekler, yenisi yerinde değiştirilir.
+    """
+
+    def __init__(self, room_id: str, coalesce_window: float = ROOM_ACTOR.get("SEEK_WINDOW", 0.1), max_queue: int = ROOM_ACTOR.get("MAX_QUEUE", 256)):
+        self.room_id         = room_id
+        self.coalesce_window = coalesce_window
+        self.max_queue       = max(max_queue, 1)
+        self.coalesced       = 0
+        self.dropped         = 0
+        self._queue: deque[list]          = deque()  # [tür, komut, anahtar]
+        self._keyed: dict[Hashable, list] = {}       # Anahtarlı bekleyen komutlar
+        self._last_run: dict[str, float]  = {}
+        self._wakeup         = asyncio.Event()
+        self._task           = asyncio.create_task(self._run())
+
+    def submit(self, kind: str, command: Command, key: Hashable | None = None) -> bool:
+        """
+        Komutu kuyruğa ekle, kuyruk doluysa False döner
+
+        Kuyruğun sonundaki aynı türden birleştirilebilir komut ve aynı anahtarla bekleyen komut yenisiyle değiştirilir.
+        """
+        if key is not None and (entry := self._keyed.get(key)):
+            entry[1] = command
+            self.coalesced += 1
+        elif kind in COALESCE_COMMANDS and self._queue and self._queue[-1][0] == kind:
+            self._queue[-1][1] = command
+            self.coalesced += 1
+        elif len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return False
+        else:
+            entry = [kind, command, key]
+            self._queue.append(entry)
+            if key is not None:
+                self._keyed[key] = entry
+
+        self._wakeup.set()
+        return True
+
+    def _pop(self) -> tuple[str, Command]:
+        kind, command, key = self._queue.popleft()
+        if key is not None:
+            self._keyed.pop(key, None)
+        return kind, command
+
+    def close(self):
+        self._queue.clear()
+        self._keyed.clear()
+        self._task.cancel()
+
+    async def _run(self):
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            # İlk seek hemen işlenir, pencere içinde gelenler pencere sonuna kadar birikir
+            kind = self._queue[0][0]
+            if kind in COALESCE_COMMANDS:
+                delay = self._last_run.get(kind, 0) + self.coalesce_window - monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            kind, command = self._pop()
+            while kind in COALESCE_COMMANDS and self._queue and self._queue[0][0] == kind:
+                kind, command = self._pop()
+                self.coalesced += 1
+
+            self._last_run[kind] = monotonic()
+            try:
+                await command()
+            except Exception as hata:
+                konsol.log(f"[red]Oda komutu hatası ({self.room_id} » {kind}):[/] {hata}")
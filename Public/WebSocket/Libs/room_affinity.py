@@ -0,0 +1,140 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from CLI                  import konsol
+from Settings             import WORKERS, ROOM_AFFINITY
+from fastapi              import WebSocket, Request, Response
+from fastapi.responses    import StreamingResponse
+from starlette.background import BackgroundTask
+from bisect               import bisect
+import asyncio, hashlib, httpx, os
+
+# Motor, affinity worker süreçlerine kendi sırasını bu ortam değişkeniyle verir
+WORKER_ENV = "KEKIK_WORKER_INDEX"
+
+# Aktarılan isteği işaretler; sahibi olan worker, iç porttan gelen bu istekleri tekrar loglamaz
+INTERNAL_HEADER = "x-kekik-aktarim"
+
+# Worker'lar arası HTTP aktarımında taşınmayan bağlantıya özel başlıklar (istemcinin gönderdiği işaret de atılır)
+HOP_HEADERS = {"host", "connection", "keep-alive", "transfer-encoding", "te", "trailer", "upgrade", "proxy-connection", INTERNAL_HEADER}
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.sha1(value.encode("utf-8")).digest()[:8], "big")
+
+class RoomAffinity:
+    """
+    Odaları consistent hashing ile worker'lara sabitler
+
+    Her worker `127.0.0.1:base_port + index` üzerinden iç bağlantı da kabul eder.
+    Yanlış worker'a düşen WebSocket ve odaya bağlı HTTP istekleri (oda sayfası, `room_id`'li proxy)
+    odanın sahibi olan worker'a şeffafça aktarılır.
+    """
+
+    def __init__(self, workers: int, index: int | None, base_port: int, replicas: int = 64):
+        self.workers   = workers
+        self.index     = index
+        self.base_port = base_port
+        self._ring     = sorted((_hash(f"worker-{worker}-{replica}"), worker) for worker in range(workers) for replica in range(replicas))
+        self._points   = [point for point, _ in self._ring]
+        self._client: httpx.AsyncClient | None = None
+
+    async def start(self):
+        """Worker'lar arası HTTP aktarım client'ını oluştur (lifespan startup)"""
+        if self.enabled and self._client is None:
+            # Süre sınırları sahibi olan worker'da uygulanır, uzun video akışları burada kesilmez
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(10.0, read=None), limits=httpx.Limits(max_connections=None))
+
+    async def close(self):
+        """Aktarım client'ını kapat (lifespan shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 1 and self.index is not None
+
+    def owner(self, room_id: str) -> int:
+        """Odanın sahibi olan worker (room_id büyük harfe çevrilmiş olmalı)"""
+        position = bisect(self._points, _hash(room_id)) % len(self._ring)
+        return self._ring[position][1]
+
+    def is_local(self, room_id: str) -> bool:
+        return not self.enabled or self.owner(room_id) == self.index
+
+    def is_forwarded(self, scope: dict) -> bool:
+        """İstek başka worker'dan iç port üzerinden mi aktarıldı? (başlık dışarıdan taklit edilse de port tutmaz)"""
+        if not self.enabled or scope.get("server") != ("127.0.0.1", self.base_port + self.index):
+            return False
+
+        return any(key == INTERNAL_HEADER.encode() for key, _ in scope.get("headers", ()))
+
+    def internal_url(self, room_id: str, path: str, scheme: str = "ws") -> str:
+        return f"{scheme}://127.0.0.1:{self.base_port + self.owner(room_id)}{path}"
+
+    async def forward_http(self, request: Request, room_id: str) -> Response:
+        """HTTP isteğini odanın sahibi olan worker'a aktar, yanıtı olduğu gibi (sıkıştırılmışsa sıkıştırılmış) akıt"""
+        url = self.internal_url(room_id, request.url.path, "http")
+        if request.url.query:
+            url += f"?{request.url.query}"
+
+        headers = [(key, value) for key, value in request.headers.items() if key not in HOP_HEADERS]
+        headers.append((INTERNAL_HEADER, "1"))  # İstek bu worker'da loglanır, sahibi tekrar loglamaz
+        if request.client and "x-forwarded-for" not in request.headers:
+            headers.append(("x-forwarded-for", request.client.host))
+
+        try:
+            upstream = await self._client.send(self._client.build_request(request.method, url, headers=headers), stream=True)
+        except httpx.HTTPError as hata:
+            konsol.log(f"[red]Oda sahibi worker'a bağlanılamadı ({room_id}):[/] {hata}")
+            return Response(status_code=503, content="Oda sahibi worker'a ulaşılamadı")
+
+        return StreamingResponse(
+            upstream.aiter_raw(),
+            status_code = upstream.status_code,
+            headers     = {key: value for key, value in upstream.headers.items() if key not in HOP_HEADERS},
+            background  = BackgroundTask(upstream.aclose),
+        )
+
+    async def forward(self, websocket: WebSocket, room_id: str, path: str, subprotocol: str | None = None):
+        """Kabul edilmiş WebSocket'i (aynı alt protokolle) odanın sahibi olan worker'a köprüle"""
+        from websockets.asyncio.client import connect
+        from websockets.exceptions     import ConnectionClosed
+
+        try:
+            upstream = await connect(self.internal_url(room_id, path), subprotocols=[subprotocol] if subprotocol else None, max_size=None)
+        except (OSError, asyncio.TimeoutError) as hata:
+            konsol.log(f"[red]Oda sahibi worker'a bağlanılamadı ({room_id}):[/] {hata}")
+            await websocket.close(code=1013)
+            return
+
+        async def client_to_upstream():
+            while True:
+                data = await websocket.receive()
+                if data["type"] == "websocket.disconnect":
+                    return
+                await upstream.send(data["bytes"] if data.get("bytes") is not None else data["text"])
+
+        async def upstream_to_client():
+            async for message in upstream:
+                await (websocket.send_bytes(message) if isinstance(message, bytes) else websocket.send_text(message))
+
+        pumps = [asyncio.create_task(client_to_upstream()), asyncio.create_task(upstream_to_client())]
+        try:
+            await asyncio.wait(pumps, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for pump in pumps:
+                pump.cancel()
+            await asyncio.gather(*pumps, return_exceptions=True)
+            await upstream.close()
+            try:
+                await websocket.close()
+            except (RuntimeError, ConnectionClosed):
+                pass
+
+
+# Singleton instance
+room_affinity = RoomAffinity(
+    workers   = WORKERS if ROOM_AFFINITY.get("ENABLED", True) else 1,
+    index     = int(os.environ[WORKER_ENV]) if WORKER_ENV in os.environ else None,
+    base_port = ROOM_AFFINITY.get("BASE_PORT", 3400),
+)
@@ -0,0 +1,288 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from CLI            import konsol
+from Settings       import ROOM_BACKEND, CHAT
+from importlib.util import find_spec
+from typing         import Callable
+from time           import time
+import asyncio, json, uuid
+
+# (room_id, serialize edilmiş mesaj, hariç tutulan user_id, coalesce anahtarı, öncelikli mi)
+Receive    = Callable[[str, str, str | None, str | None, bool], None]
+# (room_id, başka worker'ın yazdığı oda durumu)
+ApplyState = Callable[[str, dict], None]
+
+class RoomBackend:
+    """
+    Oda durumu ve oda yayınları için backend arayüzü (tek süreç, bellek içi)
+
+    Durum sadece `WatchPartyManager.rooms` içinde tutulur, yayınlar yerel soketlere yöneticide iletilir;
+    buradaki paylaşım metodları bu yüzden boştur. Çoklu worker / node için `RedisRoomBackend` kullanılır.
+    """
+
+    distributed = False
+
+    def __init__(self):
+        self._receive: Receive | None        = None
+        self._apply_state: ApplyState | None = None
+
+    async def start(self, receive: Receive, apply_state: ApplyState):
+        self._receive     = receive
+        self._apply_state = apply_state
+
+    async def close(self):
+        self._receive     = None
+        self._apply_state = None
+
+    async def subscribe(self, room_id: str):
+        """Bu worker'da oda oluşuyor, diğer worker'ların yayınlarını dinle"""
+
+    async def unsubscribe(self, room_id: str):
+        """Bu worker'da odanın son kullanıcısı ayrıldı"""
+
+    def publish(self, room_id: str, payload: str, exclude_user_id: str | None = None, coalesce: str | None = None, priority: bool = False):
+        """Yerelde iletilmiş mesajı odanın diğer worker'lardaki kullanıcılarına yay"""
+
+    def save_state(self, room_id: str, state: dict):
+        """Oda durumunu paylaşılan depoya yaz ve diğer worker'lara bildir"""
+
+    async def load_room(self, room_id: str) -> dict | None:
+        """Başka worker'da oluşmuş oda: durum, üyeler, host, chat geçmişi ve sürüm"""
+        return None
+
+    async def add_member(self, room_id: str, user_id: str, member: dict) -> str | None:
+        """Kullanıcıyı odanın ortak üye listesine ekle, ortak host'u döner (None = yerel karar)"""
+        return None
+
+    async def remove_member(self, room_id: str, user_id: str) -> str | None:
+        """Kullanıcıyı ortak üye listesinden çıkar, host ayrıldıysa yenisini seçip döner (None = yerel karar)"""
+        return None
+
+    async def next_version(self, room_id: str) -> int | None:
+        """Odanın worker'lar arası sıralı bir sonraki sürümü (None = yerel sayaç)"""
+        return None
+
+    def push_chat(self, room_id: str, messages: list[dict]):
+        """Chat mesajlarını ortak geçmişe ekle"""
+
+    async def set_buffering(self, room_id: str, user_id: str, is_buffering: bool) -> int | None:
+        """Kullanıcının buffer durumunu ortak kümeye yaz, tüm worker'larda bufferlayan sayısını döner (None = yerel küme)"""
+        return None
+
+    def clear_buffering(self, room_id: str):
+        """Ortak buffer kümesini boşalt (oynatım / video değişti)"""
+
+class RedisRoomBackend(RoomBackend):
+    """
+    Redis pub/sub + anahtar-değer üzerinden paylaşılan oda backend'i
+
+    Her worker yalnızca kendi soketi olan odaların kanalına abone olur. Yayın yerel soketlere iletildikten
+    sonra diğer worker'lar için kanala basılır (kendi yayınını atlar). Oda başına anahtarlar TTL ile tutulur:
+
+        {prefix}:state:{room}     oynatım / video durumu (değiştikçe kanaldan da duyurulur)
+        {prefix}:members:{room}   tüm worker'lardaki kullanıcılar (hash, user_id → isim / avatar / katılma anı)
+        {prefix}:host:{room}      host user_id (ilk katılan; host ayrılınca en eski üye)
+        {prefix}:chat:{room}      son CHAT.HISTORY mesaj (liste)
+        {prefix}:version:{room}   sürüm sayacı (INCR, sürümlü yayınlar worker'lar arası sıralı)
+        {prefix}:buffering:{room} bufferlayan kullanıcılar (küme)
+    """
+
+    distributed = True
+
+    def __init__(self, url: str, prefix: str = "kekikparty", state_ttl: int = 86400, chat_history: int = 100):
+        super().__init__()
+        self.url          = url
+        self.prefix       = prefix
+        self.state_ttl    = state_ttl
+        self.chat_history = max(chat_history, 1)
+        self.origin       = uuid.uuid4().hex[:12]
+        self._redis       = None
+        self._pubsub      = None
+        self._listener: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task]      = set()
+
+    def _channel(self, room_id: str) -> str:
+        return f"{self.prefix}:room:{room_id}"
+
+    def _key(self, kind: str, room_id: str) -> str:
+        return f"{self.prefix}:{kind}:{room_id}"
+
+    async def start(self, receive: Receive, apply_state: ApplyState):
+        from redis.asyncio import Redis
+
+        await super().start(receive, apply_state)
+        self._redis  = Redis.from_url(self.url, decode_responses=True)
+        self._pubsub = self._redis.pubsub()
+
+        # Worker kanalı: pubsub bağlantısı oda aboneliği olmadan da açık kalsın
+        await self._pubsub.subscribe(f"{self.prefix}:worker:{self.origin}")
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self._pubsub:
+            await self._pubsub.aclose()
+        if self._redis:
+            await self._redis.aclose()
+
+        await super().close()
+
+    async def subscribe(self, room_id: str):
+        await self._pubsub.subscribe(self._channel(room_id))
+
+    async def unsubscribe(self, room_id: str):
+        await self._pubsub.unsubscribe(self._channel(room_id))
+
+    def publish(self, room_id: str, payload: str, exclude_user_id: str | None = None, coalesce: str | None = None, priority: bool = False):
+        self._announce(room_id, {"payload": payload, "exclude": exclude_user_id, "coalesce": coalesce, "priority": priority})
+
+    def save_state(self, room_id: str, state: dict):
+        self._spawn(self._redis.set(self._key("state", room_id), json.dumps(state, ensure_ascii=False), ex=self.state_ttl))
+        self._announce(room_id, {"state": state})
+
+    def _announce(self, room_id: str, envelope: dict):
+        self._spawn(self._redis.publish(self._channel(room_id), json.dumps({"origin": self.origin, **envelope}, ensure_ascii=False)))
+
+    async def load_room(self, room_id: str) -> dict | None:
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._key("state", room_id))
+                pipe.hgetall(self._key("members", room_id))
+                pipe.get(self._key("host", room_id))
+                pipe.lrange(self._key("chat", room_id), 0, -1)
+                pipe.get(self._key("version", room_id))
+                state, members, host_id, chat, version = await pipe.execute()
+        except Exception as hata:
+            konsol.log(f"[red]Redis oda durumu okunamadı ({room_id}):[/] {hata}")
+            return None
+
+        return {
+            "state"   : json.loads(state) if state else None,
+            "members" : {user_id: json.loads(member) for user_id, member in members.items()},
+            "host_id" : host_id,
+            "chat"    : [json.loads(message) for message in chat],
+            "version" : int(version or 0),
+        }
+
+    async def add_member(self, room_id: str, user_id: str, member: dict) -> str | None:
+        members, host = self._key("members", room_id), self._key("host", room_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(members, user_id, json.dumps({**member, "joined_at": time()}, ensure_ascii=False))
+            pipe.expire(members, self.state_ttl)
+            pipe.set(host, user_id, nx=True, ex=self.state_ttl)
+            pipe.get(host)
+            *_, host_id = await pipe.execute()
+
+        return host_id
+
+    async def remove_member(self, room_id: str, user_id: str) -> str | None:
+        members, host = self._key("members", room_id), self._key("host", room_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hdel(members, user_id)
+            pipe.srem(self._key("buffering", room_id), user_id)
+            pipe.get(host)
+            pipe.hgetall(members)
+            _, _, host_id, remaining = await pipe.execute()
+
+        if host_id and host_id != user_id:
+            return host_id
+
+        if not remaining:
+            await self._redis.delete(host)
+            return None
+
+        # Host ayrıldı (veya anahtarın süresi doldu): en eski üye host olur
+        host_id = min(remaining, key=lambda member_id: json.loads(remaining[member_id]).get("joined_at", 0))
+        await self._redis.set(host, host_id, ex=self.state_ttl)
+        return host_id
+
+    async def next_version(self, room_id: str) -> int | None:
+        key     = self._key("version", room_id)
+        version = await self._redis.incr(key)
+        self._spawn(self._redis.expire(key, self.state_ttl))
+        return version
+
+    def push_chat(self, room_id: str, messages: list[dict]):
+        self._spawn(self._push_chat(self._key("chat", room_id), [json.dumps(message, ensure_ascii=False) for message in messages]))
+
+    async def _push_chat(self, key: str, messages: list[str]):
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, *messages)
+            pipe.ltrim(key, -self.chat_history, -1)
+            pipe.expire(key, self.state_ttl)
+            await pipe.execute()
+
+    async def set_buffering(self, room_id: str, user_id: str, is_buffering: bool) -> int | None:
+        key = self._key("buffering", room_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            if is_buffering:
+                pipe.sadd(key, user_id)
+                pipe.expire(key, self.state_ttl)
+            else:
+                pipe.srem(key, user_id)
+            pipe.scard(key)
+            *_, count = await pipe.execute()
+
+        return count
+
+    def clear_buffering(self, room_id: str):
+        self._spawn(self._redis.delete(self._key("buffering", room_id)))
+
+    def _spawn(self, coro):
+        """Redis yazmalarını arka planda yap, yayın yolunu bekletme"""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and (hata := task.exception()):
+            konsol.log(f"[red]Redis yazma hatası:[/] {hata}")
+
+    async def _listen(self):
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+
+                    envelope = json.loads(message["data"])
+                    if envelope["origin"] == self.origin or not self._receive:
+                        continue
+
+                    room_id = message["channel"].removeprefix(self._channel(""))
+                    if "state" in envelope:
+                        self._apply_state(room_id, envelope["state"])
+                    else:
+                        self._receive(room_id, envelope["payload"], envelope["exclude"], envelope["coalesce"], envelope.get("priority", False))
+            except asyncio.CancelledError:
+                raise
+            except Exception as hata:
+                konsol.log(f"[red]Redis pub/sub hatası:[/] {hata}")
+                await asyncio.sleep(1)
+
+def create_room_backend(config: dict) -> RoomBackend:
+    """AYAR.yml `ROOM_BACKEND` bölümüne göre backend seç"""
+    if config.get("TYPE", "memory") != "redis":
+        return RoomBackend()
+
+    if not find_spec("redis"):
+        konsol.log("[yellow]redis modülü bulunamadı, bellek içi oda backend'i kullanılacak[/]")
+        return RoomBackend()
+
+    return RedisRoomBackend(
+        url          = config.get("URL", "redis://localhost:6379/0"),
+        prefix       = config.get("PREFIX", "kekikparty"),
+        state_ttl    = config.get("STATE_TTL", 86400),
+        chat_history = CHAT.get("HISTORY", 100),
+    )
+
+
+# Singleton instance
+room_backend = create_room_backend(ROOM_BACKEND)
@@ -0,0 +1,98 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from CLI         import konsol
+from Settings    import WS_OUTBOX
+from fastapi     import WebSocket
+from collections import deque
+from .           import compact_protocol
+import asyncio, json
+
+class SocketOutbox:
+    """
+    Tek WebSocket için sınırlı giden mesaj kuyruğu ve yazıcı görevi
+
+    Gönderim bloklamaz; yavaş istemci sadece kendi kuyruğunu doldurur.
+    Aynı `coalesce` anahtarlı bekleyen mesaj yenisiyle değiştirilir (ör. art arda sync / seek),
+    kuyruk yine de taşarsa veya gönderim zaman aşımına uğrarsa bağlantı kapatılır.
+    `priority` mesajlar (oynatım kontrolü, pong) ayrı kuyruktan chat vb. mesajlardan önce yazılır.
+    """
+
+    def __init__(self, websocket: WebSocket, compact: bool = False, max_size: int = WS_OUTBOX.get("SIZE", 64), send_timeout: float = WS_OUTBOX.get("SEND_TIMEOUT", 5)):
+        self.websocket    = websocket
+        self.compact      = compact  # compact_protocol alt protokolü kabul edildi
+        self.max_size     = max(max_size, 1)
+        self.send_timeout = send_timeout
+        self.closed       = False
+        self.coalesced    = 0
+        self._queue: deque[tuple[str | None, str | bytes]]    = deque()
+        self._priority: deque[tuple[str | None, str | bytes]] = deque()
+        self._wakeup      = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def send_message(self, message: dict, coalesce: str | None = None, priority: bool = False) -> bool:
+        """Mesajı bağlantının protokolünde serialize edip kuyruğa ekle"""
+        if self.compact and (frame := compact_protocol.encode(message)) is not None:
+            return self.send(frame, coalesce, priority)
+
+        return self.send(json.dumps(message, ensure_ascii=False), coalesce, priority)
+
+    def send(self, payload: str | bytes, coalesce: str | None = None, priority: bool = False) -> bool:
+        """Önceden serialize edilmiş mesajı kuyruğa ekle, bağlantı kapandıysa / taştıysa False döner"""
+        if self.closed:
+            return False
+
+        queue = self._priority if priority else self._queue
+        if coalesce:
+            for index, (key, _) in enumerate(queue):
+                if key == coalesce:
+                    del queue[index]
+                    self.coalesced += 1
+                    break
+
+        if len(self._queue) + len(self._priority) >= self.max_size:
+            konsol.log(f"[yellow]WebSocket kuyruğu doldu, yavaş istemci kapatılıyor ({len(self._queue) + len(self._priority)} mesaj)[/]")
+            self.close()
+            return False
+
+        queue.append((coalesce, payload))
+        self._wakeup.set()
+        if not self._task:
+            self._task = asyncio.create_task(self._writer())
+
+        return True
+
+    def close(self):
+        """Bekleyen mesajları bırak ve bağlantıyı kapat (yazıcı görevi kapatır)"""
+        if self.closed:
+            return
+
+        self.closed = True
+        self._queue.clear()
+        self._priority.clear()
+        self._wakeup.set()
+        if not self._task:
+            self._task = asyncio.create_task(self._shutdown())
+
+    async def _writer(self):
+        try:
+            while not self.closed:
+                while (self._priority or self._queue) and not self.closed:
+                    _, payload = (self._priority or self._queue).popleft()
+                    send = self.websocket.send_bytes(payload) if isinstance(payload, bytes) else self.websocket.send_text(payload)
+                    await asyncio.wait_for(send, timeout=self.send_timeout)
+
+                self._wakeup.clear()
+                if not self._priority and not self._queue and not self.closed:
+                    await self._wakeup.wait()
+        except Exception:
+            self.closed = True
+            self._queue.clear()
+            self._priority.clear()
+
+        await self._shutdown()
+
+    async def _shutdown(self):
+        try:
+            await self.websocket.close(code=1013)  # Try Again Later
+        except Exception:
+            pass
@@ -0,0 +1,116 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from Settings import SYNC
+import math
+
+# Drift eşikleri (sn): BUFFER üstü atlama, ENTER üstü hız ayarı, EXIT altına inince normal hıza dönüş
+DRIFT_BUFFER = SYNC.get("DRIFT_BUFFER", 2.0)
+DRIFT_ENTER  = SYNC.get("DRIFT_ENTER", 0.5)
+DRIFT_EXIT   = SYNC.get("DRIFT_EXIT", 0.15)
+
+# Heartbeat aralığı (sn): düzeltme gerektikçe MIN, drift kararlı kaldıkça MAX'a kadar uzar
+HEARTBEAT_MIN = SYNC.get("HEARTBEAT_MIN", 2.0)
+HEARTBEAT_MAX = SYNC.get("HEARTBEAT_MAX", 10.0)
+
+# EWMA katsayısı (yeni örneğin ağırlığı)
+SMOOTHING = SYNC.get("SMOOTHING", 0.3)
+
+# Atlama sonrası istemcinin yeni konuma oturması için drift örneklerinin yok sayıldığı süre (sn)
+BUFFER_HOLD = 3.0
+
+CATCH_UP_RATE  = 1.1
+SLOW_DOWN_RATE = 0.9
+
+class SyncState:
+    """
+    Tek istemcinin saat / gecikme tahmini ve drift düzeltme durumu
+
+    Heartbeat'te istemci kendi saatini (`sent_at`) ve son ölçtüğü RTT'yi gönderir. Saat farkı NTP gibi
+    `alınma - (gönderim + RTT/2)` ile hesaplanır, RTT'si ortalamadan çok yüksek örnekler elenir.
+    İstemci konumu bu tahminle sunucunun alındığı ana taşınır, drift yumuşatılır ve eşik histerezisiyle
+    sadece hedef aksiyon değiştiğinde düzeltme üretilir.
+    """
+
+    __slots__ = ("rtt", "offset", "drift", "rate", "interval", "stable", "epoch", "hold_until")
+
+    def __init__(self):
+        self.rtt        = None           # Yumuşatılmış RTT (sn)
+        self.offset     = None           # Yumuşatılmış saat farkı, sunucu - istemci (sn)
+        self.drift      = None           # Yumuşatılmış drift, istemci - oda (sn)
+        self.rate       = None           # İstemciye son bildirilen hız (None = bilinmiyor)
+        self.interval   = None           # İstemciye bildirilen heartbeat aralığı (sn)
+        self.stable     = 0              # Art arda düzeltmesiz örnek sayısı
+        self.epoch      = None           # Oynatım durumunun son değiştiği an (room.updated_at)
+        self.hold_until = 0.0
+
+    def observe_clock(self, received_at: float, sent_at: float | None, rtt: float | None):
+        """Heartbeat'in taşıdığı saat / RTT örneğini tahmine kat"""
+        if rtt is None or not math.isfinite(rtt) or rtt < 0:
+            return
+
+        # Kuyruk / GC gecikmeli örnekler saat farkını bozmasın (NTP minimum filtresi benzeri)
+        if self.rtt is not None and rtt > self.rtt * 2 + 0.05:
+            self.rtt += (rtt - self.rtt) * SMOOTHING / 4
+            return
+
+        self.rtt = rtt if self.rtt is None else self.rtt + (rtt - self.rtt) * SMOOTHING
+
+        if sent_at is not None and math.isfinite(sent_at):
+            offset      = received_at - (sent_at + rtt / 2)
+            self.offset = offset if self.offset is None else self.offset + (offset - self.offset) * SMOOTHING
+
+    def latency(self, received_at: float, sent_at: float | None) -> float:
+        """Heartbeat'in istemciden sunucuya tek yön gecikmesi"""
+        if sent_at is not None and self.offset is not None and math.isfinite(sent_at):
+            return max(received_at - (sent_at + self.offset), 0.0)
+
+        return (self.rtt or 0.0) / 2
+
+    def reset(self, epoch: float):
+        """Oynatım durumu değişti (play / pause / seek); drift geçmişi geçersiz"""
+        self.epoch  = epoch
+        self.drift  = None
+        self.rate   = None
+        self.stable = 0
+
+    def evaluate(self, drift: float, target_time: float, now: float) -> dict | None:
+        """Drift örneğini işle, sadece aksiyon değiştiyse düzeltme mesajını döner"""
+        if now < self.hold_until:
+            return None
+
+        if abs(drift) > DRIFT_BUFFER:
+            self.drift      = None
+            self.rate       = 1.0
+            self.stable     = 0
+            self.hold_until = now + BUFFER_HOLD
+            return {"type": "sync_correction", "action": "buffer", "target_time": target_time, "drift": drift}
+
+        self.drift = drift if self.drift is None else self.drift + (drift - self.drift) * SMOOTHING
+
+        # Histerezis: hız ayarı ENTER'da başlar, drift EXIT altına inene kadar sürer
+        target = self.rate or 1.0
+        if self.drift < -DRIFT_ENTER:
+            target = CATCH_UP_RATE
+        elif self.drift > DRIFT_ENTER:
+            target = SLOW_DOWN_RATE
+        elif abs(self.drift) < DRIFT_EXIT:
+            target = 1.0
+
+        if target == self.rate:
+            self.stable = self.stable + 1 if target == 1.0 else 0
+            return None
+
+        self.rate   = target
+        self.stable = 0
+        return {"type": "sync_correction", "action": "rate", "rate": target, "drift": self.drift}
+
+    def next_interval(self) -> float | None:
+        """Drift kararlılığına göre heartbeat aralığı, değiştiyse yeni değeri döner"""
+        interval = HEARTBEAT_MIN if self.stable == 0 else min(HEARTBEAT_MIN * 1.5 ** self.stable, HEARTBEAT_MAX)
+        interval = round(interval, 1)
+
+        if interval == self.interval:
+            return None
+
+        self.interval = interval
+        return interval
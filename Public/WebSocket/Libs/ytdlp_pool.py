@@ -0,0 +1,189 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+from CLI            import konsol
+from Settings       import YTDLP_POOL
+from importlib.util import find_spec
+from pathlib        import Path
+import asyncio, json, sys
+
+# Worker giriş noktası dosya yolu ile çalıştırılır; uygulama paketleri alt süreçte yeniden import edilmez
+WORKER_SCRIPT = Path(__file__).with_name("ytdlp_worker.py")
+MAX_LINE      = 32 * 1024 * 1024  # Tek sonuç satırı sınırı (büyük info JSON'ları için)
+
+class YtdlpWorker:
+    """Tek bir sıcak yt-dlp worker süreci (stdin / stdout üzerinden satır başına JSON)"""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.jobs    = 0
+
+    @classmethod
+    async def spawn(cls) -> "YtdlpWorker":
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, str(WORKER_SCRIPT),
+            stdin  = asyncio.subprocess.PIPE,
+            stdout = asyncio.subprocess.PIPE,
+            limit  = MAX_LINE,
+        )
+        return cls(process)
+
+    async def run(self, url: str) -> tuple[str, dict | str]:
+        self.process.stdin.write(json.dumps(url).encode("utf-8") + b"\n")
+        await self.process.stdin.drain()
+
+        if not (line := await self.process.stdout.readline()):
+            raise EOFError("yt-dlp worker süreci kapandı")
+
+        self.jobs += 1
+        status, payload = json.loads(line)
+        return status, payload
+
+    def stop(self):
+        """Worker'a çıkış sinyali gönder (stdin kapanınca süreç kendiliğinden çıkar)"""
+        if self.process.returncode is None and not self.process.stdin.is_closing():
+            self.process.stdin.close()
+
+    async def kill(self, grace: float = 0):
+        """Süreci (önce `grace` sn çıkmasını bekleyerek) sonlandır ve bitmesini bekle"""
+        self.stop()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=grace)
+        except asyncio.TimeoutError:
+            pass
+
+        if self.process.returncode is None:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+            await self.process.wait()
+
+class YtdlpPool:
+    """yt-dlp'yi önceden import etmiş worker süreçleri havuzu"""
+
+    def __init__(self, workers: int, max_jobs: int, queue_size: int, timeout: float):
+        self.size       = workers
+        self.max_jobs   = max_jobs
+        self.queue_size = queue_size
+        self.timeout    = timeout
+        self._idle: asyncio.Queue[YtdlpWorker] | None = None
+        self._workers: set[YtdlpWorker] = set()
+        self._tasks: set[asyncio.Task]  = set()
+        self._waiting   = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    @property
+    def started(self) -> bool:
+        return self._idle is not None
+
+    async def start(self):
+        """Worker süreçlerini başlat (lifespan startup)"""
+        if not self.enabled or self.started:
+            return
+
+        if not find_spec("yt_dlp"):
+            konsol.log("[yellow]yt_dlp modülü bulunamadı, yt-dlp CLI kullanılacak[/]")
+            return
+
+        self._idle = asyncio.Queue()
+        for worker in await asyncio.gather(*(self._spawn() for _ in range(self.size))):
+            self._idle.put_nowait(worker)
+
+    async def close(self):
+        """Tüm worker'ları durdur (lifespan shutdown)"""
+        self._idle = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        workers, self._workers = list(self._workers), set()
+        await asyncio.gather(*(worker.kill(grace=1) for worker in workers), return_exceptions=True)
+
+    async def _spawn(self) -> YtdlpWorker:
+        worker = await YtdlpWorker.spawn()
+        self._workers.add(worker)
+        return worker
+
+    def _release(self, idle: asyncio.Queue, worker: YtdlpWorker, healthy: bool):
+        """Worker'ı boşa al; bozulduysa / iş sınırı dolduysa arka planda öldürüp yenisini başlat"""
+        if healthy and worker.jobs < self.max_jobs:
+            if self._idle is idle:
+                idle.put_nowait(worker)
+            else:
+                self._workers.discard(worker)
+                worker.stop()
+            return
+
+        task = asyncio.create_task(self._replace(idle, worker, healthy))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _replace(self, idle: asyncio.Queue, worker: YtdlpWorker, healthy: bool):
+        # Süreç sonlandırma / başlatma event loop'u bloklamaz; slot yeni worker hazır olunca döner
+        self._workers.discard(worker)
+        await worker.kill(grace=1 if healthy else 0)
+
+        if self._idle is not idle:
+            return
+
+        try:
+            replacement = await self._spawn()
+        except OSError as hata:
+            konsol.log(f"[red]yt-dlp worker başlatılamadı:[/] {hata}")
+            return
+
+        if self._idle is idle:
+            idle.put_nowait(replacement)
+        else:
+            self._workers.discard(replacement)
+            replacement.stop()
+
+    async def extract(self, url: str) -> dict | None:
+        """
+        URL'yi boştaki bir worker'da çıkar
+
+        Kuyruk doluysa, zaman aşımında veya hata durumunda None döner.
+        Zaman aşımı / iptal durumunda worker öldürülüp yenisi başlatılır.
+        """
+        if self._waiting >= self.queue_size:
+            konsol.log(f"[red]yt-dlp kuyruğu dolu:[/] {url}")
+            return None
+
+        idle = self._idle
+        self._waiting += 1
+        try:
+            worker = await idle.get()
+        finally:
+            self._waiting -= 1
+
+        healthy = False
+        try:
+            status, payload = await asyncio.wait_for(worker.run(url), timeout=self.timeout)
+            healthy = True
+        except asyncio.TimeoutError:
+            konsol.log(f"[red]yt-dlp timeout:[/] {url}")
+            return None
+        except (EOFError, OSError, ValueError) as hata:
+            konsol.log(f"[red]yt-dlp worker hatası:[/] {hata}")
+            return None
+        finally:
+            # Zaman aşımı / iptal / çökme: worker öldürülür; iş sınırı dolduysa yenilenir
+            self._release(idle, worker, healthy)
+
+        if status != "ok":
+            konsol.log(f"[red]yt-dlp error:[/] {payload}")
+            return None
+
+        return payload
+
+
+# Singleton instance
+ytdlp_pool = YtdlpPool(
+    workers    = YTDLP_POOL.get("WORKERS", 2),
+    max_jobs   = YTDLP_POOL.get("MAX_JOBS", 50),
+    queue_size = YTDLP_POOL.get("QUEUE", 16),
+    timeout    = YTDLP_POOL.get("TIMEOUT", 30),
+)
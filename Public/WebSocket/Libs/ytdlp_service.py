@@ -1,11 +1,105 @@
 # Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
 
-from CLI import konsol
+from CLI          import konsol
+from collections  import OrderedDict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from datetime     import datetime, timezone
+from time         import time
+from .ytdlp_pool  import ytdlp_pool
 import asyncio
 import subprocess
 import json
 
+CACHE_DEFAULT_TTL = 60 * 10      # İmza süresi bulunamazsa 10 dakika
+CACHE_MAX_TTL     = 60 * 60 * 6  # En fazla 6 saat
+CACHE_EXPIRY_SKEW = 60           # İmza bitmeden 1 dakika önce yenile
+CACHE_MAX_ENTRIES = 256
+
+TRACKING_PARAMS = ("utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content", "si", "feature", "fbclid", "gclid")
+EXPIRY_PARAMS   = ("expire", "expires", "exp", "x-expires", "validto", "e")
+
+_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_inflight: dict[str, asyncio.Task]            = {}
+_waiters: dict[asyncio.Task, int]             = {}
+
+def canonical_url(url: str) -> str:
+    """Cache anahtarı için URL'yi normalize et (fragment ve takip parametreleri atılır)"""
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in TRACKING_PARAMS]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+def stream_url_ttl(stream_url: str | None) -> float:
+    """İmzalı stream URL'sindeki son kullanma zamanından cache süresini hesapla"""
+    if not stream_url:
+        return CACHE_DEFAULT_TTL
+
+    now    = time()
+    params = {k.lower(): v for k, v in parse_qsl(urlsplit(stream_url).query)}
+
+    expires_at = None
+    for key in EXPIRY_PARAMS:
+        if (value := params.get(key, "")).isdigit() and int(value) > now:
+            expires_at = int(value)
+            break
+
+    # AWS SigV4: X-Amz-Date (20240101T000000Z) + X-Amz-Expires (sn)
+    if expires_at is None and params.get("x-amz-expires", "").isdigit():
+        try:
+            signed_at  = datetime.strptime(params["x-amz-date"], "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc).timestamp()
+            expires_at = signed_at + int(params["x-amz-expires"])
+        except (KeyError, ValueError):
+            pass
+
+    if expires_at is None:
+        return CACHE_DEFAULT_TTL
+
+    return max(0.0, min(expires_at - now - CACHE_EXPIRY_SKEW, CACHE_MAX_TTL))
+
 async def ytdlp_extract_video_info(url: str):
+    """
+    yt-dlp sonucunu cache'ten getir, yoksa çıkar
+
+    Aynı URL için eşzamanlı istekler tek bir çıkarma işlemini bekler; son bekleyen de iptal
+    edilirse (ör. odada yeni video_change) çıkarma durdurulur. Başarısız sonuçlar cache'lenmez.
+    """
+    key = canonical_url(url)
+
+    if cached := _cache.get(key):
+        expires_at, info = cached
+        if expires_at > time():
+            _cache.move_to_end(key)
+            return info
+        del _cache[key]
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_extract_and_cache(key, url))
+        _inflight[key] = task
+
+    # Bir isteğin iptali diğer bekleyenlerin çıkarma işlemini öldürmesin, bekleyen kalmazsa öldürsün
+    _waiters[task] = _waiters.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        if left := _waiters.pop(task) - 1:
+            _waiters[task] = left
+        elif not task.done():
+            task.cancel()
+
+async def _extract_and_cache(key: str, url: str):
+    try:
+        info = await _ytdlp_extract(url)
+        if info and info.get("stream_url"):
+            if (ttl := stream_url_ttl(info["stream_url"])) > 0:
+                _cache[key] = (time() + ttl, info)
+                _cache.move_to_end(key)
+                while len(_cache) > CACHE_MAX_ENTRIES:
+                    _cache.popitem(last=False)
+        return info
+    finally:
+        _inflight.pop(key, None)
+
+async def _ytdlp_extract(url: str):
     """
     yt-dlp ile video bilgisi çıkar
 
@@ -19,36 +113,11 @@ async def ytdlp_extract_video_info(url: str):
         }
     """
     try:
-        # yt-dlp komutunu async olarak çalıştır
-        cmd = [
-            "yt-dlp",
-            "--no-warnings",
-            "--no-playlist",
-            "-j",  # JSON output
-            "-f", "best",
-            "--format-sort", "proto:https",  # HTTPS (progressive) öncelikli, HLS yerine
-            url
-        ]
-
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-
-        stdout, stderr = await asyncio.wait_for(
-            process.communicate(),
-            timeout=30.0  # 30 saniye timeout
-        )
-
-        if process.returncode != 0:
-            error_msg = stderr.decode() if stderr else "Unknown error"
-            konsol.log(f"[red]yt-dlp error:[/] {error_msg}")
+        # Sıcak worker havuzu varsa onu, yoksa yt-dlp CLI'yi kullan
+        info = await ytdlp_pool.extract(url) if ytdlp_pool.started else await _ytdlp_cli(url)
+        if not info:
             return None
 
-        # JSON parse
-        info = json.loads(stdout.decode())
-
         # Format belirleme
         ext = info.get("ext", "mp4")
         if "m3u8" in info.get("url", "") or info.get("protocol") == "m3u8_native":
@@ -81,3 +150,41 @@ async def ytdlp_extract_video_info(url: str):
     except Exception as e:
         konsol.log(f"[red]yt-dlp exception:[/] {e}")
         return None
+
+async def _ytdlp_cli(url: str) -> dict | None:
+    """yt-dlp CLI ile (her istekte yeni süreç) ham bilgi sözlüğünü çıkar"""
+    # yt-dlp komutunu async olarak çalıştır
+    cmd = [
+        "yt-dlp",
+        "--no-warnings",
+        "--no-playlist",
+        "-j",  # JSON output
+        "-f", "best",
+        "--format-sort", "proto:https",  # HTTPS (progressive) öncelikli, HLS yerine
+        url
+    ]
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(),
+            timeout=30.0  # 30 saniye timeout
+        )
+    finally:
+        # Zaman aşımı / iptal: süreç arkada çalışmaya devam etmesin
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    if process.returncode != 0:
+        error_msg = stderr.decode() if stderr else "Unknown error"
+        konsol.log(f"[red]yt-dlp error:[/] {error_msg}")
+        return None
+
+    # JSON parse
+    return json.loads(stdout.decode())
@@ -0,0 +1,43 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+# yt-dlp worker süreci giriş noktası (`python ytdlp_worker.py`)
+# Dosya yolu ile çalıştırılır; paket / uygulama import edilmez, sadece yt_dlp yüklenir.
+# Protokol: stdin'den satır başına JSON URL, stdout'a satır başına JSON ["ok", info] | ["error", mesaj]
+
+import json, sys
+
+# `yt-dlp --no-warnings --no-playlist -j -f best --format-sort proto:https` karşılığı
+YTDLP_OPTIONS = {
+    "quiet"         : True,
+    "no_warnings"   : True,
+    "noplaylist"    : True,
+    "skip_download" : True,
+    "format"        : "best",
+    "format_sort"   : ["proto:https"],  # HTTPS (progressive) öncelikli, HLS yerine
+}
+
+def main():
+    from yt_dlp import YoutubeDL
+
+    # yt-dlp'nin stdout'a yazdıkları protokol satırlarına karışmasın
+    cikti, sys.stdout = sys.stdout, sys.stderr
+
+    with YoutubeDL(YTDLP_OPTIONS) as ydl:
+        for satir in sys.stdin:
+            if not satir.strip():
+                continue
+
+            try:
+                info  = ydl.sanitize_info(ydl.extract_info(json.loads(satir), download=False))
+                sonuc = ["ok", info]
+            except Exception as hata:
+                sonuc = ["error", f"{type(hata).__name__} » {hata}"]
+
+            cikti.write(json.dumps(sonuc, ensure_ascii=False, default=str) + "\n")
+            cikti.flush()
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
@@ -1,25 +1,49 @@
 # Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
 
-from dataclasses import dataclass, field
-from fastapi     import WebSocket
-from datetime    import datetime
-import uuid
+from Settings             import CHAT
+from dataclasses          import dataclass, field
+from collections          import deque
+from datetime             import datetime
+from ..Libs.socket_outbox import SocketOutbox
+from ..Libs.rate_limit    import TokenBucket
+from ..Libs.sync_engine   import SyncState
+import asyncio, uuid
 
 @dataclass
 class User:
     """Watch Party kullanıcısı"""
-    websocket : WebSocket
+    outbox    : SocketOutbox  # Giden mesaj kuyruğu (WebSocket'e tek yazıcı)
     username  : str
     avatar    : str
     user_id   : str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    sync      : SyncState = field(default_factory=SyncState, repr=False, compare=False)  # Saat / drift tahmini
 
-@dataclass
+@dataclass(slots=True)
 class ChatMessage:
-    """Chat mesajı"""
+    """Chat mesajı (oda başına yüzlercesi tutulur; __slots__ ve float zaman damgası)"""
     username  : str
-    avatar    : str
+    avatar    : str  # Gönderenin User.avatar string'i paylaşılır, kopyalanmaz
     message   : str
-    timestamp : str = field(default_factory=lambda: datetime.now().isoformat())
+    timestamp : float = field(default_factory=lambda: datetime.now().timestamp())
+
+    def to_dict(self) -> dict:
+        """İstemciye giden biçim (zaman damgası ISO string)"""
+        return {
+            "username"  : self.username,
+            "avatar"    : self.avatar,
+            "message"   : self.message,
+            "timestamp" : datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChatMessage":
+        """`to_dict` çıktısından (ör. başka worker'ın yayını) geri kur"""
+        return cls(
+            username  = data.get("username", ""),
+            avatar    = data.get("avatar", ""),
+            message   = data.get("message", ""),
+            timestamp = datetime.fromisoformat(data["timestamp"]).timestamp() if data.get("timestamp") else datetime.now().timestamp()
+        )
 
 @dataclass
 class Room:
@@ -32,8 +56,15 @@ class Room:
     current_time    : float = 0.0
     is_playing      : bool = False
     users           : dict[str, User] = field(default_factory=dict)
-    chat_messages   : list[ChatMessage] = field(default_factory=list)
+    remote_users    : dict[str, dict] = field(default_factory=dict)  # Diğer worker'lardaki kullanıcılar (sadece paylaşılan backend'de)
+    chat_messages   : deque[ChatMessage] = field(default_factory=lambda: deque(maxlen=max(CHAT.get("HISTORY", 100), 1)))  # Halka tampon, en eski mesaj kendiliğinden düşer
     headers         : dict[str, str] = field(default_factory=dict)  # User-Agent, Referer vb.
     updated_at      : float = field(default_factory=lambda: datetime.now().timestamp())
     host_id         : str | None = None  # İlk katılan kullanıcı (host)
     buffering_users : set[str] = field(default_factory=set)
+    lock            : asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)  # Oda bazlı kilit
+    version         : int = 0      # Kullanıcı / chat / video değişikliklerinde artar
+    deltas          : deque[dict] = field(default_factory=lambda: deque(maxlen=256), repr=False)  # Son sürümlü yayınlar
+    encoded         : dict[str, str] = field(default_factory=dict, repr=False, compare=False)  # Serialize edilmiş durum parçaları (users / chat / video)
+    chat_limit      : TokenBucket = field(default_factory=lambda: TokenBucket(CHAT.get("ROOM_RATE", 10), CHAT.get("ROOM_BURST", 20)), repr=False, compare=False)
+    chat_pending    : deque[ChatMessage] = field(default_factory=lambda: deque(maxlen=max(CHAT.get("HISTORY", 100), 1)), repr=False)  # Oda limiti aşınca toplu gönderimi bekleyen mesajlar
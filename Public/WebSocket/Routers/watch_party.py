@@ -3,25 +3,39 @@
 from CLI     import konsol
 from fastapi import WebSocket, WebSocketDisconnect
 from .       import wss_router
-from ..Libs  import MessageHandler
-import json, asyncio
+from ..Libs  import MessageHandler, extraction_scheduler, room_affinity, compact_protocol
+import json
 
 @wss_router.websocket("/watch_party/{room_id}")
 async def watch_party_websocket(websocket: WebSocket, room_id: str):
     """Watch Party WebSocket endpoint"""
-    await websocket.accept()
+    subprotocol = compact_protocol.negotiate(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
+    room_id = room_id.upper()
 
-    handler = MessageHandler(websocket, room_id.upper())
+    # Çoklu worker: oda başka worker'a aitse bağlantıyı ona köprüle
+    if not room_affinity.is_local(room_id):
+        return await room_affinity.forward(websocket, room_id, f"/wss/watch_party/{room_id}", subprotocol)
+
+    handler = MessageHandler(websocket, room_id, compact=subprotocol is not None)
 
     try:
         while True:
-            raw_message = await websocket.receive_text()
-
-            try:
-                message = json.loads(raw_message)
-            except json.JSONDecodeError:
-                await handler.send_error("Geçersiz JSON formatı")
-                continue
+            data = await websocket.receive()
+            if data["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(data.get("code", 1000))
+
+            # İkili çerçeve: compact protokol (ping)
+            if data.get("bytes") is not None:
+                if not (message := compact_protocol.decode(data["bytes"])):
+                    await handler.send_error("Geçersiz ikili mesaj")
+                    continue
+            else:
+                try:
+                    message = json.loads(data["text"])
+                except json.JSONDecodeError:
+                    await handler.send_error("Geçersiz JSON formatı")
+                    continue
 
             msg_type = message.get("type")
 
@@ -29,31 +43,31 @@ async def watch_party_websocket(websocket: WebSocket, room_id: str):
                 await handler.handle_join(message)
 
             elif msg_type == "play" and handler.user:
-                await handler.handle_play(message)
+                handler.dispatch("play", handler.handle_play, message)
 
             elif msg_type == "pause" and handler.user:
-                await handler.handle_pause(message)
+                handler.dispatch("pause", handler.handle_pause, message)
 
             elif msg_type == "seek" and handler.user:
-                await handler.handle_seek(message)
+                handler.dispatch("seek", handler.handle_seek, message)
 
             elif msg_type == "chat" and handler.user:
-                await handler.handle_chat(message)
+                handler.dispatch("chat", handler.handle_chat, message)
 
             elif msg_type == "video_change" and handler.user:
-                asyncio.create_task(handler.handle_video_change(message))
+                extraction_scheduler.submit(handler.room_id, handler.handle_video_change(message))
 
             elif msg_type == "ping":
                 await handler.handle_ping(message)
 
             elif msg_type == "buffer_start" and handler.user:
-                await handler.handle_buffer_start()
+                handler.dispatch("buffer_start", handler.handle_buffer_start)
 
             elif msg_type == "buffer_end" and handler.user:
-                await handler.handle_buffer_end()
+                handler.dispatch("buffer_end", handler.handle_buffer_end)
 
             elif msg_type == "get_state":
-                await handler.handle_get_state()
+                await handler.handle_get_state(message)
 
     except WebSocketDisconnect:
         pass
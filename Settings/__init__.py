@@ -7,7 +7,26 @@ from yaml    import load, FullLoader
 with open("AYAR.yml", "r", encoding="utf-8") as yaml_dosyasi:
     AYAR = load(yaml_dosyasi, Loader=FullLoader)
 
-PROJE         = AYAR["PROJE"]
-HOST          = AYAR["APP"]["HOST"]
-PORT          = AYAR["APP"]["PORT"]
-PROXY_ENABLED = AYAR["APP"].get("PROXY_ENABLED", True)
+PROJE          = AYAR["PROJE"]
+HOST           = AYAR["APP"]["HOST"]
+PORT           = AYAR["APP"]["PORT"]
+WORKERS        = AYAR["APP"].get("WORKERS", 1)
+LOG_QUEUE      = AYAR["APP"].get("LOG_QUEUE") or {}
+GEOIP          = AYAR["APP"].get("GEOIP") or {}
+REQUEST_LOG    = AYAR["APP"].get("REQUEST_LOG") or {}
+SECURITY       = AYAR["APP"].get("SECURITY") or {}
+STREAM_PATHS   = tuple(AYAR["APP"].get("STREAM_PATHS") or ())
+GZIP           = AYAR["APP"].get("GZIP") or {}
+PROXY_ENABLED  = AYAR["APP"].get("PROXY_ENABLED", True)
+PROXY_POOL     = AYAR["APP"].get("PROXY_POOL") or {}
+PROXY_CACHE    = AYAR["APP"].get("PROXY_CACHE") or {}
+PROXY_DISK     = AYAR["APP"].get("PROXY_DISK") or {}
+PROXY_PREFETCH = AYAR["APP"].get("PROXY_PREFETCH") or {}
+YTDLP_POOL     = AYAR["APP"].get("YTDLP_POOL") or {}
+WS_OUTBOX      = AYAR["APP"].get("WS_OUTBOX") or {}
+WS_COMPACT     = AYAR["APP"].get("WS_COMPACT", True)
+CHAT           = AYAR["APP"].get("CHAT") or {}
+SYNC           = AYAR["APP"].get("SYNC") or {}
+ROOM_ACTOR     = AYAR["APP"].get("ROOM_ACTOR") or {}
+ROOM_BACKEND   = AYAR["APP"].get("ROOM_BACKEND") or {}
+ROOM_AFFINITY  = AYAR["APP"].get("ROOM_AFFINITY") or {}
@@ -0,0 +1,203 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+"""
+ASGI middleware yığınının maliyet ölçümü (ağ yok, uygulama süreç içinde doğrudan çağrılır)
+
+    python benchmarks/asgi_middleware.py [--istek 20000] [--eszamanli 64] [--akis 8] [--mb 64]
+
+Aynı iki rota dört yığınla ölçülür:
+- çıplak : middleware yok
+- eski   : CORS + gzip + `@app.middleware("http")` (BaseHTTPMiddleware) istek log'u, saf ASGI'ye
+           geçilmeden önce yayında olan yığın (log mantığı aşağıda aynen korunmuştur)
+- yeni   : `Core.kekik_FastAPI`'nin middleware yığını (saf ASGI `IstekMiddleware`)
+Eski ve yeni yığın log kuyruğu açık ve kapalı ölçülür (fark, arka plan log yazımının aynı event loop'taki
+payıdır; middleware katmanının kendi maliyeti "log yok" satırlarında görülür).
+
+- /api/v1/health      : küçük JSON yanıt → saniyedeki istek (req/s)
+- /api/v1/proxy/video : 64KB parçalarla akan `video/mp4` gövde → proxy akış hızı (MB/s)
+
+Uvicorn / ağ / upstream maliyeti dahil değildir; fark sadece middleware katmanlarıdır.
+"""
+
+import os, sys
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, KOK)
+os.chdir(KOK)  # Settings, AYAR.yml'yi çalışma dizininden okur
+
+from CLI                       import konsol
+from Settings                  import STREAM_PATHS
+from Core                      import kekik_FastAPI
+from Core.Modules              import log_kuyrugu, IstekMiddleware
+from Core.Modules._istek       import ATLA_YOLLAR, HAFIF_YOLLAR, cihaz_adi, log_salla
+from fastapi                   import FastAPI, Request
+from fastapi.responses         import JSONResponse, StreamingResponse
+from starlette.middleware      import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from time                      import perf_counter, time
+import argparse, asyncio
+
+PARCA = b"\0" * (64 * 1024)
+
+async def eski_istek_middleware(request: Request, call_next):
+    """Saf ASGI'ye geçilmeden önceki `@kekik_FastAPI.middleware("http")` istek log'u (ölçüm için aynen)"""
+    baslangic_zamani = time()
+
+    path  = request.url.path
+    atla  = path.startswith(ATLA_YOLLAR)
+    hafif = atla or path.startswith(HAFIF_YOLLAR)
+
+    if hafif:
+        request.state.veri = {}
+        cihaz              = None
+    else:
+        request.state.veri = dict(request.query_params)
+        cihaz              = cihaz_adi(request.headers.get("User-Agent"))
+
+    fw_for    = request.headers.get("X-Forwarded-For")
+    client_ip = fw_for.split(",")[0].strip() if fw_for else request.client.host
+
+    log_veri = {
+        "id"     : request.headers.get("X-Request-ID") or "",
+        "method" : request.method,
+        "url"    : str(request.url).rstrip("?").split("?")[0],
+        "veri"   : request.state.veri,
+        "kod"    : None,
+        "sure"   : None,
+        "ip"     : client_ip,
+        "cihaz"  : cihaz,
+        "host"   : request.url.hostname,
+        "konum"  : not hafif
+    }
+
+    if path.startswith(STREAM_PATHS):
+        response = await call_next(request)
+    else:
+        response = await asyncio.wait_for(call_next(request), timeout=30)
+    log_veri["kod"] = response.status_code
+
+    if atla:
+        return response
+
+    log_veri["sure"] = round(time() - baslangic_zamani, 2)
+    log_kuyrugu.ekle(log_salla, log_veri)
+
+    return response
+
+def eski_yigin() -> list[Middleware]:
+    """Yeni yığındaki `IstekMiddleware` yerine BaseHTTPMiddleware ile sarılmış eski istek log'u"""
+    return [
+        Middleware(BaseHTTPMiddleware, dispatch=eski_istek_middleware) if middleware.cls is IstekMiddleware else middleware
+            for middleware in kekik_FastAPI.user_middleware
+    ]
+
+def uygulama(yigin: list[Middleware], parca_sayisi: int) -> FastAPI:
+    """Ölçülen iki rotayı içeren uygulama (verilen middleware yığınıyla)"""
+    app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
+    app.user_middleware = list(yigin)
+
+    @app.get("/api/v1/health")
+    async def health():
+        return JSONResponse({"success": True, "status": "healthy"})
+
+    @app.get("/api/v1/proxy/video")
+    async def video():
+        async def govde():
+            for _ in range(parca_sayisi):
+                yield PARCA
+
+        return StreamingResponse(govde(), media_type="video/mp4")
+
+    return app
+
+async def cagir(app: FastAPI, path: str) -> int:
+    """Tek GET isteği; gövde bayt sayısını döner"""
+    scope = {
+        "type"         : "http",
+        "asgi"         : {"version": "3.0"},
+        "http_version" : "1.1",
+        "method"       : "GET",
+        "scheme"       : "http",
+        "path"         : path,
+        "raw_path"     : path.encode(),
+        "query_string" : b"",
+        "root_path"    : "",
+        "headers"      : [(b"host", b"bench"), (b"accept-encoding", b"gzip"), (b"user-agent", b"bench")],
+        "client"       : ("127.0.0.1", 50000),
+        "server"       : ("bench", 80),
+    }
+
+    istek_verildi = False
+    async def receive():
+        nonlocal istek_verildi
+        if not istek_verildi:
+            istek_verildi = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Future()  # İstemci kopmaz; yanıt bitince iptal edilir
+
+    boyut = 0
+    async def send(message):
+        nonlocal boyut
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"{path} → {message['status']}")
+        if message["type"] == "http.response.body":
+            boyut += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return boyut
+
+async def paralel(app: FastAPI, path: str, toplam: int, eszamanli: int) -> tuple[float, int]:
+    """`toplam` isteği `eszamanli` işçiyle gönder; (süre, toplam bayt)"""
+    paylar = [toplam // eszamanli + (index < toplam % eszamanli) for index in range(eszamanli)]
+
+    async def isci(adet: int) -> int:
+        return sum([await cagir(app, path) for _ in range(adet)])
+
+    baslangic = perf_counter()
+    baytlar   = await asyncio.gather(*(isci(adet) for adet in paylar if adet))
+    return perf_counter() - baslangic, sum(baytlar)
+
+async def olc(args: argparse.Namespace):
+    parca_sayisi = args.mb * 1024 * 1024 // len(PARCA)
+
+    ekle = log_kuyrugu.ekle
+
+    yiginlar = (
+        ("çıplak"        , [],                                  False),
+        ("eski"          , eski_yigin(),                        True),
+        ("eski, log yok" , eski_yigin(),                        False),
+        ("yeni"          , list(kekik_FastAPI.user_middleware), True),
+        ("yeni, log yok" , list(kekik_FastAPI.user_middleware), False),
+    )
+
+    print(f"{'yığın':<20} {'req/s':>10} {'akış MB/s':>12}")
+    for ad, yigin, log in yiginlar:
+        app = uygulama(yigin, parca_sayisi)
+        log_kuyrugu.ekle = ekle if log else (lambda *args: False)
+
+        # Isınma: middleware yığını ve log işçileri ilk istekte kurulur
+        await paralel(app, "/api/v1/health", args.eszamanli, args.eszamanli)
+
+        sure, _       = await paralel(app, "/api/v1/health", args.istek, args.eszamanli)
+        akis, baytlar = await paralel(app, "/api/v1/proxy/video", args.akis, args.akis)
+
+        print(f"{ad:<20} {args.istek / sure:>10.0f} {baytlar / akis / 1024 / 1024:>12.0f}")
+
+    log_kuyrugu.ekle = ekle
+    await log_kuyrugu.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Eski (BaseHTTPMiddleware) ve yeni (saf ASGI) middleware yığınlarının req/s ve akış hızı ölçümü")
+    parser.add_argument("--istek",     type=int, default=20000, help="Küçük JSON rotasına gönderilecek istek sayısı")
+    parser.add_argument("--eszamanli", type=int, default=64,    help="Eşzamanlı istek sayısı")
+    parser.add_argument("--akis",      type=int, default=8,     help="Eşzamanlı video akışı sayısı")
+    parser.add_argument("--mb",        type=int, default=64,    help="Akış başına gövde boyutu (MB)")
+    args = parser.parse_args()
+
+    # İstek logları ölçümü boğmasın (log işçileri yine çalışır, sadece çıktı atılır)
+    konsol.file = open(os.devnull, "w")
+
+    asyncio.run(olc(args))
+
+if __name__ == "__main__":
+    main()
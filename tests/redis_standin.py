@@ -0,0 +1,174 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+"""
+Testler için yerel, bellek içi Redis yerine geçeni
+
+Sadece `RedisRoomBackend`'in kullandığı komutları destekler (string / hash / list / set / pub/sub),
+istemci HELLO 3 gönderirse yanıtlar RESP3 tipleriyle (map / set / push) döner.
+TTL'ler kabul edilir ama uygulanmaz. `fail` kümesine eklenen komutlar hata döner (Redis kesintisi benzetimi). Gerçek bir redis-server gerekmeden backend'i redis-py ile
+uçtan uca çalıştırmak içindir.
+"""
+
+from collections import defaultdict
+import asyncio
+
+class Push(list):
+    """Pub/sub bildirimi (RESP3'te push tipi)"""
+
+class RedisStandin:
+    def __init__(self):
+        self.data: dict[bytes, object]                               = {}
+        self.channels: defaultdict[bytes, set[asyncio.StreamWriter]] = defaultdict(set)
+        self.fail: set[str]                                          = set()
+        self._server: asyncio.Server | None                          = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._client, "127.0.0.1", 0)
+
+    async def close(self):
+        self._server.close()
+        for writers in self.channels.values():
+            for writer in writers:
+                writer.close()
+        await self._server.wait_closed()
+
+    # ============== RESP ==============
+
+    @staticmethod
+    def _encode(value, resp3: bool = False) -> bytes:
+        encode = lambda item: RedisStandin._encode(item, resp3)
+        if value is None:
+            return b"_\r\n" if resp3 else b"$-1\r\n"
+        if isinstance(value, bool):
+            return b":%d\r\n" % value
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, str):
+            return b"+" + value.encode() + b"\r\n"
+        if isinstance(value, bytes):
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if isinstance(value, Exception):
+            return b"-ERR " + str(value).encode() + b"\r\n"
+        if isinstance(value, dict):
+            if resp3:
+                return b"%%%d\r\n" % len(value) + b"".join(encode(item) for pair in value.items() for item in pair)
+            value = [item for pair in value.items() for item in pair]
+        if isinstance(value, set):
+            return (b"~%d\r\n" if resp3 else b"*%d\r\n") % len(value) + b"".join(encode(item) for item in value)
+        if isinstance(value, Push):
+            return (b">%d\r\n" if resp3 else b"*%d\r\n") % len(value) + b"".join(encode(item) for item in value)
+        return b"*%d\r\n" % len(value) + b"".join(encode(item) for item in value)
+
+    @staticmethod
+    async def _read(reader: asyncio.StreamReader) -> list[bytes] | None:
+        line = await reader.readline()
+        if not line:
+            return None
+
+        args = []
+        for _ in range(int(line[1:])):
+            size = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.resp3 = False
+        try:
+            while (args := await self._read(reader)) is not None:
+                command = args[0].upper().decode()
+                if command == "HELLO":
+                    writer.resp3 = args[1:2] == [b"3"]
+                    writer.write(self._encode({b"server": b"standin", b"proto": 3 if writer.resp3 else 2}, writer.resp3))
+                elif command in ("SUBSCRIBE", "UNSUBSCRIBE"):
+                    for channel in args[1:]:
+                        (self.channels[channel].add if command == "SUBSCRIBE" else self.channels[channel].discard)(writer)
+                        count = sum(writer in writers for writers in self.channels.values())
+                        writer.write(self._encode(Push([command.lower().encode(), channel, count]), writer.resp3))
+                else:
+                    try:
+                        writer.write(self._encode(self._execute(command, args[1:]), writer.resp3))
+                    except Exception as hata:
+                        writer.write(self._encode(hata))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for writers in self.channels.values():
+                writers.discard(writer)
+            writer.close()
+
+    # ============== Komutlar ==============
+
+    def _execute(self, command: str, args: list[bytes]):
+        if command in self.fail:
+            raise ConnectionError(f"'{command}' başarısız (benzetim)")
+
+        data = self.data
+        match command:
+            case "PING":
+                return "PONG"
+            case "CLIENT" | "SELECT":
+                return "OK"
+            case "GET":
+                return data.get(args[0])
+            case "SET":
+                options = [arg.upper() for arg in args[2:]]
+                if b"NX" in options and args[0] in data:
+                    return None
+                data[args[0]] = args[1]
+                return "OK"
+            case "DEL":
+                return sum(data.pop(key, None) is not None for key in args)
+            case "EXPIRE":
+                return int(args[0] in data)
+            case "INCR" | "INCRBY":
+                data[args[0]] = b"%d" % (int(data.get(args[0], b"0")) + (int(args[1]) if args[1:] else 1))
+                return int(data[args[0]])
+            case "PUBLISH":
+                for writer in self.channels.get(args[0], ()):
+                    writer.write(self._encode(Push([b"message", args[0], args[1]]), writer.resp3))
+                return len(self.channels.get(args[0], ()))
+            case "HSET":
+                table = data.setdefault(args[0], {})
+                added = sum(field not in table for field in args[1::2])
+                table.update(zip(args[1::2], args[2::2]))
+                return added
+            case "HDEL":
+                table = data.get(args[0], {})
+                return sum(table.pop(field, None) is not None for field in args[1:])
+            case "HGETALL":
+                return dict(data.get(args[0], {}))
+            case "RPUSH":
+                items = data.setdefault(args[0], [])
+                items.extend(args[1:])
+                return len(items)
+            case "LTRIM":
+                items = data.get(args[0], [])
+                start, stop = int(args[1]), int(args[2])
+                data[args[0]] = items[start:(stop + 1) or None]
+                return "OK"
+            case "LRANGE":
+                items = data.get(args[0], [])
+                start, stop = int(args[1]), int(args[2])
+                return items[start:(stop + 1) or None]
+            case "SADD":
+                members = data.setdefault(args[0], set())
+                added   = len(set(args[1:]) - members)
+                members.update(args[1:])
+                return added
+            case "SREM":
+                members = data.get(args[0], set())
+                removed = len(set(args[1:]) & members)
+                members.difference_update(args[1:])
+                return removed
+            case "SCARD":
+                return len(data.get(args[0], set()))
+            case "SMEMBERS":
+                return set(data.get(args[0], set()))
+
+        raise ValueError(f"desteklenmeyen komut '{command}'")
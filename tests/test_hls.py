@@ -0,0 +1,45 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+"""Olası playlist gövdelerinin sınırlı okunduğunu sınar"""
+
+from Public.API.v1.Libs.hls import read_limited, stream_rest, MAX_SNIFF_SIZE, MAX_PLAYLIST_SIZE
+import asyncio, httpx
+
+HLS = "application/vnd.apple.mpegurl"
+
+def _read(body: bytes) -> tuple[bytes, bool, bytes]:
+    """(belleğe alınan, akışa düştü mü, istemcinin alacağı tüm gövde)"""
+    async def main():
+        async def parcalar():
+            for index in range(0, len(body), 64 * 1024):
+                yield body[index:index + 64 * 1024]
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, headers={"Content-Type": HLS}, content=parcalar()))
+        async with httpx.AsyncClient(transport=transport) as client:
+            response   = await client.send(client.build_request("GET", "https://upstream/list.m3u8"), stream=True)
+            head, rest = await read_limited(response)
+            if rest is None:
+                return head, False, head
+            return head, True, b"".join([chunk async for chunk in stream_rest(head, rest, response)])
+
+    return asyncio.run(main())
+
+def test_mislabelled_large_body_is_streamed_not_buffered():
+    body = b"\0" * (MAX_SNIFF_SIZE * 4)
+
+    head, streamed, full = _read(body)
+
+    assert streamed
+    assert len(head) <= MAX_SNIFF_SIZE + 128 * 1024
+    assert full == body
+
+def test_playlists_are_buffered_up_to_playlist_limit():
+    small = b"#EXTM3U\n" + b"#EXTINF:2,\nseg.ts\n" * 10
+    large = b"#EXTM3U\n" + b"#EXTINF:2,\nseg.ts\n" * (MAX_SNIFF_SIZE // 10)
+
+    assert _read(small) == (small, False, small)
+    assert _read(large) == (large, False, large)
+
+    huge = b"#EXTM3U\n" + b"\n" * MAX_PLAYLIST_SIZE
+    head, streamed, full = _read(huge)
+    assert streamed and full == huge
@@ -0,0 +1,48 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+"""RoomActor kuyruk sınırı ve anahtarlı (heartbeat) komut değişimini sınar"""
+
+from Public.WebSocket.Libs.room_actor import RoomActor
+import asyncio
+
+def _run(senaryo):
+    async def main():
+        actor = RoomActor("ODA1", max_queue=4)
+        try:
+            await senaryo(actor)
+        finally:
+            actor.close()
+
+    asyncio.run(main())
+
+def test_queue_is_bounded_and_keyed_commands_replace_in_place():
+    async def senaryo(actor: RoomActor):
+        calisan = []
+        def komut(ad):
+            async def calis():
+                calisan.append(ad)
+            return calis
+
+        # Aktör henüz çalışmadı: hepsi kuyrukta bekler
+        assert actor.submit("heartbeat", komut("hb-ali-1"), key=("heartbeat", "ali"))
+        assert actor.submit("play", komut("play"))
+        assert actor.submit("heartbeat", komut("hb-veli"), key=("heartbeat", "veli"))
+        assert actor.submit("heartbeat", komut("hb-ali-2"), key=("heartbeat", "ali"))  # Yerinde değişir
+        assert actor.submit("buffer_start", komut("buffer_start"))
+
+        # Kuyruk dolu: yeni komut reddedilir, bekleyen heartbeat yine de güncellenebilir
+        assert not actor.submit("pause", komut("pause"))
+        assert actor.submit("heartbeat", komut("hb-veli-2"), key=("heartbeat", "veli"))
+        assert actor.dropped == 1
+
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert calisan == ["hb-ali-2", "play", "hb-veli-2", "buffer_start"]
+
+        # İşlenen heartbeat'in anahtarı boşalır, sonraki yeniden kuyruğa girer
+        assert actor.submit("heartbeat", komut("hb-ali-3"), key=("heartbeat", "ali"))
+        await asyncio.sleep(0)
+        assert calisan[-1] == "hb-ali-3"
+
+    _run(senaryo)
@@ -0,0 +1,59 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+"""Worker'lar arası HTTP aktarımının işaretlendiğini ve sahibinde tekrar loglanmadığını sınar"""
+
+from Public.WebSocket.Libs.room_affinity import RoomAffinity, INTERNAL_HEADER
+from starlette.requests                  import Request
+import asyncio, httpx
+
+BASE_PORT = 3400
+
+def _scope(server: tuple[str, int], headers: list[tuple[bytes, bytes]]) -> dict:
+    return {
+        "type"         : "http",
+        "method"       : "GET",
+        "scheme"       : "http",
+        "path"         : "/watch-party/ODA1",
+        "raw_path"     : b"/watch-party/ODA1",
+        "query_string" : b"url=x",
+        "root_path"    : "",
+        "headers"      : headers,
+        "server"       : server,
+        "client"       : ("203.0.113.5", 50000),
+    }
+
+def test_only_marked_requests_on_the_internal_port_count_as_forwarded():
+    affinity = RoomAffinity(2, 1, BASE_PORT)
+    internal = ("127.0.0.1", BASE_PORT + 1)
+    marker   = [(INTERNAL_HEADER.encode(), b"1")]
+
+    assert affinity.is_forwarded(_scope(internal, marker))
+    assert not affinity.is_forwarded(_scope(internal, []))
+    assert not affinity.is_forwarded(_scope(("0.0.0.0", 3310), marker))  # Dışarıdan taklit edilen işaret
+    assert not RoomAffinity(1, None, BASE_PORT).is_forwarded(_scope(internal, marker))
+
+def test_forward_http_marks_the_request_once():
+    async def main():
+        affinity = RoomAffinity(2, 0, BASE_PORT)
+        room_id  = next(room for room in (f"ODA{index}" for index in range(100)) if affinity.owner(room) == 1)
+        istekler = []
+
+        def owner(request: httpx.Request) -> httpx.Response:
+            istekler.append(request)
+            return httpx.Response(200, stream=httpx.ByteStream(b"sayfa"))
+
+        affinity._client = httpx.AsyncClient(transport=httpx.MockTransport(owner))
+        try:
+            # İstemcinin kendi gönderdiği işaret taşınmaz, aktarım tek işaret ekler
+            scope    = _scope(("0.0.0.0", 3310), [(b"host", b"party"), (INTERNAL_HEADER.encode(), b"sahte")])
+            response = await affinity.forward_http(Request(scope), room_id)
+            body     = b"".join([chunk async for chunk in response.body_iterator])
+        finally:
+            await affinity.close()
+
+        assert body == b"sayfa"
+        assert str(istekler[0].url) == f"http://127.0.0.1:{BASE_PORT + 1}/watch-party/ODA1?url=x"
+        assert istekler[0].headers.get_list(INTERNAL_HEADER) == ["1"]
+        assert istekler[0].headers["x-forwarded-for"] == "203.0.113.5"
+
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+"""İki WatchPartyManager'ı (iki worker) RedisRoomBackend üzerinden yerel Redis yerine geçenine bağlayarak sınar"""
+
+from Public.WebSocket.Libs.WatchPartyManager import WatchPartyManager
+from Public.WebSocket.Libs.room_backend      import RedisRoomBackend
+from redis_standin                           import RedisStandin
+import asyncio, json
+
+ROOM = "ODA1"
+
+class FakeOutbox:
+    """Gönderilen mesajları biriktiren SocketOutbox yerine geçeni"""
+
+    compact = False
+
+    def __init__(self):
+        self.messages: list[dict] = []
+
+    def send(self, payload: str | bytes, coalesce: str | None = None, priority: bool = False) -> bool:
+        self.messages.append(json.loads(payload))
+        return True
+
+    def send_message(self, message: dict, coalesce: str | None = None, priority: bool = False) -> bool:
+        self.messages.append(message)
+        return True
+
+    def close(self):
+        pass
+
+    def of_type(self, kind: str) -> list[dict]:
+        return [message for message in self.messages if message.get("type") == kind]
+
+async def _settle():
+    """Pub/sub yayınlarının karşı worker'a ulaşmasını bekle"""
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+def _run(senaryo):
+    async def main():
+        redis = RedisStandin()
+        await redis.start()
+        managers = [WatchPartyManager(RedisRoomBackend(redis.url, prefix="test")) for _ in range(2)]
+        for manager in managers:
+            await manager.start()
+        try:
+            await senaryo(*managers, redis)
+        finally:
+            for manager in managers:
+                await manager.close()
+            await redis.close()
+
+    asyncio.run(main())
+
+def _user_ids(manager: WatchPartyManager) -> set[str]:
+    return {user["user_id"] for user in manager.get_room_users(ROOM)}
+
+def test_presence_and_host_are_shared():
+    async def senaryo(w1: WatchPartyManager, w2: WatchPartyManager, redis: RedisStandin):
+        a = await w1.join_room(ROOM, FakeOutbox(), "ali", "🎬")
+        await w1.broadcast_to_room(ROOM, {"type": "user_joined", "user_id": a.user_id, "username": "ali", "avatar": "🎬", "host_id": w1.get_host_id(ROOM)})
+
+        b_outbox = FakeOutbox()
+        b = await w2.join_room(ROOM, b_outbox, "veli", "🍿")
+        await w2.broadcast_to_room(ROOM, {"type": "user_joined", "user_id": b.user_id, "username": "veli", "avatar": "🍿", "host_id": w2.get_host_id(ROOM)}, exclude_user_id=b.user_id)
+        await _settle()
+
+        # Her iki worker da odanın tamamını ve aynı host'u görür
+        assert _user_ids(w1) == _user_ids(w2) == {a.user_id, b.user_id}
+        assert w1.get_host_id(ROOM) == w2.get_host_id(ROOM) == a.user_id
+
+        state = json.loads(w2.get_room_state_json(ROOM))
+        assert {user["user_id"] for user in state["users"]} == {a.user_id, b.user_id}
+
+        # Host ayrılınca diğer worker'daki kullanıcı host olur, ayrılış karşıya ulaşır
+        await w1.leave_room(ROOM, a.user_id)
+        await _settle()
+
+        assert ROOM not in w1.rooms
+        assert _user_ids(w2) == {b.user_id}
+        assert w2.get_host_id(ROOM) == b.user_id
+        assert b_outbox.of_type("user_left")[-1]["host_id"] == b.user_id
+
+    _run(senaryo)
+
+def test_versions_are_global_and_deltas_cover_both_workers():
+    async def senaryo(w1: WatchPartyManager, w2: WatchPartyManager, redis: RedisStandin):
+        a_outbox = FakeOutbox()
+        a = await w1.join_room(ROOM, a_outbox, "ali", "🎬")
+        b = await w2.join_room(ROOM, FakeOutbox(), "veli", "🍿")
+
+        for index in range(3):
+            await w1.add_chat_message(ROOM, "ali", "🎬", f"w1-{index}")
+            await w1.broadcast_to_room(ROOM, {"type": "chat", "username": "ali", "avatar": "🎬", "message": f"w1-{index}"})
+            await w2.broadcast_to_room(ROOM, {"type": "chat", "username": "veli", "avatar": "🍿", "message": f"w2-{index}"})
+        await _settle()
+
+        # Sürümler iki worker arasında ortak ve boşluksuz
+        versions = sorted(message["version"] for message in a_outbox.of_type("chat"))
+        assert versions == list(range(versions[0], versions[0] + 6))
+        assert w1.rooms[ROOM].version == w2.rooms[ROOM].version == versions[-1]
+
+        # Her worker diğerinin deltalarını da verebilir
+        delta = w1.get_room_delta(ROOM, versions[0] - 1)
+        assert [message["version"] for message in delta["deltas"]] == versions
+        assert {message["message"] for message in delta["deltas"]} == {f"w{worker}-{index}" for worker in (1, 2) for index in range(3)}
+
+        # Odaya sonradan katılan worker paylaşılan chat geçmişini ve sürümü yükler
+        await w2.leave_room(ROOM, b.user_id)
+        await _settle()
+        await w2.join_room(ROOM, FakeOutbox(), "veli", "🍿")
+        assert [message.message for message in w2.rooms[ROOM].chat_messages] == ["w1-0", "w1-1", "w1-2"]
+        assert w2.rooms[ROOM].version >= versions[-1]
+
+    _run(senaryo)
+
+def test_buffering_is_counted_across_workers():
+    async def senaryo(w1: WatchPartyManager, w2: WatchPartyManager, redis: RedisStandin):
+        a = await w1.join_room(ROOM, FakeOutbox(), "ali", "🎬")
+        b = await w2.join_room(ROOM, FakeOutbox(), "veli", "🍿")
+
+        assert await w1.set_buffering_status(ROOM, a.user_id, True) is False  # Oda zaten duraklatılmış
+        await w2.set_buffering_status(ROOM, b.user_id, True)
+
+        # Diğer worker'da bufferlayan varken oynatım devam etmez
+        assert await w1.set_buffering_status(ROOM, a.user_id, False) is False
+        assert await w2.set_buffering_status(ROOM, b.user_id, False) is True
+
+    _run(senaryo)
+
+def test_broadcast_survives_version_counter_failure():
+    async def senaryo(w1: WatchPartyManager, w2: WatchPartyManager, redis: RedisStandin):
+        a_outbox, b_outbox = FakeOutbox(), FakeOutbox()
+        await w1.join_room(ROOM, a_outbox, "ali", "🎬")
+        await w2.join_room(ROOM, b_outbox, "veli", "🍿")
+
+        await w1.broadcast_to_room(ROOM, {"type": "chat", "username": "ali", "avatar": "🎬", "message": "önce"})
+        await _settle()
+        version = w1.rooms[ROOM].version
+
+        # Sürüm sayacı okunamıyor: yayın hata fırlatmaz, sürümsüz olarak iki worker'a da gider
+        redis.fail = {"INCR", "INCRBY"}
+        await w1.broadcast_to_room(ROOM, {"type": "chat", "username": "ali", "avatar": "🎬", "message": "kesinti"})
+        await _settle()
+
+        for outbox in (a_outbox, b_outbox):
+            assert "version" not in outbox.of_type("chat")[-1]
+            assert outbox.of_type("chat")[-1]["message"] == "kesinti"
+        assert w1.rooms[ROOM].version == w2.rooms[ROOM].version == version
+
+        # Sayaç geri gelince sürümler kaldığı yerden devam eder
+        redis.fail = set()
+        await w1.broadcast_to_room(ROOM, {"type": "chat", "username": "ali", "avatar": "🎬", "message": "sonra"})
+        await _settle()
+
+        assert b_outbox.of_type("chat")[-1]["version"] == version + 1
+        assert w2.rooms[ROOM].version == version + 1
+
+    _run(senaryo)
@@ -0,0 +1,28 @@
+# Bu araç @keyiflerolsun tarafından | @KekikAkademi için yazılmıştır.
+
+"""SikistirmaMiddleware gzip önbelleğinin farklı dosyaları karıştırmadığını sınar"""
+
+from Core.Modules           import SikistirmaMiddleware
+from starlette.applications import Starlette
+from starlette.staticfiles  import StaticFiles
+from starlette.routing      import Mount
+from starlette.testclient   import TestClient
+import os
+
+def test_same_size_same_mtime_files_do_not_share_gzip(tmp_path):
+    # Aynı COPY katmanındaki dosyalar gibi: aynı boyut, aynı mtime → FileResponse ETag'leri aynı
+    for name, harf in (("a.js", b"A"), ("b.js", b"B")):
+        path = tmp_path / name
+        path.write_bytes(harf * 1501)
+        os.utime(path, (1_700_000_000, 1_700_000_000))
+
+    app    = SikistirmaMiddleware(Starlette(routes=[Mount("/static", StaticFiles(directory=tmp_path))]), minimum_size=1000)
+    client = TestClient(app)
+
+    a = client.get("/static/a.js", headers={"Accept-Encoding": "gzip"})
+    b = client.get("/static/b.js", headers={"Accept-Encoding": "gzip"})
+
+    assert a.headers["etag"] == b.headers["etag"]
+    assert a.headers["content-encoding"] == b.headers["content-encoding"] == "gzip"
+    assert a.content == b"A" * 1501
+    assert b.content == b"B" * 1501